@@ -147,6 +147,78 @@ AUTHENTICATION_BACKENDS = [
 JWT_SECRET = os.getenv('JWT_SECRET', 'change-me-in-production')
 JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
 JWT_EXP_DELTA_SECONDS = int(os.getenv('JWT_EXP_DELTA_SECONDS', str(14 * 24 * 3600)))
+# Default claims format when a token request doesn't ask for one: `full` or `compact`
+# (service permissions as index bitmaps, see `src/user/permission_index.py`).
+JWT_CLAIMS_FORMAT = os.getenv('JWT_CLAIMS_FORMAT', 'full')
+
+# In-process cache of resolved entitlement claims (see `src/user/claims_cache.py`).
+# Versions used for invalidation are kept in the default Django cache, which must be shared
+# between processes (e.g. Redis) when running more than one.
+CLAIMS_CACHE_MAX_ENTRIES = int(os.getenv('CLAIMS_CACHE_MAX_ENTRIES', '10000'))
+CLAIMS_CACHE_TTL_SECONDS = int(os.getenv('CLAIMS_CACHE_TTL_SECONDS', '300'))
+
+# Trust the `status`/`is_staff` claims of access tokens instead of loading the user on every
+# request. Revocations (deactivate/delete/reactivate) reach other processes within
+# `JWT_REVOCATION_REFRESH_SECONDS` (see `src/user/revocation.py`).
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'False').lower() in ['true', '1']
+JWT_REVOCATION_REFRESH_SECONDS = int(os.getenv('JWT_REVOCATION_REFRESH_SECONDS', '30'))
+
+# In-process cache of verified access tokens and their users (see `src/user/token_cache.py`).
+# `0` disables it.
+AUTH_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('AUTH_TOKEN_CACHE_MAX_ENTRIES', '0'))
+AUTH_TOKEN_CACHE_MAX_AGE_SECONDS = int(os.getenv('AUTH_TOKEN_CACHE_MAX_AGE_SECONDS', '60'))
+
+# Individually revoked tokens (see `src/user/revoked_tokens.py`); run
+# `manage.py prune_revoked_tokens` periodically to drop expired entries.
+REVOKED_TOKENS_REFRESH_SECONDS = int(os.getenv('REVOKED_TOKENS_REFRESH_SECONDS', '5'))
+REVOKED_TOKENS_REBUILD_SECONDS = int(os.getenv('REVOKED_TOKENS_REBUILD_SECONDS', '3600'))
+REVOKED_TOKENS_BLOOM_CAPACITY = int(os.getenv('REVOKED_TOKENS_BLOOM_CAPACITY', '100000'))
+REVOKED_TOKENS_BLOOM_ERROR_RATE = float(os.getenv('REVOKED_TOKENS_BLOOM_ERROR_RATE', '0.001'))
+
+# Thread pool for password checks of the async auth endpoints (see `src/user/hashing.py`).
+# Logins beyond `PASSWORD_HASH_WORKERS + PASSWORD_HASH_MAX_QUEUE` concurrent checks get a 503.
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', str(min(4, os.cpu_count() or 1))))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv('PASSWORD_HASH_MAX_QUEUE', '16'))
+
+# Token-bucket login throttle per client IP and per email (see `src/user/throttling.py`).
+# `LOGIN_THROTTLE_BACKEND`: `memory` (per process) or `cache` (shared via the default cache).
+# Set `LOGIN_THROTTLE_NUM_PROXIES` to the number of trusted proxies setting `X-Forwarded-For`.
+LOGIN_THROTTLE_ENABLED = os.getenv('LOGIN_THROTTLE_ENABLED', 'True').lower() in ['true', '1']
+LOGIN_THROTTLE_BACKEND = os.getenv('LOGIN_THROTTLE_BACKEND', 'memory')
+LOGIN_THROTTLE_IP_BURST = int(os.getenv('LOGIN_THROTTLE_IP_BURST', '30'))
+LOGIN_THROTTLE_IP_PER_MINUTE = float(os.getenv('LOGIN_THROTTLE_IP_PER_MINUTE', '10'))
+LOGIN_THROTTLE_EMAIL_BURST = int(os.getenv('LOGIN_THROTTLE_EMAIL_BURST', '5'))
+LOGIN_THROTTLE_EMAIL_PER_MINUTE = float(os.getenv('LOGIN_THROTTLE_EMAIL_PER_MINUTE', '1'))
+LOGIN_THROTTLE_NUM_PROXIES = int(os.getenv('LOGIN_THROTTLE_NUM_PROXIES', '0'))
+
+# Client-credentials grant for services (`POST /api/auth/token`, see `src/user/service_auth.py`).
+# Client secrets are hashed with `SERVICE_SECRET_HASH_ITERATIONS` PBKDF2 iterations; verified
+# secrets are remembered for `SERVICE_SECRET_CACHE_TTL_SECONDS` (`0` disables).
+SERVICE_TOKEN_LIFETIME_SECONDS = int(os.getenv('SERVICE_TOKEN_LIFETIME_SECONDS', '300'))
+SERVICE_SECRET_HASH_ITERATIONS = int(os.getenv('SERVICE_SECRET_HASH_ITERATIONS', '20000'))
+SERVICE_SECRET_CACHE_TTL_SECONDS = int(os.getenv('SERVICE_SECRET_CACHE_TTL_SECONDS', '60'))
+SERVICE_SECRET_CACHE_MAX_ENTRIES = int(os.getenv('SERVICE_SECRET_CACHE_MAX_ENTRIES', '10000'))
+# A service token is handed out again while more than this fraction of its lifetime is left
+# (see `src/user/service_tokens.py`); `1` disables reuse.
+SERVICE_TOKEN_REUSE_MIN_REMAINING = float(os.getenv('SERVICE_TOKEN_REUSE_MIN_REMAINING', '0.5'))
+SERVICE_TOKEN_CACHE_MAX_ENTRIES = int(os.getenv('SERVICE_TOKEN_CACHE_MAX_ENTRIES', '10000'))
+
+# Bulk provisioning (`POST /api/services/{id}/users/bulk`, see `src/user/provisioning.py`):
+# users per request, and threads hashing their passwords (separate from the login pool).
+BULK_PROVISION_MAX_USERS = int(os.getenv('BULK_PROVISION_MAX_USERS', '10000'))
+PASSWORD_HASH_BULK_WORKERS = int(os.getenv('PASSWORD_HASH_BULK_WORKERS', str(os.cpu_count() or 1)))
+
+# Keyset pagination of list endpoints (see `src/user/pagination.py`): rows per page when the
+# caller passes no `limit`, and the largest `limit` honoured.
+PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', '1000'))
+PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', '1000'))
+
+# Asymmetric signing keys (see `src/user/signing_keys.py` and `manage.py signing_keys`).
+# While no key is active, tokens are signed with `JWT_SECRET`.
+JWT_KEY_RING_REFRESH_SECONDS = int(os.getenv('JWT_KEY_RING_REFRESH_SECONDS', '60'))
+# Keep accepting tokens without a `kid` (signed with `JWT_SECRET`); disable once they expired.
+JWT_VERIFY_SHARED_SECRET = os.getenv('JWT_VERIFY_SHARED_SECRET', 'True').lower() in ['true', '1']
+JWKS_MAX_AGE_SECONDS = int(os.getenv('JWKS_MAX_AGE_SECONDS', '300'))
 
 # django-ninja-jwt settings
 NINJA_JWT = {
@@ -8,9 +8,11 @@ from django.urls import path
 from django.views.generic import TemplateView
 
 from src.user.api import api
+from src.user.views import jwks
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', api.urls),
+    path('.well-known/jwks.json', jwks, name='jwks'),
     path('', TemplateView.as_view(template_name='hello.html'), name='hello'),
 ]
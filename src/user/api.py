@@ -1,6 +1,20 @@
+import math
+
+from django.http import HttpRequest, HttpResponse
 from ninja import NinjaAPI
+from ninja.errors import Throttled
 
-from .routers import auth, roles_permissions, services, users
+from .pagination import InvalidCursor
+from .routers import (
+    auth,
+    auth_async,
+    roles_permissions,
+    roles_permissions_async,
+    services,
+    services_async,
+    users,
+    users_async,
+)
 
 api = NinjaAPI(
     title='User Service API',
@@ -8,9 +22,30 @@ api = NinjaAPI(
     description='Centralized SSO service providing JWT auth, services, users, roles, and permissions.',
 )
 
+
+@api.exception_handler(Throttled)
+def throttled(request: HttpRequest, exc: Throttled) -> HttpResponse:
+    response = api.create_response(request, {'detail': str(exc)}, status=exc.status_code)
+    if exc.wait is not None:
+        # Retry-After must be integer delta-seconds (RFC 9110)
+        response['Retry-After'] = str(math.ceil(exc.wait))
+    return response
+
+
+@api.exception_handler(InvalidCursor)
+def invalid_cursor(request: HttpRequest, exc: InvalidCursor) -> HttpResponse:
+    return api.create_response(request, {'detail': 'Invalid cursor'}, status=400)
+
+
 # Register routers
 api.add_router('/auth/', auth.router, tags=['Authentication'])
+api.add_router('/auth/async/', auth_async.router, tags=['Authentication'])
 api.add_router('/services/', services.router, tags=['Services'])
 api.add_router('/services/', roles_permissions.router, tags=['Roles & Permissions'])
 api.add_router('/users/', users.router, tags=['Users'])
 api.add_router('/services/', users.service_users_router, tags=['Users'])
+
+# Async (ASGI) read endpoints
+api.add_router('/async/services/', services_async.router, tags=['Services'])
+api.add_router('/async/services/', roles_permissions_async.router, tags=['Roles & Permissions'])
+api.add_router('/async/users/', users_async.router, tags=['Users'])
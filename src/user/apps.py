@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class UserConfig(AppConfig):
     name = 'src.user'
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -1,16 +1,65 @@
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
 from django.http import HttpRequest
+from django.utils.functional import cached_property
+from ninja_extra.security import AsyncHttpBearer
 from ninja_jwt.authentication import JWTAuth as BaseJWTAuth
+from ninja_jwt.exceptions import AuthenticationFailed, InvalidToken
+from ninja_jwt.models import TokenUser
+from ninja_jwt.settings import api_settings
 
 from .models import User
+from .revocation import ais_revoked, is_revoked
+from .revoked_tokens import revoked_tokens
+from .signing_keys import key_ring
+from .token_cache import token_cache
+from .tokens import STATUS_CLAIM
+
+
+class ClaimsUser(TokenUser):
+    """Lightweight user built from the signed claims of an access token (no DB row loaded)."""
+
+    @cached_property
+    def status(self) -> str:
+        return self.token[STATUS_CLAIM]
+
+    @cached_property
+    def email(self) -> str:
+        return self.token.get('email', '')
 
 
 class JWTAuth(BaseJWTAuth):
-    """JWT-based authentication for users with status check."""
+    """
+    JWT-based authentication for users with status check.
 
-    def authenticate(self, request: HttpRequest, token: str) -> User | None:
-        user: User | None = super().authenticate(request, token)
+    With ``JWT_STATELESS_AUTH`` enabled, tokens carrying the status claims are trusted without a
+    database read and authenticate as a ``ClaimsUser``; tokens issued before the user's
+    revocation epoch (see ``revocation.py``) are rejected.
 
-        if user is None:
+    Verified tokens are kept in ``token_cache`` (when enabled) together with their user. Tokens
+    revoked individually (see ``revoked_tokens.py``) are rejected on every request.
+    """
+
+    def jwt_authenticate(self, request: HttpRequest, token: str) -> User | ClaimsUser:
+        request.user = AnonymousUser()
+        cached = token_cache.get(token)
+        if cached is None:
+            validated_token = self.get_validated_token(token)
+            user = self.get_user(validated_token)
+            token_cache.put(token, validated_token, user)
+        else:
+            validated_token, user = cached
+            if is_revoked(user.id, validated_token['iat']):
+                raise AuthenticationFailed('Token has been revoked')
+        if revoked_tokens.is_revoked(validated_token['jti']):
+            raise AuthenticationFailed('Token has been revoked')
+        request.user = user
+        return user
+
+    def authenticate(self, request: HttpRequest, token: str) -> User | ClaimsUser | None:
+        try:
+            user: User | ClaimsUser = super().authenticate(request, token)
+        except AuthenticationFailed:
             return None
 
         if user.status != User.STATUS_ACTIVE:
@@ -18,12 +67,103 @@ class JWTAuth(BaseJWTAuth):
 
         return user
 
+    def get_user(self, validated_token) -> User | ClaimsUser:  # type: ignore[override]
+        if not settings.JWT_STATELESS_AUTH or STATUS_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        user = ClaimsUser(validated_token)
+        if is_revoked(user.id, validated_token['iat']):
+            raise AuthenticationFailed('Token has been revoked')
+        return user
+
 
 class AdminAuth(JWTAuth):
     """JWT authentication that also requires admin (staff) privileges."""
 
-    def authenticate(self, request: HttpRequest, token: str) -> User | None:
-        user: User | None = super().authenticate(request, token)
+    def authenticate(self, request: HttpRequest, token: str) -> User | ClaimsUser | None:
+        user = super().authenticate(request, token)
+
+        if user is None:
+            return None
+
+        if not user.is_staff:
+            return None
+
+        return user
+
+
+class AsyncJWTAuth(JWTAuth, AsyncHttpBearer):
+    """
+    ``JWTAuth`` for async operations.
+
+    Performs the same checks without blocking the event loop: the user is loaded with the async
+    ORM, and the signing keys, revocation epochs and revoked-token filter are only reloaded (in a
+    worker thread) when they are due for a refresh. Signature verification itself is CPU-only.
+    """
+
+    async def jwt_authenticate(  # type: ignore[override]
+        self, request: HttpRequest, token: str
+    ) -> User | ClaimsUser:
+        request.user = AnonymousUser()
+        cached = token_cache.get(token)
+        if cached is None:
+            await key_ring.aget()
+            validated_token = self.get_validated_token(token)
+            user = await self.aget_user(validated_token)
+            token_cache.put(token, validated_token, user)
+        else:
+            validated_token, user = cached
+            if await ais_revoked(user.id, validated_token['iat']):
+                raise AuthenticationFailed('Token has been revoked')
+        if await revoked_tokens.ais_revoked(validated_token['jti']):
+            raise AuthenticationFailed('Token has been revoked')
+        request.user = user
+        return user
+
+    async def authenticate(  # type: ignore[override]
+        self, request: HttpRequest, token: str
+    ) -> User | ClaimsUser | None:
+        try:
+            user = await self.jwt_authenticate(request, token)
+        except AuthenticationFailed:
+            return None
+
+        if user.status != User.STATUS_ACTIVE:
+            return None
+
+        return user
+
+    async def aget_user(self, validated_token) -> User | ClaimsUser:
+        """Async ``get_user``."""
+        if settings.JWT_STATELESS_AUTH and STATUS_CLAIM in validated_token:
+            claims_user = ClaimsUser(validated_token)
+            if await ais_revoked(claims_user.id, validated_token['iat']):
+                raise AuthenticationFailed('Token has been revoked')
+            return claims_user
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken('Token contained no recognizable user identification') from e
+
+        try:
+            user = await User.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed('User not found') from e
+
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive')
+
+        return user
+
+
+class AsyncAdminAuth(AsyncJWTAuth):
+    """``AdminAuth`` for async operations."""
+
+    async def authenticate(  # type: ignore[override]
+        self, request: HttpRequest, token: str
+    ) -> User | ClaimsUser | None:
+        user = await super().authenticate(request, token)
 
         if user is None:
             return None
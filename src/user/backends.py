@@ -8,7 +8,7 @@ from .models import User
 
 
 class EmailBackend(ModelBackend):
-    """Authenticate using email instead of username."""
+    """Authenticate using email (case-insensitive) instead of username."""
 
     def authenticate(
         self,
@@ -22,7 +22,7 @@ class EmailBackend(ModelBackend):
             return None
 
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.get_by_natural_key(email)
         except User.DoesNotExist:
             return None
 
@@ -0,0 +1,185 @@
+"""
+Declarative sync of a service's permission and role catalog.
+
+``sync_catalog`` makes a service's permissions, roles and role -> permission mappings exactly
+those of a ``ServiceCatalog``: the current catalog is read in one query per table, compared with
+the desired one, and only the differences are written (``bulk_create``/``bulk_update`` for new
+and changed rows, ``delete`` for rows no longer listed) inside one transaction. Syncing an
+unchanged catalog therefore writes nothing, which makes it cheap to run on every deploy.
+
+Permissions and roles are matched by code and name; renaming one deletes the old row, and with it
+every grant of it. Holders of roles whose permissions change are notified once, at the end.
+"""
+
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Permission, Role, RolePermission, Service
+from .permission_index import bulk_create_permissions
+from .schemas import ServiceCatalog
+from .signals import (
+    batched_entitlement_changes,
+    notify_entitlements_changed,
+    users_with_roles,
+)
+
+BATCH_SIZE = 1000
+
+
+class InvalidCatalog(ValueError):
+    """Raised for a catalog that repeats codes or names, or maps roles to unlisted codes."""
+
+
+@dataclass(slots=True)
+class ChangeCounts:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+
+@dataclass(slots=True)
+class CatalogSummary:
+    permissions: ChangeCounts = field(default_factory=ChangeCounts)
+    roles: ChangeCounts = field(default_factory=ChangeCounts)
+    role_permissions: ChangeCounts = field(default_factory=ChangeCounts)
+
+    @property
+    def changed(self) -> bool:
+        return any(
+            counts.created or counts.updated or counts.deleted
+            for counts in (self.permissions, self.roles, self.role_permissions)
+        )
+
+
+def _duplicates(names: Iterable[str]) -> list[str]:
+    return sorted(name for name, count in Counter(names).items() if count > 1)
+
+
+def _validate(catalog: ServiceCatalog) -> None:
+    codes = [p.code for p in catalog.permissions]
+    problems = []
+    if duplicates := _duplicates(codes):
+        problems.append(f'Duplicate permissions: {", ".join(duplicates)}')
+    if duplicates := _duplicates(r.name for r in catalog.roles):
+        problems.append(f'Duplicate roles: {", ".join(duplicates)}')
+    if unknown := sorted({c for r in catalog.roles for c in r.permissions} - set(codes)):
+        problems.append(f'Unknown permissions: {", ".join(unknown)}')
+    if problems:
+        raise InvalidCatalog('; '.join(problems))
+
+
+def sync_catalog(service: Service, catalog: ServiceCatalog) -> CatalogSummary:
+    """
+    Make ``catalog`` the exact set of the service's permissions, roles and their mappings.
+
+    :returns: How many rows of each kind were created, updated and deleted.
+    :raises InvalidCatalog: If the catalog is inconsistent; nothing is changed then.
+    """
+    _validate(catalog)
+    summary = CatalogSummary()
+    now = timezone.now()
+
+    with transaction.atomic(), batched_entitlement_changes(RolePermission):
+        # Serializes concurrent syncs of the same service (a no-op on SQLite).
+        Service.objects.select_for_update().filter(pk=service.pk).values_list('pk').get()
+
+        permissions = {
+            p.code: p
+            for p in Permission.objects.filter(service=service, type=Permission.TYPE_SERVICE).only(
+                'id', 'code', 'description'
+            )
+        }
+        roles = {
+            r.name: r
+            for r in Role.objects.filter(service=service).only('id', 'name', 'description')
+        }
+        # (role id, permission id) -> mapping row id
+        mappings = {
+            (role_id, permission_id): pk
+            for pk, role_id, permission_id in RolePermission.objects.filter(
+                role__service=service
+            ).values_list('pk', 'role_id', 'permission_id')
+        }
+
+        # Rows no longer listed; their grants and mappings go with them.
+        wanted_codes = {p.code for p in catalog.permissions}
+        wanted_names = {r.name for r in catalog.roles}
+        stale_permissions = {p.id for code, p in permissions.items() if code not in wanted_codes}
+        stale_roles = {r.id for name, r in roles.items() if name not in wanted_names}
+        if stale_roles:
+            summary.roles.deleted = len(stale_roles)
+            Role.objects.filter(id__in=stale_roles).delete()
+        if stale_permissions:
+            summary.permissions.deleted = len(stale_permissions)
+            Permission.objects.filter(id__in=stale_permissions).delete()
+        mappings = {
+            key: pk
+            for key, pk in mappings.items()
+            if key[0] not in stale_roles and key[1] not in stale_permissions
+        }
+
+        new_permissions, changed_permissions = [], []
+        for item in catalog.permissions:
+            permission = permissions.get(item.code)
+            if permission is None:
+                permissions[item.code] = permission = Permission(
+                    service=service,
+                    type=Permission.TYPE_SERVICE,
+                    code=item.code,
+                    description=item.description,
+                )
+                new_permissions.append(permission)
+            elif permission.description != item.description:
+                permission.description, permission.updated_at = item.description, now
+                changed_permissions.append(permission)
+        if new_permissions:
+            bulk_create_permissions(new_permissions, batch_size=BATCH_SIZE)
+        if changed_permissions:
+            Permission.objects.bulk_update(
+                changed_permissions, ['description', 'updated_at'], batch_size=BATCH_SIZE
+            )
+        summary.permissions.created = len(new_permissions)
+        summary.permissions.updated = len(changed_permissions)
+
+        new_roles, changed_roles = [], []
+        for item in catalog.roles:
+            role = roles.get(item.name)
+            if role is None:
+                roles[item.name] = role = Role(
+                    service=service, name=item.name, description=item.description
+                )
+                new_roles.append(role)
+            elif role.description != item.description:
+                role.description, role.updated_at = item.description, now
+                changed_roles.append(role)
+        if new_roles:
+            Role.objects.bulk_create(new_roles, batch_size=BATCH_SIZE)
+        if changed_roles:
+            Role.objects.bulk_update(
+                changed_roles, ['description', 'updated_at'], batch_size=BATCH_SIZE
+            )
+        summary.roles.created = len(new_roles)
+        summary.roles.updated = len(changed_roles)
+
+        wanted = {
+            (roles[item.name].id, permissions[code].id)
+            for item in catalog.roles
+            for code in item.permissions
+        }
+        removed, added = mappings.keys() - wanted, wanted - mappings.keys()
+        if removed:
+            summary.role_permissions.deleted = len(removed)
+            RolePermission.objects.filter(pk__in=[mappings[key] for key in removed]).delete()
+        if added:
+            summary.role_permissions.created = len(added)
+            RolePermission.objects.bulk_create(
+                [RolePermission(role_id=r, permission_id=p) for r, p in added],
+                batch_size=BATCH_SIZE,
+            )
+            notify_entitlements_changed(RolePermission, users_with_roles({r for r, _ in added}))
+
+    return summary
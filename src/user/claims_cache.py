@@ -0,0 +1,140 @@
+"""
+Versioned in-process cache of resolved entitlement claims.
+
+Entries are keyed by user id and tagged with the global and per-user entitlement versions that
+were current when they were loaded. Versions live in Django's cache framework so that every
+process sharing that cache (configure a shared backend such as Redis in production) sees a bump
+immediately; an entry whose versions no longer match is treated as a miss and reloaded.
+
+The cache is bounded by ``CLAIMS_CACHE_MAX_ENTRIES`` (least recently used entries are evicted
+first; ``0`` disables caching) and entries expire after ``CLAIMS_CACHE_TTL_SECONDS``.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .metrics import Counters
+
+GLOBAL_VERSION_KEY = 'entitlements:version'
+USER_VERSION_KEY = 'entitlements:version:{}'
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_TTL_SECONDS = 300
+
+
+def _user_version_key(user_id: UUID | str) -> str:
+    return USER_VERSION_KEY.format(user_id)
+
+
+def _bump(key: str) -> None:
+    # ``incr`` fails on a missing key; ``add`` is a no-op if another process created it first.
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def bump_entitlement_version(user_ids: Iterable[UUID | str] | None = None) -> None:
+    """
+    Invalidate cached claims.
+
+    Bumps the version of each given user, or the global version (invalidating every user) when
+    ``user_ids`` is ``None``.
+    """
+    if user_ids is None:
+        _bump(GLOBAL_VERSION_KEY)
+        claims_cache.clear()
+        return
+
+    for user_id in user_ids:
+        _bump(_user_version_key(user_id))
+        claims_cache.discard(user_id)
+
+
+def current_versions(user_id: UUID | str) -> tuple[int, int]:
+    """Return the ``(global, user)`` entitlement versions."""
+    user_key = _user_version_key(user_id)
+    values = cache.get_many([GLOBAL_VERSION_KEY, user_key])
+    return values.get(GLOBAL_VERSION_KEY, 0), values.get(user_key, 0)
+
+
+class ClaimsCache:
+    """Bounded LRU + TTL cache of claims, validated against entitlement versions."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        # user id -> (versions, expires_at, claims)
+        self._entries: OrderedDict[str, tuple[tuple[int, int], float, dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self.counters = Counters('claims_cache')
+
+    @property
+    def max_entries(self) -> int:
+        return getattr(settings, 'CLAIMS_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, 'CLAIMS_CACHE_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_load(
+        self, user_id: UUID | str, loader: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Return cached claims for the user, calling ``loader`` on a miss or stale entry."""
+        if self.max_entries <= 0:
+            return loader()
+
+        key = str(user_id)
+        # Read versions before loading, so a bump racing with the load invalidates the result.
+        versions = current_versions(key)
+        now = self._clock()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == versions and entry[1] > now:
+                self._entries.move_to_end(key)
+                self.counters.incr('hits')
+                return entry[2]
+
+        self.counters.incr('misses')
+        claims = loader()
+
+        with self._lock:
+            self._entries[key] = (versions, now + self.ttl, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters.incr('evictions')
+
+        return claims
+
+    def discard(self, user_id: UUID | str) -> None:
+        with self._lock:
+            self._entries.pop(str(user_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current size."""
+        return (
+            {'hits': 0, 'misses': 0, 'evictions': 0}
+            | self.counters.snapshot()
+            | {'size': len(self._entries)}
+        )
+
+
+claims_cache = ClaimsCache()
@@ -0,0 +1,197 @@
+"""
+Entitlement resolution.
+
+Computes users' global roles, global permissions and per-service roles/permissions in a fixed
+number of set-based queries, independent of how many services, roles or permissions they have.
+Results are plain tuples so they can be cached, serialized or embedded in tokens as-is.
+"""
+
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import UUID
+
+from django.db.models import BooleanField, Value
+
+from .models import (
+    RolePermission,
+    UserGlobalPermission,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ServiceEntitlements:
+    service_id: str
+    service_name: str
+    roles: tuple[str, ...] = ()
+    # Permissions granted directly to the user for this service.
+    direct_permissions: tuple[str, ...] = ()
+    # Direct permissions plus the permissions of every role held in this service.
+    permissions: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Entitlements:
+    global_roles: tuple[str, ...] = ()
+    global_permissions: tuple[str, ...] = ()
+    services: tuple[ServiceEntitlements, ...] = field(default_factory=tuple)
+
+    def to_claims(self) -> dict[str, Any]:
+        """Return the entitlement claims embedded in access tokens."""
+        return {
+            'global_permissions': list(self.global_permissions),
+            'global_roles': list(self.global_roles),
+            'services': {
+                s.service_id: {'permissions': list(s.permissions), 'roles': list(s.roles)}
+                for s in self.services
+            },
+        }
+
+
+def _resolve_global(
+    user_ids: list[UUID | str],
+) -> dict[str, tuple[tuple[str, ...], tuple[str, ...]]]:
+    """Map each user id to its sorted ``(global_roles, global_permissions)``. Two queries."""
+    roles: dict[str, set[str]] = defaultdict(set)
+    for uid, name in UserGlobalRole.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'role__name'
+    ):
+        roles[str(uid)].add(name)
+
+    direct = UserGlobalPermission.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'permission__code'
+    )
+    via_roles = RolePermission.objects.filter(
+        role__userglobalrole__user_id__in=user_ids
+    ).values_list('role__userglobalrole__user_id', 'permission__code')
+    permissions: dict[str, set[str]] = defaultdict(set)
+    for uid, code in direct.union(via_roles):
+        permissions[str(uid)].add(code)
+
+    return {
+        str(uid): (tuple(sorted(roles[str(uid)])), tuple(sorted(permissions[str(uid)])))
+        for uid in user_ids
+    }
+
+
+def _resolve_services(
+    user_ids: list[UUID | str], service_id: UUID | str | None = None
+) -> dict[str, tuple[ServiceEntitlements, ...]]:
+    """Map each user id to its assigned services' entitlements. Three queries."""
+    scope: dict[str, Any] = {'user_id__in': user_ids}
+    if service_id is not None:
+        scope['service_id'] = service_id
+
+    names: dict[str, dict[str, str]] = defaultdict(dict)
+    for uid, sid, name in UserServiceAssignment.objects.filter(**scope).values_list(
+        'user_id', 'service_id', 'service__name'
+    ):
+        names[str(uid)][str(sid)] = name
+    if not names:
+        return {str(uid): () for uid in user_ids}
+
+    roles: dict[tuple[str, str], set[str]] = defaultdict(set)
+    for uid, sid, role_name in UserServiceRole.objects.filter(**scope).values_list(
+        'user_id', 'service_id', 'role__name'
+    ):
+        roles[str(uid), str(sid)].add(role_name)
+
+    # Direct and role-derived permissions in one round trip, tagged by origin.
+    direct_qs = (
+        UserServicePermission.objects.filter(**scope)
+        .annotate(direct=Value(True, output_field=BooleanField()))
+        .values_list('user_id', 'service_id', 'permission__code', 'direct')
+    )
+    via_roles_qs = (
+        UserServiceRole.objects.filter(**scope, role__role_permissions__isnull=False)
+        .annotate(direct=Value(False, output_field=BooleanField()))
+        .values_list('user_id', 'service_id', 'role__role_permissions__permission__code', 'direct')
+    )
+    direct_perms: dict[tuple[str, str], set[str]] = defaultdict(set)
+    effective_perms: dict[tuple[str, str], set[str]] = defaultdict(set)
+    for uid, sid, code, is_direct in direct_qs.union(via_roles_qs):
+        key = (str(uid), str(sid))
+        effective_perms[key].add(code)
+        if is_direct:
+            direct_perms[key].add(code)
+
+    return {
+        str(uid): tuple(
+            ServiceEntitlements(
+                service_id=sid,
+                service_name=name,
+                roles=tuple(sorted(roles[str(uid), sid])),
+                direct_permissions=tuple(sorted(direct_perms[str(uid), sid])),
+                permissions=tuple(sorted(effective_perms[str(uid), sid])),
+            )
+            for sid, name in sorted(names[str(uid)].items(), key=lambda item: item[1])
+        )
+        for uid in user_ids
+    }
+
+
+def resolve_services(
+    user_id: UUID | str, service_id: UUID | str | None = None
+) -> tuple[ServiceEntitlements, ...]:
+    """
+    Resolve per-service roles and permissions for every service the user is assigned to.
+
+    Only services with a ``UserServiceAssignment`` are returned. Pass ``service_id`` to restrict
+    resolution to a single service.
+
+    :returns: One ``ServiceEntitlements`` per assigned service, ordered by service name.
+    """
+    return _resolve_services([user_id], service_id)[str(user_id)]
+
+
+def resolve_service_bulk(
+    service_id: UUID | str, user_ids: Iterable[UUID | str]
+) -> dict[str, ServiceEntitlements]:
+    """
+    Resolve one service's roles and permissions for many users at once, in three queries.
+
+    :returns: Entitlements keyed by ``str(user_id)``; users not assigned to the service are left
+        out.
+    """
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+
+    return {
+        uid: services[0] for uid, services in _resolve_services(ids, service_id).items() if services
+    }
+
+
+def resolve_entitlements_bulk(user_ids: Iterable[UUID | str]) -> dict[str, Entitlements]:
+    """
+    Resolve entitlements for many users at once.
+
+    Costs the same constant number of queries as resolving a single user, so callers should
+    batch ids (a few thousand at a time) rather than loop over ``resolve_entitlements``.
+
+    :returns: Entitlements keyed by ``str(user_id)``.
+    """
+    ids = list(dict.fromkeys(user_ids))
+    if not ids:
+        return {}
+
+    global_data = _resolve_global(ids)
+    services = _resolve_services(ids)
+    return {
+        str(uid): Entitlements(
+            global_roles=global_data[str(uid)][0],
+            global_permissions=global_data[str(uid)][1],
+            services=services[str(uid)],
+        )
+        for uid in ids
+    }
+
+
+def resolve_entitlements(user_id: UUID | str) -> Entitlements:
+    """Resolve all entitlements for a user in a constant number of queries."""
+    return resolve_entitlements_bulk([user_id])[str(user_id)]
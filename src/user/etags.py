@@ -0,0 +1,92 @@
+"""
+Strong ETags for the polled admin read endpoints.
+
+Each ETag hashes a cheap fingerprint of the rows behind a response, read with one aggregate query,
+so a client sending ``If-None-Match`` gets a 304 before any rows are loaded or response models are
+built:
+
+- Lists (services, a service's roles or permissions) use the row count and the latest
+  ``updated_at``. Every insert, update and delete changes one of them: a saved row becomes the
+  newest one, and a deleted row lowers the count.
+- A user's services use the ``updated_at`` of the user's entitlement snapshot, which is rewritten
+  whenever the user's grants, or the roles and permissions behind them, change (see
+  ``signals.py``), plus the latest ``updated_at`` of the assigned services for their names.
+  Users without a snapshot get no ETag.
+
+Query parameters that shape the response (cursor, limit, flags) are part of the ETag.
+"""
+
+import hashlib
+from datetime import datetime
+from uuid import UUID
+
+from django.db.models import Count, Max, QuerySet
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+
+from .models import User
+
+
+def make_etag(*parts: object) -> str:
+    """Return a strong ETag for the given fingerprint parts."""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def _list_fingerprint() -> dict:
+    return {'count': Count('pk'), 'last': Max('updated_at')}
+
+
+def list_etag(queryset: QuerySet, *parts: object) -> str:
+    """ETag of a list endpoint over ``queryset`` (a model with ``updated_at``)."""
+    stats = queryset.aggregate(**_list_fingerprint())
+    return make_etag(stats['count'], stats['last'], *parts)
+
+
+async def alist_etag(queryset: QuerySet, *parts: object) -> str:
+    """Async ``list_etag``."""
+    stats = await queryset.aaggregate(**_list_fingerprint())
+    return make_etag(stats['count'], stats['last'], *parts)
+
+
+def _user_services_fingerprint(user_id: UUID) -> QuerySet:
+    return (
+        User.objects.filter(id=user_id)
+        .annotate(services_updated=Max('service_assignments__service__updated_at'))
+        .values_list('entitlement_snapshot__updated_at', 'services_updated')
+    )
+
+
+def _user_services_etag(
+    row: tuple[datetime | None, datetime | None] | None, parts: tuple[object, ...]
+) -> str | None:
+    if row is None:
+        raise User.DoesNotExist
+    snapshot_updated, services_updated = row
+    if snapshot_updated is None:
+        return None
+    return make_etag(snapshot_updated, services_updated, *parts)
+
+
+def user_services_etag(user_id: UUID, *parts: object) -> str | None:
+    """
+    ETag of a user's service assignments, or ``None`` when the user has no snapshot yet.
+
+    Raises ``User.DoesNotExist`` for an unknown user, so callers need no separate existence check.
+    """
+    return _user_services_etag(_user_services_fingerprint(user_id).first(), parts)
+
+
+async def auser_services_etag(user_id: UUID, *parts: object) -> str | None:
+    """Async ``user_services_etag``."""
+    return _user_services_etag(await _user_services_fingerprint(user_id).afirst(), parts)
+
+
+def not_modified(request: HttpRequest, etag: str | None) -> HttpResponse | None:
+    """Return a 304 response when the request's ``If-None-Match`` matches ``etag``."""
+    if etag is None:
+        return None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response['ETag'] = etag
+    return response
@@ -0,0 +1,61 @@
+"""
+Streaming export of a service's users and their entitlements, as NDJSON.
+
+``export_lines`` walks the service's assignments with a chunked database iterator and resolves
+entitlements for ``batch_size`` users at a time, so memory use depends on the batch size, not on
+the number of users. Each line is one JSON object::
+
+    {"user_id": "...", "email": "...", "status": "ACTIVE", "roles": [...], "permissions": [...]}
+
+where ``permissions`` are the effective ones (direct and role-derived). Users are ordered by id.
+"""
+
+import json
+from collections.abc import Iterator
+from uuid import UUID
+
+from .entitlements import resolve_service_bulk
+from .models import UserServiceAssignment
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _batched_users(
+    service_id: UUID | str, batch_size: int
+) -> Iterator[list[tuple[UUID, str, str]]]:
+    rows = (
+        UserServiceAssignment.objects.filter(service_id=service_id)
+        .order_by('user_id')
+        .values_list('user_id', 'user__email', 'user__status')
+        .iterator(batch_size)
+    )
+    batch: list[tuple[UUID, str, str]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def export_lines(service_id: UUID | str, batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[bytes]:
+    """Yield the service's export, one chunk of NDJSON lines per batch of users."""
+    for batch in _batched_users(service_id, batch_size):
+        entitlements = resolve_service_bulk(service_id, [uid for uid, _, _ in batch])
+        lines = []
+        for uid, email, status in batch:
+            service = entitlements.get(str(uid))
+            lines.append(
+                json.dumps(
+                    {
+                        'user_id': str(uid),
+                        'email': email,
+                        'status': status,
+                        'roles': list(service.roles) if service else [],
+                        'permissions': list(service.permissions) if service else [],
+                    },
+                    separators=(',', ':'),
+                )
+            )
+        yield ('\n'.join(lines) + '\n').encode()
@@ -0,0 +1,118 @@
+"""
+Bounded thread pool for password checks from async code, and parallel bulk hashing.
+
+Password hashing is deliberately slow. Async views hand ``check_password`` to
+``password_hash_pool`` (``PASSWORD_HASH_WORKERS`` threads; hashlib releases the GIL while hashing)
+instead of blocking the event loop. At most ``PASSWORD_HASH_MAX_QUEUE`` further checks may wait
+for a worker; beyond that ``PoolSaturated`` is raised right away, so a login spike is answered
+with fast 503s instead of an ever-growing queue.
+
+``hash_passwords`` hashes many passwords at once for bulk provisioning, on its own
+``PASSWORD_HASH_BULK_WORKERS`` threads so it never takes workers or queue slots from logins.
+"""
+
+import asyncio
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from .metrics import Counters
+from .models import User
+
+T = TypeVar('T')
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_QUEUE = 16
+DEFAULT_BULK_WORKERS = os.cpu_count() or 1
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the queue is full."""
+
+
+class PasswordHashPool:
+    def __init__(self, workers: int | None = None, max_queue: int | None = None) -> None:
+        self._workers = workers
+        self._max_queue = max_queue
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._executor: ThreadPoolExecutor | None = None
+        self.counters = Counters('password_hash_pool')
+
+    @property
+    def workers(self) -> int:
+        if self._workers is not None:
+            return self._workers
+        return getattr(settings, 'PASSWORD_HASH_WORKERS', DEFAULT_WORKERS)
+
+    @property
+    def max_queue(self) -> int:
+        if self._max_queue is not None:
+            return self._max_queue
+        return getattr(settings, 'PASSWORD_HASH_MAX_QUEUE', DEFAULT_MAX_QUEUE)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='password-hash'
+            )
+        return self._executor
+
+    def _release(self, _future: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the pool. Raises ``PoolSaturated`` instead of queueing too much."""
+        with self._lock:
+            if self._in_flight >= self.workers + self.max_queue:
+                self.counters.incr('rejected')
+                raise PoolSaturated()
+            self._in_flight += 1
+            executor = self._get_executor()
+
+        self.counters.incr('submitted')
+        # Released when the work finishes, even if the awaiting request is cancelled.
+        future = executor.submit(fn, *args)
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    async def check_password(self, user: User, raw_password: str) -> bool:
+        return await self.run(user.check_password, raw_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+    def stats(self) -> dict[str, int]:
+        """Return submitted/rejected counters and the number of checks in flight."""
+        return (
+            {'submitted': 0, 'rejected': 0}
+            | self.counters.snapshot()
+            | {'in_flight': self._in_flight}
+        )
+
+
+password_hash_pool = PasswordHashPool()
+
+
+def hash_passwords(raw_passwords: Sequence[str | None]) -> list[str]:
+    """Return ``make_password`` of each password (unusable for ``None``), hashed in parallel."""
+    workers = min(
+        getattr(settings, 'PASSWORD_HASH_BULK_WORKERS', DEFAULT_BULK_WORKERS), len(raw_passwords)
+    )
+    if workers <= 1:
+        return [make_password(raw) for raw in raw_passwords]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-bulk-hash') as pool:
+        return list(pool.map(make_password, raw_passwords))
@@ -0,0 +1,489 @@
+"""
+Bulk import of services, permissions, roles, users and assignments from CSV or NDJSON files.
+
+Meant for migrating an existing identity store, where going through the REST API one object at a
+time would take days. Files are read as streams (``.csv``, ``.ndjson``/``.jsonl``, optionally
+``.gz``-compressed), each record is validated with its schema from ``schemas/imports.py``, and
+records are written ``batch_size`` at a time with ``bulk_create``, one transaction per batch.
+Rows that already exist are left alone (services get their description and status updated), so
+an import can be re-run. In CSV files, empty cells take the schema default and list columns
+(``roles``, ``permissions``) hold space-separated names.
+
+``bulk_create`` sends no model signals, so nothing runs per row: passwords given as
+``password_hash`` are stored without hashing (others are hashed in parallel, see
+``hashing.hash_passwords``), and snapshots and cached claims of the users in a batch are
+refreshed once per batch (or not at all with ``notify=False``, to rebuild them afterwards with
+``manage.py entitlement_snapshots``).
+
+Invalid records, and records naming services, roles, permissions or users that do not exist, are
+reported and skipped. With a ``Checkpoint``, the number of rows done in each file is saved after
+every committed batch, and an interrupted import resumes after the last one.
+"""
+
+import csv
+import gzip
+import json
+import os
+import secrets
+import time
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+from uuid import UUID
+
+from django.db import transaction
+from pydantic import BaseModel, ValidationError
+
+from .hashing import hash_passwords
+from .models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserGlobalPermission,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+    normalized_email,
+)
+from .permission_index import bulk_create_permissions
+from .schemas import (
+    AssignmentImport,
+    PermissionImport,
+    RoleImport,
+    RolePermissionImport,
+    ServiceImport,
+    UserImport,
+)
+from .signals import notify_entitlements_changed, users_with_roles
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Import order: each kind only refers to kinds before it.
+SCHEMAS: dict[str, type[BaseModel]] = {
+    'services': ServiceImport,
+    'permissions': PermissionImport,
+    'roles': RoleImport,
+    'role_permissions': RolePermissionImport,
+    'users': UserImport,
+    'assignments': AssignmentImport,
+}
+
+
+class ImportFileError(ValueError):
+    """Raised for a file that cannot be read as CSV or NDJSON."""
+
+
+@dataclass(slots=True)
+class Rejected:
+    line: int
+    reason: str
+
+
+@dataclass(slots=True)
+class FileResult:
+    kind: str
+    path: str
+    # Rows read in this run (rows skipped by resuming from a checkpoint are not counted).
+    rows: int = 0
+    rejected: list[Rejected] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+class Checkpoint:
+    """Rows done per imported file, saved to a JSON file after every batch."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._done: dict[str, int] = json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    @staticmethod
+    def _key(kind: str, path: str) -> str:
+        return f'{kind}:{os.path.abspath(path)}'
+
+    def done(self, kind: str, path: str) -> int:
+        return self._done.get(self._key(kind, path), 0)
+
+    def save(self, kind: str, path: str, rows: int) -> None:
+        self._done[self._key(kind, path)] = rows
+        # Replaced atomically, so an interruption never leaves a truncated checkpoint.
+        temporary = self.path.with_name(f'{self.path.name}.tmp')
+        temporary.write_text(json.dumps(self._done, indent=2))
+        os.replace(temporary, self.path)
+
+
+def _open(path: str) -> IO[str]:
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def read_records(path: str, skip: int = 0) -> Iterator[tuple[int, dict[str, str] | str]]:
+    """
+    Yield ``(line number, record)`` for each record after the first ``skip``.
+
+    Records are CSV rows as dicts of non-empty cells, or NDJSON lines as unparsed strings.
+    """
+    name = path.removesuffix('.gz')
+    if name.endswith('.csv'):
+        with _open(path) as stream:
+            reader = csv.DictReader(stream)
+            for index, row in enumerate(reader):
+                if index >= skip:
+                    yield reader.line_num, {k: v for k, v in row.items() if k and v}
+    elif name.endswith(('.ndjson', '.jsonl')):
+        with _open(path) as stream:
+            index = 0
+            for number, line in enumerate(stream, 1):
+                if line.strip():
+                    if index >= skip:
+                        yield number, line
+                    index += 1
+    else:
+        raise ImportFileError(f'{path}: expected a .csv, .ndjson or .jsonl file')
+
+
+def _validate(schema: type[BaseModel], record: dict[str, str] | str) -> BaseModel:
+    if isinstance(record, str):
+        return schema.model_validate_json(record)
+    return schema.model_validate(
+        {
+            key: value.split() if schema.model_fields[key].annotation == list[str] else value
+            for key, value in record.items()
+            if key in schema.model_fields
+        }
+    )
+
+
+def _errors(exc: ValidationError) -> str:
+    return '; '.join(
+        f'{".".join(map(str, e["loc"]))}: {e["msg"]}' if e['loc'] else e['msg']
+        for e in exc.errors()
+    )
+
+
+def _batches(items: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Keys of catalog rows: (service id or None for global, code or name).
+Key = tuple[UUID | None, str]
+
+
+class Importer:
+    """Imports files in batches; keeps name -> id maps of the catalog it has seen."""
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        notify: bool = True,
+        checkpoint: Checkpoint | None = None,
+        progress: Callable[[str], None] | None = None,
+    ) -> None:
+        self.batch_size = batch_size
+        self.notify = notify
+        self.checkpoint = checkpoint
+        self.progress = progress or (lambda message: None)
+        self._services: dict[str, UUID] | None = None
+        self._permissions: dict[Key, UUID] | None = None
+        self._roles: dict[Key, UUID] | None = None
+
+    # -- Catalog lookups, loaded once (catalogs are small next to the users) --
+
+    @property
+    def services(self) -> dict[str, UUID]:
+        if self._services is None:
+            self._services = dict(Service.objects.values_list('name', 'id'))
+        return self._services
+
+    @property
+    def permissions(self) -> dict[Key, UUID]:
+        if self._permissions is None:
+            self._permissions = {
+                (sid, code): pk
+                for sid, code, pk in Permission.objects.values_list('service_id', 'code', 'id')
+            }
+        return self._permissions
+
+    @property
+    def roles(self) -> dict[Key, UUID]:
+        if self._roles is None:
+            self._roles = {
+                (sid, name): pk
+                for sid, name, pk in Role.objects.values_list('service_id', 'name', 'id')
+            }
+        return self._roles
+
+    def _service_id(self, name: str | None) -> UUID | None:
+        """Id of the named service (``None`` for no name). Raises ``LookupError`` if unknown."""
+        if not name:
+            return None
+        if name not in self.services:
+            raise LookupError(f'Unknown service: {name}')
+        return self.services[name]
+
+    def _ids(self, known: dict[Key, UUID], kind: str, service_id: UUID | None, names) -> list:
+        missing = sorted({n for n in names if (service_id, n) not in known})
+        if missing:
+            raise LookupError(f'Unknown {kind}: {", ".join(missing)}')
+        return [known[service_id, n] for n in dict.fromkeys(names)]
+
+    # -- Files --
+
+    def import_file(self, kind: str, path: str) -> FileResult:
+        """Import one file of ``kind`` records (see ``SCHEMAS``)."""
+        schema, write = SCHEMAS[kind], getattr(self, f'_write_{kind}')
+        result = FileResult(kind=kind, path=path)
+        done = self.checkpoint.done(kind, path) if self.checkpoint else 0
+        if done:
+            self.progress(f'{kind}: resuming {path} after row {done:,}')
+
+        start = time.perf_counter()
+        for batch in _batches(read_records(path, skip=done), self.batch_size):
+            valid = []
+            for line, record in batch:
+                try:
+                    valid.append((line, _validate(schema, record)))
+                except ValidationError as exc:
+                    result.rejected.append(Rejected(line, _errors(exc)))
+            result.rejected.extend(write(valid))
+
+            done += len(batch)
+            result.rows += len(batch)
+            if self.checkpoint:
+                self.checkpoint.save(kind, path, done)
+            result.seconds = time.perf_counter() - start or 1e-9
+            self.progress(
+                f'{kind}: {done:,} rows ({result.rows / result.seconds:,.0f} rows/s, '
+                f'{len(result.rejected):,} rejected)'
+            )
+        result.seconds = time.perf_counter() - start
+        return result
+
+    @staticmethod
+    def _resolve(records, resolve: Callable[[Any], Any]) -> tuple[list, list[Rejected]]:
+        """
+        Return ``(line, record, resolve(record))`` for each record, and the records rejected
+        because ``resolve`` raised ``LookupError`` for them.
+        """
+        resolved, rejected = [], []
+        for line, record in records:
+            try:
+                resolved.append((line, record, resolve(record)))
+            except LookupError as exc:
+                rejected.append(Rejected(line, str(exc)))
+        return resolved, rejected
+
+    # -- Writers: each takes a batch of (line, record) and returns the rejected ones --
+
+    def _write_services(self, records: list[tuple[int, ServiceImport]]) -> list[Rejected]:
+        rows = {
+            r.name: Service(
+                name=r.name,
+                description=r.description,
+                status=r.status,
+                client_id=r.client_id or secrets.token_urlsafe(32),
+                client_secret=r.client_secret,
+            )
+            for _, r in records
+        }
+        with transaction.atomic():
+            Service.objects.bulk_create(
+                rows.values(),
+                update_conflicts=True,
+                unique_fields=['name'],
+                update_fields=['description', 'status', 'updated_at'],
+            )
+        self.services.update(Service.objects.filter(name__in=list(rows)).values_list('name', 'id'))
+        return []
+
+    def _write_permissions(self, records: list[tuple[int, PermissionImport]]) -> list[Rejected]:
+        resolved, rejected = self._resolve(records, lambda r: self._service_id(r.service))
+        new: dict[Key, Permission] = {}
+        for _, record, service_id in resolved:
+            key = (service_id, record.code)
+            if key not in self.permissions and key not in new:
+                new[key] = Permission(
+                    service_id=service_id,
+                    type=Permission.TYPE_SERVICE if service_id else Permission.TYPE_GLOBAL,
+                    code=record.code,
+                    description=record.description,
+                )
+
+        with transaction.atomic():
+            bulk_create_permissions(list(new.values()), ignore_conflicts=True)
+        self.permissions.update(
+            ((sid, code), pk)
+            for sid, code, pk in Permission.objects.filter(
+                code__in={code for _, code in new}
+            ).values_list('service_id', 'code', 'id')
+        )
+        return rejected
+
+    def _write_roles(self, records: list[tuple[int, RoleImport]]) -> list[Rejected]:
+        def resolve(record: RoleImport) -> tuple[UUID | None, list[UUID]]:
+            service_id = self._service_id(record.service)
+            return service_id, self._ids(
+                self.permissions, 'permissions', service_id, record.permissions
+            )
+
+        resolved, rejected = self._resolve(records, resolve)
+        new: dict[Key, Role] = {}
+        for _, record, (service_id, _) in resolved:
+            key = (service_id, record.name)
+            if key not in self.roles and key not in new:
+                new[key] = Role(
+                    service_id=service_id, name=record.name, description=record.description
+                )
+
+        with transaction.atomic():
+            Role.objects.bulk_create(new.values(), ignore_conflicts=True)
+            self.roles.update(
+                ((sid, name), pk)
+                for sid, name, pk in Role.objects.filter(
+                    name__in={name for _, name in new}
+                ).values_list('service_id', 'name', 'id')
+            )
+            self._write_mappings(
+                (self.roles[service_id, record.name], permission_id)
+                for _, record, (service_id, permission_ids) in resolved
+                for permission_id in permission_ids
+            )
+        return rejected
+
+    def _write_role_permissions(
+        self, records: list[tuple[int, RolePermissionImport]]
+    ) -> list[Rejected]:
+        def resolve(record: RolePermissionImport) -> tuple[UUID, UUID]:
+            service_id = self._service_id(record.service)
+            (role_id,) = self._ids(self.roles, 'roles', service_id, [record.role])
+            (permission_id,) = self._ids(
+                self.permissions, 'permissions', service_id, [record.permission]
+            )
+            return role_id, permission_id
+
+        resolved, rejected = self._resolve(records, resolve)
+        with transaction.atomic():
+            self._write_mappings(pair for _, _, pair in resolved)
+        return rejected
+
+    def _write_mappings(self, pairs: Iterable[tuple[UUID, UUID]]) -> None:
+        pairs = set(pairs)
+        RolePermission.objects.bulk_create(
+            [RolePermission(role_id=r, permission_id=p) for r, p in pairs], ignore_conflicts=True
+        )
+        if self.notify and pairs:
+            # Existing holders of the roles, when re-importing.
+            notify_entitlements_changed(RolePermission, users_with_roles({r for r, _ in pairs}))
+
+    def _write_users(self, records: list[tuple[int, UserImport]]) -> list[Rejected]:
+        def resolve(record: UserImport) -> tuple[list[UUID], list[UUID]]:
+            return (
+                self._ids(self.roles, 'roles', None, record.roles),
+                self._ids(self.permissions, 'permissions', None, record.permissions),
+            )
+
+        resolved, rejected = self._resolve(records, resolve)
+        by_email: dict[str, tuple[UserImport, tuple[list[UUID], list[UUID]]]] = {}
+        for line, record, grants in resolved:
+            key = normalized_email(record.email)
+            if key in by_email:
+                rejected.append(Rejected(line, 'Duplicate email in batch'))
+            else:
+                by_email[key] = (record, grants)
+
+        existing = set(
+            User.objects.filter(email_normalized__in=list(by_email)).values_list(
+                'email_normalized', flat=True
+            )
+        )
+        new = [(key, record) for key, (record, _) in by_email.items() if key not in existing]
+        # Pre-hashed passwords are stored as is; only the others are hashed.
+        passwords = [record.password_hash for _, record in new]
+        unhashed = [i for i, password in enumerate(passwords) if password is None]
+        for i, encoded in zip(unhashed, hash_passwords([new[i][1].password for i in unhashed])):
+            passwords[i] = encoded
+        users = [
+            User(
+                email=record.email,
+                email_normalized=key,
+                name=record.name,
+                status=record.status,
+                password=password,
+            )
+            for (key, record), password in zip(new, passwords)
+        ]
+
+        with transaction.atomic():
+            User.objects.bulk_create(users, ignore_conflicts=True)
+            user_ids = dict(
+                User.objects.filter(email_normalized__in=list(by_email)).values_list(
+                    'email_normalized', 'id'
+                )
+            )
+            roles, permissions = [], []
+            for key, (_, (role_ids, permission_ids)) in by_email.items():
+                roles += [UserGlobalRole(user_id=user_ids[key], role_id=r) for r in role_ids]
+                permissions += [
+                    UserGlobalPermission(user_id=user_ids[key], permission_id=p)
+                    for p in permission_ids
+                ]
+            UserGlobalRole.objects.bulk_create(roles, ignore_conflicts=True)
+            UserGlobalPermission.objects.bulk_create(permissions, ignore_conflicts=True)
+            if self.notify:
+                # Users without grants have nothing to refresh; their snapshots are built on use.
+                notify_entitlements_changed(
+                    UserGlobalRole, {row.user_id for row in [*roles, *permissions]}
+                )
+        return rejected
+
+    def _write_assignments(self, records: list[tuple[int, AssignmentImport]]) -> list[Rejected]:
+        user_ids = dict(
+            User.objects.filter(
+                email_normalized__in=[normalized_email(r.email) for _, r in records]
+            ).values_list('email_normalized', 'id')
+        )
+
+        def resolve(record: AssignmentImport) -> tuple[UUID, UUID, list[UUID], list[UUID]]:
+            user_id = user_ids.get(normalized_email(record.email))
+            if user_id is None:
+                raise LookupError(f'Unknown user: {record.email}')
+            service_id = self._service_id(record.service)
+            return (
+                user_id,
+                service_id,
+                self._ids(self.roles, 'roles', service_id, record.roles),
+                self._ids(self.permissions, 'permissions', service_id, record.permissions),
+            )
+
+        resolved, rejected = self._resolve(records, resolve)
+        assignments, roles, permissions = [], [], []
+        for _, _, (user_id, service_id, role_ids, permission_ids) in resolved:
+            assignments.append(UserServiceAssignment(user_id=user_id, service_id=service_id))
+            roles += [
+                UserServiceRole(user_id=user_id, service_id=service_id, role_id=r) for r in role_ids
+            ]
+            permissions += [
+                UserServicePermission(user_id=user_id, service_id=service_id, permission_id=p)
+                for p in permission_ids
+            ]
+
+        with transaction.atomic():
+            UserServiceAssignment.objects.bulk_create(assignments, ignore_conflicts=True)
+            UserServiceRole.objects.bulk_create(roles, ignore_conflicts=True)
+            UserServicePermission.objects.bulk_create(permissions, ignore_conflicts=True)
+            if self.notify:
+                notify_entitlements_changed(
+                    UserServiceAssignment, {user_id for _, _, (user_id, *_) in resolved}
+                )
+        return rejected
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...claims_cache import bump_entitlement_version
+from ...snapshots import DEFAULT_BATCH_SIZE, rebuild_all, verify_all
+
+
+class Command(BaseCommand):
+    help = 'Rebuild or verify the materialized entitlement snapshots of all users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify',
+            action='store_true',
+            help='Only compare stored snapshots with resolved entitlements; do not write.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Number of users resolved per batch (default: {DEFAULT_BATCH_SIZE}).',
+        )
+
+    def handle(self, *args, verify: bool, batch_size: int, **options):
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+
+        if not verify:
+            count = rebuild_all(batch_size=batch_size)
+            bump_entitlement_version()
+            self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} snapshot(s).'))
+            return
+
+        result = verify_all(batch_size=batch_size)
+        message = (
+            f'Checked {result.checked} user(s): '
+            f'{result.missing} missing, {result.stale} stale snapshot(s).'
+        )
+        if not result.ok:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(message))
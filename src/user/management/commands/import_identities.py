@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...importer import (
+    DEFAULT_BATCH_SIZE,
+    SCHEMAS,
+    Checkpoint,
+    Importer,
+    ImportFileError,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Bulk import services, permissions, roles, role permissions, users and assignments from '
+        'CSV or NDJSON files (optionally gzipped), in that order.'
+    )
+
+    def add_arguments(self, parser):
+        for kind, schema in SCHEMAS.items():
+            parser.add_argument(
+                f'--{kind.replace("_", "-")}',
+                dest=kind,
+                action='append',
+                default=[],
+                metavar='FILE',
+                help=f'File of {kind.replace("_", " ")} ({", ".join(schema.model_fields)}).',
+            )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Records written per transaction (default: {DEFAULT_BATCH_SIZE}).',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            metavar='FILE',
+            help='Record progress in FILE after every batch, and resume from it if it exists.',
+        )
+        parser.add_argument(
+            '--skip-snapshots',
+            action='store_true',
+            help=(
+                'Do not refresh entitlement snapshots per batch; run '
+                '`manage.py entitlement_snapshots` after the import instead.'
+            ),
+        )
+
+    def handle(self, *args, batch_size: int, checkpoint: str | None, **options):
+        if batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer.')
+        files = [(kind, path) for kind in SCHEMAS for path in options[kind]]
+        if not files:
+            raise CommandError('Nothing to import; give at least one file.')
+
+        importer = Importer(
+            batch_size=batch_size,
+            notify=not options['skip_snapshots'],
+            checkpoint=Checkpoint(checkpoint) if checkpoint else None,
+            progress=self.stdout.write,
+        )
+        rejected = 0
+        for kind, path in files:
+            try:
+                result = importer.import_file(kind, path)
+            except (OSError, ImportFileError) as exc:
+                raise CommandError(str(exc))
+
+            for row in result.rejected:
+                self.stderr.write(f'{path}:{row.line}: {row.reason}')
+            rejected += len(result.rejected)
+            rate = result.rows / result.seconds if result.seconds else 0
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{kind}: {result.rows:,} row(s) from {path} in {result.seconds:.1f} s '
+                    f'({rate:,.0f} rows/s), {len(result.rejected):,} rejected.'
+                )
+            )
+
+        if rejected:
+            raise CommandError(f'{rejected:,} row(s) rejected; see above.')
+        if options['skip_snapshots']:
+            self.stdout.write('Run `manage.py entitlement_snapshots` to rebuild snapshots.')
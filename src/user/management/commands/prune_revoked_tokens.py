@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ...revoked_tokens import prune_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete revoked-token records of tokens that have expired.'
+
+    def handle(self, *args, **options):
+        count = prune_expired()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {count} revoked token(s).'))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ...models import SigningKey
+from ...signing_keys import (
+    ALGORITHMS,
+    activate_signing_key,
+    create_signing_key,
+    retire_signing_key,
+)
+
+
+class Command(BaseCommand):
+    help = 'Create, activate, retire and list asymmetric JWT signing keys.'
+
+    def add_arguments(self, parser):
+        actions = parser.add_subparsers(dest='action', required=True)
+
+        actions.add_parser('list', help='List signing keys.')
+
+        create = actions.add_parser(
+            'create', help='Generate a new key, published for verification only.'
+        )
+        create.add_argument('--algorithm', choices=ALGORITHMS, default=SigningKey.ALG_ES256)
+        create.add_argument(
+            '--activate',
+            action='store_true',
+            help='Sign with the new key immediately (skips the publication window).',
+        )
+
+        activate = actions.add_parser(
+            'activate', help='Sign with a key; the current active key becomes verify-only.'
+        )
+        activate.add_argument('kid')
+
+        retire = actions.add_parser(
+            'retire', help='Stop accepting tokens signed with a key and unpublish it.'
+        )
+        retire.add_argument('kid')
+
+    def handle(self, *args, action: str, **options):
+        if action == 'list':
+            for key in SigningKey.objects.order_by('-created_at'):
+                self.stdout.write(
+                    f'{key.kid}  {key.algorithm:<6} {key.state:<12} {key.created_at:%Y-%m-%d %H:%M}'
+                )
+            return
+
+        try:
+            if action == 'create':
+                key = create_signing_key(options['algorithm'], activate=options['activate'])
+            elif action == 'activate':
+                key = activate_signing_key(options['kid'])
+            else:
+                key = retire_signing_key(options['kid'])
+        except SigningKey.DoesNotExist:
+            raise CommandError(f'Unknown signing key: {options["kid"]}')
+        except ValueError as ex:
+            raise CommandError(str(ex))
+
+        self.stdout.write(self.style.SUCCESS(f'{key.kid}: {key.algorithm} {key.state}'))
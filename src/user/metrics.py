@@ -0,0 +1,43 @@
+"""
+In-process counters.
+
+Each component registers a named ``Counters`` instance; ``snapshot_all`` returns the current
+values of every registered counter, e.g. for logging or an admin endpoint.
+"""
+
+import threading
+from collections import Counter
+
+
+class Counters:
+    """Thread-safe named integer counters."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._values: Counter[str] = Counter()
+        REGISTRY[name] = self
+
+    def incr(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self._values[key] += amount
+
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._values[key]
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+REGISTRY: dict[str, Counters] = {}
+
+
+def snapshot_all() -> dict[str, dict[str, int]]:
+    """Return the values of all registered counters, keyed by counter name."""
+    return {name: counters.snapshot() for name, counters in REGISTRY.items()}
@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-17 04:19
+
+from django.db import migrations, models
+
+
+def assign_permission_bits(apps, schema_editor):
+    """Give existing service permissions consecutive bits in creation order."""
+    Permission = apps.get_model('user', 'Permission')
+    Service = apps.get_model('user', 'Service')
+
+    for service in Service.objects.all():
+        permissions = list(
+            Permission.objects.filter(service=service, type='SERVICE').order_by('created_at', 'id')
+        )
+        for bit, permission in enumerate(permissions):
+            permission.bit = bit
+        Permission.objects.bulk_update(permissions, ['bit'], batch_size=1000)
+        Service.objects.filter(pk=service.pk).update(next_permission_bit=len(permissions))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0002_user_entitlement_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='permission',
+            name='bit',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='next_permission_bit',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='permission_index_version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(assign_permission_bits, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='permission',
+            constraint=models.UniqueConstraint(
+                condition=models.Q(('type', 'SERVICE')),
+                fields=('service', 'bit'),
+                name='unique_service_permission_bit',
+            ),
+        ),
+    ]
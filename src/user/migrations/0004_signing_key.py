@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_permission_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SigningKey',
+            fields=[
+                ('kid', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                (
+                    'algorithm',
+                    models.CharField(
+                        choices=[
+                            ('RS256', 'RS256 (RSA 2048)'),
+                            ('ES256', 'ES256 (ECDSA P-256)'),
+                            ('EdDSA', 'EdDSA (Ed25519)'),
+                        ],
+                        max_length=16,
+                    ),
+                ),
+                ('private_key', models.TextField(blank=True)),
+                ('public_key', models.TextField()),
+                (
+                    'state',
+                    models.CharField(
+                        choices=[
+                            ('ACTIVE', 'Active'),
+                            ('VERIFY_ONLY', 'Verify only'),
+                            ('RETIRED', 'Retired'),
+                        ],
+                        default='VERIFY_ONLY',
+                        max_length=16,
+                    ),
+                ),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [
+                    models.UniqueConstraint(
+                        condition=models.Q(('state', 'ACTIVE')),
+                        fields=('state',),
+                        name='single_active_signing_key',
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0004_signing_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenNotBefore',
+            fields=[
+                ('user_id', models.UUIDField(primary_key=True, serialize=False)),
+                ('not_before', models.PositiveBigIntegerField(db_index=True)),
+            ],
+        ),
+    ]
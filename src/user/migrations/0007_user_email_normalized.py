@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:02
+
+from django.db import migrations, models, transaction
+from django.db.models import Count
+from django.db.models.functions import Lower, Trim
+
+BATCH_SIZE = 1000
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """Refuse to start while emails that differ only in case would break the unique column."""
+    User = apps.get_model('user', 'User')
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias)
+        .values(normalized=Lower(Trim('email')))
+        .annotate(count=Count('pk'))
+        .filter(count__gt=1)
+        .values_list('normalized', flat=True)[:10]
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Users whose emails differ only in case must be merged before migrating: '
+            + ', '.join(duplicates)
+        )
+
+
+def _nullable_email_normalized() -> models.CharField:
+    field = models.CharField(editable=False, max_length=254, null=True)
+    field.set_attributes_from_name('email_normalized')
+    return field
+
+
+def add_email_normalized(apps, schema_editor):
+    """Add the nullable column, unless an interrupted earlier run already did."""
+    User = apps.get_model('user', 'User')
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        columns = connection.introspection.get_table_description(cursor, User._meta.db_table)
+    if 'email_normalized' not in {column.name for column in columns}:
+        schema_editor.add_field(User, _nullable_email_normalized())
+
+
+def remove_email_normalized(apps, schema_editor):
+    schema_editor.remove_field(apps.get_model('user', 'User'), _nullable_email_normalized())
+
+
+def backfill_email_normalized(apps, schema_editor):
+    """Fill ``email_normalized`` in committed batches, skipping rows an earlier run filled."""
+    User = apps.get_model('user', 'User')
+    db_alias = schema_editor.connection.alias
+
+    while True:
+        with transaction.atomic(using=db_alias):
+            batch = list(
+                User.objects.using(db_alias)
+                .filter(email_normalized__isnull=True)
+                .order_by('pk')
+                .only('pk', 'email')[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            for user in batch:
+                user.email_normalized = user.email.strip().lower()
+            User.objects.using(db_alias).bulk_update(batch, ['email_normalized'])
+
+
+class Migration(migrations.Migration):
+    # Each backfill batch commits on its own, so a large table is not locked in one transaction.
+    # Every step can be repeated, so re-running after an interruption resumes where it stopped.
+    atomic = False
+
+    dependencies = [
+        ('user', '0006_revoked_token'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(add_email_normalized, remove_email_normalized),
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='user',
+                    name='email_normalized',
+                    field=models.CharField(editable=False, max_length=254, null=True),
+                ),
+            ],
+        ),
+        migrations.RunPython(backfill_email_normalized, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='user',
+            name='email_normalized',
+            field=models.CharField(editable=False, max_length=254, unique=True),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:31
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.db import migrations
+from django.utils.crypto import get_random_string
+
+BATCH_SIZE = 500
+
+
+def hash_client_secrets(apps, schema_editor):
+    """Replace plaintext client secrets with PBKDF2 hashes, in batches."""
+    Service = apps.get_model('user', 'Service')
+    db_alias = schema_editor.connection.alias
+    hasher = PBKDF2PasswordHasher()
+    iterations = getattr(settings, 'SERVICE_SECRET_HASH_ITERATIONS', 20_000)
+
+    plaintext = (
+        Service.objects.using(db_alias)
+        .exclude(client_secret__startswith=f'{hasher.algorithm}$')
+        .order_by('pk')
+        .only('pk', 'client_secret')
+    )
+    while batch := list(plaintext[:BATCH_SIZE]):
+        for service in batch:
+            service.client_secret = hasher.encode(
+                service.client_secret, get_random_string(22), iterations
+            )
+        Service.objects.using(db_alias).bulk_update(batch, ['client_secret'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0007_user_email_normalized'),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_client_secrets, migrations.RunPython.noop),
+    ]
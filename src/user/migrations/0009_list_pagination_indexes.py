@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0008_hash_client_secrets'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='permission',
+            index=models.Index(fields=['service', 'created_at', 'id'], name='permission_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(fields=['service', 'created_at', 'id'], name='role_page_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['created_at', 'id'], name='service_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0009_list_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tokennotbefore',
+            name='not_before',
+            field=models.FloatField(db_index=True),
+        ),
+    ]
@@ -1,8 +1,12 @@
 from .permission import Permission
+from .revoked_token import RevokedToken
 from .role import Role
 from .role_permission import RolePermission
 from .service import Service
-from .user import User, UserManager
+from .signing_key import SigningKey
+from .token_not_before import TokenNotBefore
+from .user import User, UserManager, normalized_email
+from .user_entitlement_snapshot import UserEntitlementSnapshot
 from .user_global_permission import UserGlobalPermission
 from .user_global_role import UserGlobalRole
 from .user_service_assignment import UserServiceAssignment
@@ -16,9 +20,14 @@ __all__ = [
     'RolePermission',
     'UserManager',
     'User',
+    'normalized_email',
     'UserServiceAssignment',
     'UserServiceRole',
     'UserServicePermission',
     'UserGlobalRole',
     'UserGlobalPermission',
+    'UserEntitlementSnapshot',
+    'SigningKey',
+    'TokenNotBefore',
+    'RevokedToken',
 ]
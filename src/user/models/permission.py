@@ -1,6 +1,6 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 
 
@@ -22,6 +22,9 @@ class Permission(models.Model):
         related_name='permissions',
     )
     code = models.CharField(max_length=64)
+    # Stable position of this permission in its service's permission index (compact token claims).
+    # Allocated on creation and never reused within a service.
+    bit = models.PositiveIntegerField(null=True, blank=True, editable=False)
     description = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -38,7 +41,23 @@ class Permission(models.Model):
                 condition=Q(type='SERVICE'),
                 name='unique_service_permission_code',
             ),
+            models.UniqueConstraint(
+                fields=['service', 'bit'],
+                condition=Q(type='SERVICE'),
+                name='unique_service_permission_bit',
+            ),
         ]
+        indexes = [
+            models.Index(fields=['service', 'created_at', 'id'], name='permission_page_idx'),
+        ]
+
+    def save(self, *args, **kwargs) -> None:
+        if self.type == self.TYPE_SERVICE and self.service_id and self.bit is None:
+            with transaction.atomic():
+                (self.bit,) = self.service.allocate_permission_bits(1)
+                super().save(*args, **kwargs)
+            return
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return f'{self.type}:{self.code}'
@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class RevokedToken(models.Model):
+    """A single access or refresh token revoked before its expiry, identified by ``jti``."""
+
+    jti = models.CharField(max_length=64, primary_key=True)
+    user_id = models.UUIDField(db_index=True)
+    token_type = models.CharField(max_length=16)
+    # Rows can be pruned once the token would have expired anyway.
+    expires_at = models.DateTimeField(db_index=True)
+    # Change cursor for incremental rebuilds of the in-process filter.
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self) -> str:
+        return f'{self.token_type}:{self.jti}'
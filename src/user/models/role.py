@@ -24,6 +24,7 @@ class Role(models.Model):
                 name='unique_role_name_per_service',
             )
         ]
+        indexes = [models.Index(fields=['service', 'created_at', 'id'], name='role_page_idx')]
 
     def __str__(self) -> str:
         return self.name
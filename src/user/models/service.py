@@ -1,9 +1,13 @@
 import uuid
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 
 
 class Service(models.Model):
+    # Maintained with atomic ``UPDATE``s only; never written back from a (possibly stale) instance.
+    INDEX_FIELDS = ('next_permission_bit', 'permission_index_version')
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255, unique=True)
     description = models.TextField(blank=True)
@@ -14,8 +18,35 @@ class Service(models.Model):
         choices=[('ACTIVE', 'Active'), ('INACTIVE', 'Inactive')],
         default='ACTIVE',
     )
+    # Next free bit in this service's permission index, and a version bumped whenever the
+    # code -> bit mapping changes.
+    next_permission_bit = models.PositiveIntegerField(default=0, editable=False)
+    permission_index_version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # Keyset pagination order (see ``pagination.py``).
+        indexes = [models.Index(fields=['created_at', 'id'], name='service_created_id_idx')]
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.INDEX_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def allocate_permission_bits(self, count: int) -> range:
+        """Reserve ``count`` consecutive permission index bits for this service."""
+        with transaction.atomic():
+            Service.objects.filter(pk=self.pk).update(
+                next_permission_bit=F('next_permission_bit') + count
+            )
+            end = Service.objects.values_list('next_permission_bit', flat=True).get(pk=self.pk)
+        self.next_permission_bit = end
+        return range(end - count, end)
+
     def __str__(self) -> str:
         return self.name
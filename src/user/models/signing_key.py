@@ -0,0 +1,51 @@
+from django.db import models
+from django.db.models import Q
+
+
+class SigningKey(models.Model):
+    """
+    Asymmetric key used to sign and verify JWTs, identified by ``kid``.
+
+    Rotation: a new key is published as ``VERIFY_ONLY`` (listed in the JWKS), then made ``ACTIVE``
+    (used for signing; the previous active key becomes ``VERIFY_ONLY``) and finally ``RETIRED``
+    once no token signed with it can still be valid.
+    """
+
+    ALG_RS256 = 'RS256'
+    ALG_ES256 = 'ES256'
+    ALG_EDDSA = 'EdDSA'
+    ALGORITHM_CHOICES = [
+        (ALG_RS256, 'RS256 (RSA 2048)'),
+        (ALG_ES256, 'ES256 (ECDSA P-256)'),
+        (ALG_EDDSA, 'EdDSA (Ed25519)'),
+    ]
+
+    STATE_ACTIVE = 'ACTIVE'
+    STATE_VERIFY_ONLY = 'VERIFY_ONLY'
+    STATE_RETIRED = 'RETIRED'
+    STATE_CHOICES = [
+        (STATE_ACTIVE, 'Active'),
+        (STATE_VERIFY_ONLY, 'Verify only'),
+        (STATE_RETIRED, 'Retired'),
+    ]
+
+    kid = models.CharField(max_length=64, primary_key=True)
+    algorithm = models.CharField(max_length=16, choices=ALGORITHM_CHOICES)
+    # PEM encoded; the private key is empty for keys imported for verification only.
+    private_key = models.TextField(blank=True)
+    public_key = models.TextField()
+    state = models.CharField(max_length=16, choices=STATE_CHOICES, default=STATE_VERIFY_ONLY)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['state'],
+                condition=Q(state='ACTIVE'),
+                name='single_active_signing_key',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.kid} ({self.algorithm}, {self.state})'
@@ -0,0 +1,16 @@
+from django.db import models
+
+
+class TokenNotBefore(models.Model):
+    """
+    Per-user revocation epoch: access tokens issued before ``not_before`` are no longer accepted.
+
+    Keyed by the user id without a foreign key, so the entry outlives a hard delete of the user.
+    """
+
+    user_id = models.UUIDField(primary_key=True)
+    # Unix time in seconds, with microseconds, comparable with the ``iat`` claim.
+    not_before = models.FloatField(db_index=True)
+
+    def __str__(self) -> str:
+        return f'{self.user_id}:{self.not_before}'
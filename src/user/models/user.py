@@ -9,7 +9,19 @@ from django.db import models
 from django.utils import timezone
 
 
+def normalized_email(email: str) -> str:
+    """Case-insensitive lookup key of an email address."""
+    return email.strip().lower()
+
+
 class UserManager(BaseUserManager):
+    def by_email(self, email: str) -> models.QuerySet['User']:
+        """Users matching ``email`` case-insensitively, through the indexed normalized column."""
+        return self.filter(email_normalized=normalized_email(email))
+
+    def get_by_natural_key(self, username: str | None) -> 'User':
+        return self.by_email(username or '').get()
+
     def create_user(
         self,
         email: str,
@@ -50,6 +62,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     email = models.EmailField(unique=True)
+    # Kept in sync by ``save()``; rows written with ``bulk_create`` must set it themselves.
+    email_normalized = models.CharField(max_length=254, unique=True, editable=False)
     name = models.CharField(max_length=255, blank=True)
 
     status = models.CharField(
@@ -72,6 +86,13 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     objects = UserManager()
 
+    def save(self, *args, **kwargs) -> None:
+        self.email_normalized = normalized_email(self.email)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'email' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'email_normalized'}
+        super().save(*args, **kwargs)
+
     def mark_deleted(self) -> None:
         self.status = self.STATUS_DELETED
         self.deleted_at = timezone.now()
@@ -0,0 +1,20 @@
+from django.db import models
+
+
+class UserEntitlementSnapshot(models.Model):
+    """Denormalized, pre-resolved entitlement claims for a user (one row per user)."""
+
+    user = models.OneToOneField(
+        'User',
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='entitlement_snapshot',
+    )
+    # Same shape as the entitlement claims of an access token:
+    # ``global_permissions``, ``global_roles`` and ``services``.
+    claims = models.JSONField(default=dict)
+    fingerprint = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f'{self.user_id}:{self.fingerprint[:12]}'
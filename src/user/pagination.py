@@ -0,0 +1,95 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Rows are ordered by ``(created_at, id)``, and each page starts right after the last row of the
+previous one instead of at an ``OFFSET``. Every page therefore costs the same short range scan of
+a ``(..., created_at, id)`` index, and rows created while a client pages through a list are not
+returned twice. Cursors are opaque to clients: URL-safe base64 of the last row's key.
+
+Callers that pass no ``limit`` get ``PAGINATION_DEFAULT_LIMIT`` rows; larger limits are capped
+at ``PAGINATION_MAX_LIMIT``.
+"""
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from django.conf import settings
+from django.db.models import Model, Q, QuerySet
+
+M = TypeVar('M', bound=Model)
+
+DEFAULT_LIMIT = 1000
+DEFAULT_MAX_LIMIT = 1000
+ORDERING = ('created_at', 'id')
+
+
+class InvalidCursor(ValueError):
+    """Raised for a cursor that was not returned by ``paginate``."""
+
+
+@dataclass(frozen=True, slots=True)
+class Page(Generic[M]):
+    items: list[M]
+    # Cursor of the next page, or ``None`` on the last one.
+    next_cursor: str | None
+
+
+def encode_cursor(created_at: datetime, pk: UUID) -> str:
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Return the ``(created_at, id)`` key a cursor points after."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split('|')
+        return datetime.fromisoformat(created_at), UUID(pk)
+    except ValueError as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def page_limit(limit: int | None) -> int:
+    """The number of rows to return for a requested ``limit``."""
+    maximum = getattr(settings, 'PAGINATION_MAX_LIMIT', DEFAULT_MAX_LIMIT)
+    if limit is None:
+        limit = getattr(settings, 'PAGINATION_DEFAULT_LIMIT', DEFAULT_LIMIT)
+    return min(limit, maximum)
+
+
+def _page_query(queryset: QuerySet[M], cursor: str | None, limit: int) -> QuerySet[M]:
+    queryset = queryset.order_by(*ORDERING)
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # ``created_at >= x`` on its own gives the index a range start.
+        queryset = queryset.filter(
+            Q(created_at__gte=created_at), Q(created_at__gt=created_at) | Q(id__gt=pk)
+        )
+    # One extra row tells whether there is a next page.
+    return queryset[: limit + 1]
+
+
+def _page(rows: list[M], limit: int) -> Page[M]:
+    if len(rows) <= limit:
+        return Page(items=rows, next_cursor=None)
+    rows = rows[:limit]
+    return Page(items=rows, next_cursor=encode_cursor(rows[-1].created_at, rows[-1].pk))
+
+
+def paginate(queryset: QuerySet[M], cursor: str | None, limit: int | None = None) -> Page[M]:
+    """
+    Return the page of ``queryset`` after ``cursor`` (the first page without one).
+
+    :raises InvalidCursor: If ``cursor`` is malformed.
+    """
+    limit = page_limit(limit)
+    return _page(list(_page_query(queryset, cursor, limit)), limit)
+
+
+async def apaginate(queryset: QuerySet[M], cursor: str | None, limit: int | None = None) -> Page[M]:
+    """Async ``paginate``."""
+    limit = page_limit(limit)
+    return _page([row async for row in _page_query(queryset, cursor, limit)], limit)
@@ -0,0 +1,209 @@
+"""
+Bulk provisioning of users into a service, and diff-based updates of their grants.
+
+``provision_users`` does what ``POST /services/{id}/users`` does for one user, for thousands at
+once, in a number of queries that does not grow with the number of users (beyond one per
+``BATCH_SIZE`` rows inserted): role names and permission codes are resolved in one query each,
+existing users in one more, and users, assignments and grants are written with batched
+``bulk_create`` calls inside one transaction. Rows that already exist are left as they are, so
+provisioning the same users again is a no-op.
+
+Passwords of new users are hashed in parallel (see ``hashing.hash_passwords``) before the
+transaction starts. Items naming unknown roles or permissions, or repeating an email already in
+the batch, are reported and skipped; the other items are provisioned.
+
+``set_service_grants`` replaces a user's roles and direct permissions in a service by inserting
+and deleting only the rows that differ, so an update that changes nothing writes nothing (and
+does not invalidate the user's snapshot or cached claims).
+"""
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from uuid import UUID
+
+from django.db import transaction
+
+from .hashing import hash_passwords
+from .models import (
+    Permission,
+    Role,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+    normalized_email,
+)
+from .schemas import UserCreateRequest
+from .signals import batched_entitlement_changes, notify_entitlements_changed
+
+BATCH_SIZE = 1000
+
+
+class UnknownGrants(ValueError):
+    """Raised for role names or permission codes that do not exist in the service."""
+
+    def __init__(self, roles: list[str], permissions: list[str]) -> None:
+        self.roles = roles
+        self.permissions = permissions
+        super().__init__(
+            '; '.join(
+                f'Unknown {kind}: {", ".join(names)}'
+                for kind, names in (('roles', roles), ('permissions', permissions))
+                if names
+            )
+        )
+
+
+@dataclass(slots=True)
+class ProvisionResult:
+    email: str
+    user_id: UUID | None = None
+    # Whether the user row was created (rather than an existing user assigned).
+    created: bool = False
+    error: str | None = None
+
+
+def _unknown(kind: str, names: list[str], known: dict[str, UUID]) -> str | None:
+    missing = sorted(set(names) - known.keys())
+    return f'Unknown {kind}: {", ".join(missing)}' if missing else None
+
+
+def provision_users(
+    service: Service, items: Sequence[UserCreateRequest], created_by_id: UUID | None = None
+) -> list[ProvisionResult]:
+    """
+    Create or assign users to ``service`` with their roles and direct permissions.
+
+    Existing users (matched by email, case-insensitively) keep their name and password.
+
+    :returns: One result per item, in order.
+    """
+    results = [ProvisionResult(email=item.email) for item in items]
+
+    role_ids, _ = _service_ids(Role, 'name', service, [n for item in items for n in item.roles])
+    permission_ids, _ = _service_ids(
+        Permission, 'code', service, [c for item in items for c in item.permissions]
+    )
+
+    # normalized email -> index of the item provisioning it
+    accepted: dict[str, int] = {}
+    for index, item in enumerate(items):
+        key = normalized_email(item.email)
+        results[index].error = (
+            ('Duplicate email in request' if key in accepted else None)
+            or _unknown('roles', item.roles, role_ids)
+            or _unknown('permissions', item.permissions, permission_ids)
+        )
+        if results[index].error is None:
+            accepted[key] = index
+
+    existing = set(
+        User.objects.filter(email_normalized__in=list(accepted)).values_list(
+            'email_normalized', flat=True
+        )
+    )
+    new_keys = [key for key in accepted if key not in existing]
+    passwords = hash_passwords([items[accepted[key]].password for key in new_keys])
+    new_users = [
+        User(
+            email=items[accepted[key]].email,
+            email_normalized=key,
+            name=items[accepted[key]].name,
+            password=password,
+        )
+        for key, password in zip(new_keys, passwords)
+    ]
+
+    with transaction.atomic():
+        # Users created concurrently since the lookup above are left alone and assigned.
+        User.objects.bulk_create(new_users, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        user_ids = dict(
+            User.objects.filter(email_normalized__in=list(accepted)).values_list(
+                'email_normalized', 'id'
+            )
+        )
+
+        assignments, user_roles, user_permissions = [], [], []
+        for key, index in accepted.items():
+            user_id, item = user_ids[key], items[index]
+            assignments.append(
+                UserServiceAssignment(user_id=user_id, service=service, created_by_id=created_by_id)
+            )
+            user_roles.extend(
+                UserServiceRole(user_id=user_id, service=service, role_id=role_ids[name])
+                for name in set(item.roles)
+            )
+            user_permissions.extend(
+                UserServicePermission(
+                    user_id=user_id, service=service, permission_id=permission_ids[code]
+                )
+                for code in set(item.permissions)
+            )
+        for model, rows in (
+            (UserServiceAssignment, assignments),
+            (UserServiceRole, user_roles),
+            (UserServicePermission, user_permissions),
+        ):
+            model.objects.bulk_create(rows, batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+        # bulk_create sends no post_save, so snapshots and cached claims are refreshed here.
+        ids = list(user_ids.values())
+        for start in range(0, len(ids), BATCH_SIZE):
+            notify_entitlements_changed(UserServiceAssignment, ids[start : start + BATCH_SIZE])
+
+    created_ids = {user.email_normalized: user.id for user in new_users}
+    for key, index in accepted.items():
+        results[index].user_id = user_ids[key]
+        results[index].created = created_ids.get(key) == user_ids[key]
+    return results
+
+
+def _service_ids(
+    model: type[Role] | type[Permission], field: str, service: Service, names: list[str]
+) -> tuple[dict[str, UUID], list[str]]:
+    """Map ``names`` to ids of ``model`` rows in the service, and list the names not found."""
+    ids = dict(
+        model.objects.filter(service=service, **{f'{field}__in': set(names)}).values_list(
+            field, 'id'
+        )
+    )
+    return ids, sorted(set(names) - ids.keys())
+
+
+def set_service_grants(
+    user_id: UUID, service: Service, roles: list[str], permissions: list[str]
+) -> bool:
+    """
+    Make ``roles`` and ``permissions`` the user's exact roles and direct permissions in a service.
+
+    :returns: Whether anything changed.
+    :raises UnknownGrants: If a role or permission does not exist in the service; nothing is
+        changed then.
+    """
+    role_ids, unknown_roles = _service_ids(Role, 'name', service, roles)
+    permission_ids, unknown_permissions = _service_ids(Permission, 'code', service, permissions)
+    if unknown_roles or unknown_permissions:
+        raise UnknownGrants(unknown_roles, unknown_permissions)
+
+    changed = False
+    with transaction.atomic(), batched_entitlement_changes(UserServiceRole):
+        for model, field, wanted in (
+            (UserServiceRole, 'role_id', set(role_ids.values())),
+            (UserServicePermission, 'permission_id', set(permission_ids.values())),
+        ):
+            rows = model.objects.filter(user_id=user_id, service=service)
+            current = set(rows.values_list(field, flat=True))
+            if current - wanted:
+                rows.filter(**{f'{field}__in': current - wanted}).delete()
+            if wanted - current:
+                model.objects.bulk_create(
+                    [
+                        model(user_id=user_id, service=service, **{field: pk})
+                        for pk in wanted - current
+                    ],
+                    ignore_conflicts=True,
+                )
+                notify_entitlements_changed(model, [user_id])
+            changed = changed or current != wanted
+    return changed
@@ -0,0 +1,123 @@
+"""
+Per-user access token revocation for stateless authentication.
+
+Revoking a user's tokens stores a "not-before" epoch (``TokenNotBefore``); access tokens whose
+``iat`` is earlier are rejected. Both have microsecond precision, so a token issued right after a
+revocation (e.g. a login after reactivation) is accepted even within the same second.
+
+Only epochs younger than the access token lifetime can still reject a token, so each process keeps
+just that window in ``not_before_table`` and reloads it every ``JWT_REVOCATION_REFRESH_SECONDS``.
+Revocations made by another process therefore take effect here within that interval.
+
+Revocation also drops the user's entries from the verified token cache (``token_cache.py``).
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timezone
+from uuid import UUID
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .models import TokenNotBefore
+from .token_cache import token_cache
+
+DEFAULT_REFRESH_SECONDS = 30
+
+
+def _access_token_lifetime() -> float:
+    return settings.NINJA_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()  # type: ignore
+
+
+class NotBeforeTable:
+    """In-memory copy of the revocation epochs that can still reject an unexpired token."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._lock = threading.Lock()
+        self._entries: dict[str, float] | None = None
+        self._loaded_at = 0.0
+
+    @property
+    def refresh_interval(self) -> float:
+        return getattr(settings, 'JWT_REVOCATION_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS)
+
+    def _load(self) -> dict[str, float]:
+        window_start = int(self._wall_clock() - _access_token_lifetime())
+        return {
+            str(uid): not_before
+            for uid, not_before in TokenNotBefore.objects.filter(
+                not_before__gte=window_start
+            ).values_list('user_id', 'not_before')
+        }
+
+    def _current(self) -> dict[str, float]:
+        now = self._clock()
+        with self._lock:
+            if self._entries is None or now - self._loaded_at >= self.refresh_interval:
+                self._entries = self._load()
+                self._loaded_at = now
+            return self._entries
+
+    def get(self, user_id: UUID | str) -> float:
+        """Return the user's not-before epoch, or ``0`` if no recent revocation is known."""
+        return self._current().get(str(user_id), 0)
+
+    async def aget(self, user_id: UUID | str) -> float:
+        """Async ``get``: reloads in a worker thread, and only when the table is stale."""
+        entries = self._entries
+        if entries is None or self._clock() - self._loaded_at >= self.refresh_interval:
+            entries = await sync_to_async(self._current)()
+        return entries.get(str(user_id), 0)
+
+    def note(self, user_ids: Iterable[UUID | str], not_before: float) -> None:
+        """Record revocations made by this process without waiting for the next reload."""
+        with self._lock:
+            if self._entries is not None:
+                for user_id in user_ids:
+                    self._entries[str(user_id)] = not_before
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = None
+
+    def __len__(self) -> int:
+        return len(self._entries or {})
+
+
+not_before_table = NotBeforeTable()
+
+
+def revoke_tokens(user_ids: Iterable[UUID | str]) -> float:
+    """Reject access tokens issued to the given users until now. Returns the new epoch."""
+    # Read like the ``iat`` of access tokens (``CustomAccessToken.set_iat``), so every token
+    # issued from here on compares as not earlier.
+    not_before = datetime.now(timezone.utc).timestamp()
+    ids = list(set(user_ids))
+    TokenNotBefore.objects.bulk_create(
+        [TokenNotBefore(user_id=uid, not_before=not_before) for uid in ids],
+        update_conflicts=True,
+        unique_fields=['user_id'],
+        update_fields=['not_before'],
+    )
+    not_before_table.note(ids, not_before)
+    for uid in ids:
+        token_cache.discard_user(uid)
+    return not_before
+
+
+def is_revoked(user_id: UUID | str, issued_at: float) -> bool:
+    """Whether a token issued at ``issued_at`` predates the user's not-before epoch."""
+    return issued_at < not_before_table.get(user_id)
+
+
+async def ais_revoked(user_id: UUID | str, issued_at: float) -> bool:
+    """Async ``is_revoked``."""
+    return issued_at < await not_before_table.aget(user_id)
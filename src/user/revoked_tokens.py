@@ -0,0 +1,203 @@
+"""
+Revocation of individual access and refresh tokens by ``jti``.
+
+Revoked tokens are stored as ``RevokedToken`` rows until they expire. Each process keeps a Bloom
+filter of the revoked ``jti``s in ``revoked_tokens`` and consults it first, so only Bloom-positive
+tokens (revoked ones and rare false positives) cost a database lookup.
+
+The filter catches up every ``REVOKED_TOKENS_REFRESH_SECONDS`` by reading rows revoked since its
+cursor (the latest ``revoked_at`` seen, minus an overlap that covers late commits and clock skew
+between writers), and is rebuilt from scratch every ``REVOKED_TOKENS_REBUILD_SECONDS`` or when it
+outgrows its capacity, which sheds pruned entries. Revocations made by another process therefore
+take effect here within the refresh interval.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils import timezone
+from ninja_jwt.tokens import Token
+from ninja_jwt.utils import datetime_from_epoch
+
+from .metrics import Counters
+from .models import RevokedToken
+
+DEFAULT_REFRESH_SECONDS = 5
+DEFAULT_REBUILD_SECONDS = 3600
+DEFAULT_CAPACITY = 100_000
+DEFAULT_ERROR_RATE = 0.001
+
+CURSOR_OVERLAP = timedelta(seconds=30)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter of strings, using double hashing over one BLAKE2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = capacity
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        # Items already (or falsely) present set no new bits and are not counted again.
+        if item in self:
+            return
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[p >> 3] & (1 << (p & 7)) for p in self._positions(item))
+
+
+class RevokedTokenFilter:
+    """Per-process Bloom filter over ``RevokedToken``, kept in sync from a change cursor."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._bloom: BloomFilter | None = None
+        self._cursor: datetime | None = None
+        self._refreshed_at = 0.0
+        self._rebuilt_at = 0.0
+        self.counters = Counters('revoked_tokens')
+
+    @property
+    def refresh_interval(self) -> float:
+        return getattr(settings, 'REVOKED_TOKENS_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS)
+
+    @property
+    def rebuild_interval(self) -> float:
+        return getattr(settings, 'REVOKED_TOKENS_REBUILD_SECONDS', DEFAULT_REBUILD_SECONDS)
+
+    def _add_rows(self, bloom: BloomFilter, rows: Iterable[tuple[str, datetime]]) -> None:
+        for jti, revoked_at in rows:
+            bloom.add(jti)
+            if self._cursor is None or revoked_at > self._cursor:
+                self._cursor = revoked_at
+
+    def _rebuild(self, now: float) -> None:
+        rows = list(
+            RevokedToken.objects.filter(expires_at__gt=timezone.now()).values_list(
+                'jti', 'revoked_at'
+            )
+        )
+        capacity = max(
+            getattr(settings, 'REVOKED_TOKENS_BLOOM_CAPACITY', DEFAULT_CAPACITY), 2 * len(rows)
+        )
+        bloom = BloomFilter(
+            capacity, getattr(settings, 'REVOKED_TOKENS_BLOOM_ERROR_RATE', DEFAULT_ERROR_RATE)
+        )
+        self._cursor = None
+        self._add_rows(bloom, rows)
+        if self._cursor is None:
+            self._cursor = timezone.now()
+        self._bloom = bloom
+        self._rebuilt_at = now
+        self.counters.incr('rebuilds')
+
+    def _catch_up(self) -> None:
+        rows = RevokedToken.objects.filter(
+            revoked_at__gte=self._cursor - CURSOR_OVERLAP  # type: ignore[operator]
+        ).values_list('jti', 'revoked_at')
+        self._add_rows(self._bloom, rows)  # type: ignore[arg-type]
+
+    def _current(self) -> BloomFilter:
+        now = self._clock()
+        bloom = self._bloom
+        if bloom is not None and now - self._refreshed_at < self.refresh_interval:
+            return bloom
+
+        with self._lock:
+            if self._bloom is None or now - self._refreshed_at >= self.refresh_interval:
+                if self._bloom is None or now - self._rebuilt_at >= self.rebuild_interval:
+                    self._rebuild(now)
+                else:
+                    self._catch_up()
+                    if self._bloom.count > self._bloom.capacity:  # type: ignore[union-attr]
+                        self._rebuild(now)
+                self._refreshed_at = now
+            return self._bloom  # type: ignore[return-value]
+
+    def is_revoked(self, jti: str) -> bool:
+        """Whether the token was revoked; a database lookup only for Bloom-positive ``jti``s."""
+        if jti not in self._current():
+            self.counters.incr('negative')
+            return False
+
+        self.counters.incr('positive')
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        if not revoked:
+            self.counters.incr('false_positive')
+        return revoked
+
+    async def ais_revoked(self, jti: str) -> bool:
+        """Async ``is_revoked``; the filter is refreshed in a worker thread only when due."""
+        bloom = self._bloom
+        if bloom is None or self._clock() - self._refreshed_at >= self.refresh_interval:
+            bloom = await sync_to_async(self._current)()
+        if jti not in bloom:
+            self.counters.incr('negative')
+            return False
+
+        self.counters.incr('positive')
+        revoked = await RevokedToken.objects.filter(jti=jti).aexists()
+        if not revoked:
+            self.counters.incr('false_positive')
+        return revoked
+
+    def add(self, jti: str) -> None:
+        """Record a revocation made by this process without waiting for the next refresh."""
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bloom = None
+            self._cursor = None
+
+    def stats(self) -> dict[str, int]:
+        """Return Bloom negative/positive/false-positive/rebuild counters and the entry count."""
+        return (
+            {'negative': 0, 'positive': 0, 'false_positive': 0, 'rebuilds': 0}
+            | self.counters.snapshot()
+            | {'size': self._bloom.count if self._bloom is not None else 0}
+        )
+
+
+revoked_tokens = RevokedTokenFilter()
+
+
+def revoke_token(token: Token) -> bool:
+    """Revoke a single token until its expiry. Returns ``False`` if it was already revoked."""
+    _revoked, created = RevokedToken.objects.get_or_create(
+        jti=token['jti'],
+        defaults={
+            'user_id': token['sub'],
+            'token_type': token['token_type'],
+            'expires_at': datetime_from_epoch(token['exp']),
+        },
+    )
+    revoked_tokens.add(token['jti'])
+    return created
+
+
+def prune_expired() -> int:
+    """Delete revocations of tokens that have expired anyway. Returns the number deleted."""
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
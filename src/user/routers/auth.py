@@ -1,62 +1,337 @@
+import base64
+import binascii
+import math
+import time
+from typing import Any
+from urllib.parse import unquote
+from uuid import UUID
+
 from django.conf import settings
 from django.contrib.auth import authenticate
+from django.db.models import F, Q, QuerySet
 from django.http import HttpRequest
-from ninja import Router
-from ninja.errors import HttpError
+from ninja import Form, Router
+from ninja.errors import HttpError, Throttled
 
-from ..models import User
-from ..schemas import LoginRequest, RefreshRequest, TokenResponse
-from ..tokens import CustomAccessToken, CustomRefreshToken
+from ..auth import JWTAuth
+from ..metrics import Counters
+from ..models import Permission, Service, User
+from ..revocation import is_revoked
+from ..revoked_tokens import revoke_token, revoked_tokens
+from ..schemas import (
+    AccessTokenResponse,
+    ClientCredentialsRequest,
+    LoginRequest,
+    LogoutRequest,
+    RefreshRequest,
+    ServiceTokenResponse,
+    TokenExchangeRequest,
+    TokenResponse,
+)
+from ..service_auth import authenticate_client
+from ..service_tokens import IssuedToken, service_token_cache
+from ..snapshots import ENTITLEMENT_FINGERPRINT_CLAIM, short_fingerprint
+from ..throttling import client_ip, login_throttle
+from ..tokens import (
+    AUDIENCE_CLAIM,
+    CLAIMS_FORMAT_CLAIM,
+    CustomAccessToken,
+    CustomRefreshToken,
+    ServiceAccessToken,
+    entitlement_claims,
+    scope_claims,
+)
 
 router = Router()
+jwt_auth = JWTAuth()
+
+# ``fast_path``: refreshes that re-signed the claims carried by the refresh token;
+# ``slow_path``: refreshes that had to load the user's current claims.
+refresh_counters = Counters('token_refresh')
+
+
+def _access_token_lifetime() -> int:
+    return int(settings.NINJA_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())  # type: ignore
+
+
+def _get_audience(audience: str | None) -> Service | None:
+    """Resolve an ``audience`` (service id or client_id) to an active service."""
+    if audience is None:
+        return None
+
+    lookup = Q(client_id=audience)
+    try:
+        lookup |= Q(id=UUID(audience))
+    except ValueError:
+        pass
+
+    try:
+        return Service.objects.get(lookup, status='ACTIVE')
+    except Service.DoesNotExist:
+        raise HttpError(400, 'Unknown audience')
+
+
+def _claims_format(requested: str | None) -> str:
+    return requested or settings.JWT_CLAIMS_FORMAT
+
+
+def _access_token_for(
+    user: User,
+    audience: Service | None,
+    claims_format: str,
+    claims: dict[str, Any] | None = None,
+) -> CustomAccessToken:
+    if claims is None:
+        claims = entitlement_claims(user, audience)
+    access = CustomAccessToken.for_user_with_claims(user, claims, audience, claims_format)
+    if audience is not None and str(audience.id) not in access['services']:
+        raise HttpError(403, 'User not assigned to audience')
+    return access
+
+
+def _issue_tokens(user: User, audience: Service | None, claims_format: str) -> TokenResponse:
+    access = _access_token_for(user, audience, claims_format)
+    refresh = CustomRefreshToken.for_user(user, audience=audience, claims_format=claims_format)
+
+    return TokenResponse(
+        access_token=str(access),
+        refresh_token=str(refresh),
+        token_type='Bearer',
+        expires_in=_access_token_lifetime(),
+    )
+
+
+def _throttle_login(request: HttpRequest, email: str) -> str:
+    """
+    Count a login attempt against ``login_throttle`` (429 when over the limit).
+
+    Returns the client IP.
+    """
+    ip = client_ip(request)
+    wait = login_throttle.check(ip, email)
+    if wait is not None:
+        raise Throttled(wait=math.ceil(wait))
+    return ip
 
 
 @router.post('/login', response=TokenResponse, auth=None)
 def login(request: HttpRequest, payload: LoginRequest) -> TokenResponse:
     """User login endpoint - returns JWT access and refresh tokens for valid credentials."""
+    ip = _throttle_login(request, payload.email)
+
     user: User | None = authenticate(request, email=payload.email, password=payload.password)
 
     if user is None:
         raise HttpError(400, 'Invalid credentials')
 
+    login_throttle.succeeded(ip, payload.email)
+
     if user.status != User.STATUS_ACTIVE:
         raise HttpError(403, 'User not active')
 
-    # Generate tokens
-    refresh = CustomRefreshToken.for_user(user)
-    access = CustomAccessToken.for_user(user)
+    audience = _get_audience(payload.audience)
+
+    return _issue_tokens(user, audience, _claims_format(payload.claims_format))
+
+
+def _load_refresh_token(raw_token: str) -> CustomRefreshToken:
+    try:
+        refresh = CustomRefreshToken(raw_token)
+    except Exception:
+        raise HttpError(401, 'Invalid or expired refresh token')
+
+    if revoked_tokens.is_revoked(refresh['jti']):
+        raise HttpError(401, 'Invalid or expired refresh token')
+
+    return refresh
+
+
+def _users_with_fingerprint() -> QuerySet[User]:
+    # The current entitlement fingerprint comes in the same query as the user.
+    return User.objects.annotate(entitlement_fingerprint=F('entitlement_snapshot__fingerprint'))
+
+
+def _carries_current_claims(refresh: CustomRefreshToken, user: User) -> bool:
+    """Whether the refresh token's claims match the user's current entitlement fingerprint."""
+    current = user.entitlement_fingerprint  # type: ignore[attr-defined]
+    carried = refresh.get(ENTITLEMENT_FINGERPRINT_CLAIM)
+    return current is not None and carried == short_fingerprint(current)
+
+
+def _refresh_tokens(
+    refresh: CustomRefreshToken,
+    user: User,
+    payload: RefreshRequest,
+    current_claims: dict[str, Any] | None = None,
+) -> TokenResponse:
+    """Mint the refreshed tokens; ``current_claims`` are the user's already resolved claims."""
+    if user.status != User.STATUS_ACTIVE:
+        raise HttpError(403, 'User not active')
+
+    # A refresh token bound to an audience can only mint tokens for that audience.
+    bound_audience = refresh.get(AUDIENCE_CLAIM)
+    audience = _get_audience(payload.audience or bound_audience)
+    if bound_audience is not None and str(audience.id) != bound_audience:  # type: ignore
+        raise HttpError(403, 'Refresh token is bound to another audience')
+
+    claims_format = _claims_format(payload.claims_format or refresh.get(CLAIMS_FORMAT_CLAIM))
+
+    # Re-use the claims carried by the refresh token while the user's entitlements are unchanged;
+    # otherwise load the current ones and re-sign the refresh token with them (same exp and jti).
+    # Concurrent slow-path refreshes of one user share a single resolution (see ``tokens.py``).
+    claims = refresh.entitlements
+    if _carries_current_claims(refresh, user):
+        refresh_counters.incr('fast_path')
+    else:
+        refresh_counters.incr('slow_path')
+        claims = entitlement_claims(
+            user, audience if bound_audience is not None else None, current_claims
+        )
+        refresh.set_entitlements(claims)
+
+    if audience is not None and bound_audience is None:
+        claims = scope_claims(claims, str(audience.id))
+
+    # Generate a new access token
+    access = _access_token_for(user, audience, claims_format, claims)
 
     return TokenResponse(
         access_token=str(access),
         refresh_token=str(refresh),
         token_type='Bearer',
-        expires_in=int(settings.NINJA_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()),  # type: ignore
+        expires_in=_access_token_lifetime(),
     )
 
 
 @router.post('/refresh', response=TokenResponse, auth=None)
 def refresh_token(request: HttpRequest, payload: RefreshRequest) -> TokenResponse:
     """Token refresh endpoint - returns a new access token using refresh token."""
+    refresh = _load_refresh_token(payload.refresh_token)
+
     try:
-        refresh = CustomRefreshToken(payload.refresh_token)
+        user = _users_with_fingerprint().get(id=refresh['sub'])
+    except User.DoesNotExist:
+        raise HttpError(401, 'User not found')
+
+    return _refresh_tokens(refresh, user, payload)
+
+
+@router.post('/exchange', response=AccessTokenResponse, auth=None)
+def exchange_token(request: HttpRequest, payload: TokenExchangeRequest) -> AccessTokenResponse:
+    """Token exchange endpoint - narrows a valid access token to a single audience."""
+    try:
+        subject = CustomAccessToken(payload.subject_token)
     except Exception:
-        raise HttpError(401, 'Invalid or expired refresh token')
+        raise HttpError(401, 'Invalid or expired subject token')
+
+    # Logged-out tokens and tokens issued before a revocation epoch must not mint new ones.
+    if revoked_tokens.is_revoked(subject['jti']) or is_revoked(subject['sub'], subject['iat']):
+        raise HttpError(401, 'Invalid or expired subject token')
+
+    audience = _get_audience(payload.audience)
+    bound_audience = subject.get(AUDIENCE_CLAIM)
+    if bound_audience is not None and str(audience.id) != bound_audience:  # type: ignore
+        raise HttpError(403, 'Subject token is bound to another audience')
 
-    # Get user and validate status
     try:
-        user = User.objects.get(id=refresh['sub'])
+        user = User.objects.get(id=subject['sub'])
     except User.DoesNotExist:
         raise HttpError(401, 'User not found')
 
     if user.status != User.STATUS_ACTIVE:
         raise HttpError(403, 'User not active')
 
-    # Generate a new access token
-    access = CustomAccessToken.for_user(user)
+    access = _access_token_for(user, audience, _claims_format(payload.claims_format))
 
-    return TokenResponse(
+    return AccessTokenResponse(
         access_token=str(access),
-        refresh_token=str(refresh),
         token_type='Bearer',
-        expires_in=int(settings.NINJA_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds()),  # type: ignore
+        expires_in=_access_token_lifetime(),
+    )
+
+
+@router.post('/logout', auth=jwt_auth)
+def logout(request: HttpRequest, payload: LogoutRequest):
+    """Revoke the access token used for this request and, if given, a refresh token."""
+    access = CustomAccessToken(request.headers['Authorization'].split(' ', 1)[1])
+
+    refresh = None
+    if payload.refresh_token is not None:
+        try:
+            refresh = CustomRefreshToken(payload.refresh_token)
+        except Exception:
+            raise HttpError(401, 'Invalid or expired refresh token')
+        if refresh['sub'] != access['sub']:
+            raise HttpError(403, 'Refresh token belongs to another user')
+
+    revoke_token(access)
+    if refresh is not None:
+        revoke_token(refresh)
+
+    return {'detail': 'Logged out'}
+
+
+def _client_credentials(request: HttpRequest, payload: ClientCredentialsRequest) -> tuple[str, str]:
+    """Read the client credentials from HTTP Basic authentication or the request body."""
+    header = request.headers.get('Authorization', '')
+    if header[:6].lower() == 'basic ':
+        try:
+            decoded = base64.b64decode(header[6:], validate=True).decode()
+        except (binascii.Error, UnicodeDecodeError):
+            raise HttpError(401, 'Invalid client credentials')
+        client_id, _, client_secret = decoded.partition(':')
+        # RFC 6749 section 2.3.1: both parts are form-urlencoded.
+        return unquote(client_id), unquote(client_secret)
+
+    if not payload.client_id or not payload.client_secret:
+        raise HttpError(401, 'Invalid client credentials')
+    return payload.client_id, payload.client_secret
+
+
+def _validate_scopes(service: Service, requested: list[str]) -> None:
+    if requested:
+        known = set(
+            Permission.objects.filter(
+                service=service, type=Permission.TYPE_SERVICE, code__in=requested
+            ).values_list('code', flat=True)
+        )
+        if known != set(requested):
+            raise HttpError(400, 'Invalid scope')
+
+
+def _mint_service_token(service: Service, scopes: list[str]) -> IssuedToken:
+    _validate_scopes(service, scopes)
+    token = ServiceAccessToken.for_service(service, scopes)
+    return IssuedToken(
+        token=str(token), scope=token['scope'], issued_at=token['iat'], expires_at=token['exp']
+    )
+
+
+@router.post('/token', response=ServiceTokenResponse, auth=None)
+def service_token(
+    request: HttpRequest, payload: Form[ClientCredentialsRequest]
+) -> ServiceTokenResponse:
+    """
+    OAuth 2.0 client-credentials grant - returns a short-lived token for a service.
+
+    A token issued earlier for the same service and scope is returned again while enough of its
+    lifetime is left (see ``service_tokens.py``).
+    """
+    if payload.grant_type != 'client_credentials':
+        raise HttpError(400, 'Unsupported grant type')
+
+    service = authenticate_client(*_client_credentials(request, payload))
+    if service is None:
+        raise HttpError(401, 'Invalid client credentials')
+
+    scopes = sorted(set((payload.scope or '').split()))
+    issued = service_token_cache.get_or_mint(
+        str(service.id), ' '.join(scopes), lambda: _mint_service_token(service, scopes)
+    )
+
+    return ServiceTokenResponse(
+        access_token=issued.token,
+        token_type='Bearer',
+        expires_in=max(0, issued.expires_at - int(time.time())),
+        scope=issued.scope,
     )
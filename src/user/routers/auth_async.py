@@ -0,0 +1,73 @@
+"""
+Async login and refresh endpoints for ASGI deployments.
+
+Lookups use the async ORM and password checks run on ``password_hash_pool``, so a burst of logins
+neither blocks the event loop nor queues up behind Django's single thread for sync views. When
+the pool is saturated, login fails fast with 503. Attempts are throttled like ``/auth/login``.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest
+from ninja import Router
+from ninja.errors import HttpError
+
+from ..hashing import PoolSaturated, password_hash_pool
+from ..models import User
+from ..schemas import LoginRequest, RefreshRequest, TokenResponse
+from ..throttling import login_throttle
+from ..tokens import aresolve_claims
+from .auth import (
+    _carries_current_claims,
+    _claims_format,
+    _get_audience,
+    _issue_tokens,
+    _load_refresh_token,
+    _refresh_tokens,
+    _throttle_login,
+    _users_with_fingerprint,
+)
+
+router = Router()
+
+
+@router.post('/login', response=TokenResponse, auth=None)
+async def login(request: HttpRequest, payload: LoginRequest) -> TokenResponse:
+    """Async user login endpoint - same checks as ``/auth/login``."""
+    ip = _throttle_login(request, payload.email)
+
+    user = await User.objects.by_email(payload.email).afirst()
+
+    try:
+        valid = user is not None and await password_hash_pool.check_password(user, payload.password)
+    except PoolSaturated:
+        raise HttpError(503, 'Too many concurrent logins, retry later')
+
+    if not valid:
+        raise HttpError(400, 'Invalid credentials')
+
+    login_throttle.succeeded(ip, payload.email)
+
+    if user.status != User.STATUS_ACTIVE:  # type: ignore[union-attr]
+        raise HttpError(403, 'User not active')
+
+    audience = await sync_to_async(_get_audience)(payload.audience)
+
+    return await sync_to_async(_issue_tokens)(user, audience, _claims_format(payload.claims_format))
+
+
+@router.post('/refresh', response=TokenResponse, auth=None)
+async def refresh_token(request: HttpRequest, payload: RefreshRequest) -> TokenResponse:
+    """Async token refresh endpoint - same behavior as ``/auth/refresh``."""
+    refresh = await sync_to_async(_load_refresh_token)(payload.refresh_token)
+
+    user = await _users_with_fingerprint().filter(id=refresh['sub']).afirst()
+    if user is None:
+        raise HttpError(401, 'User not found')
+
+    # Resolved here so concurrent refreshes of the user wait for one resolution without holding
+    # the thread that runs sync code.
+    current_claims = None
+    if user.status == User.STATUS_ACTIVE and not _carries_current_claims(refresh, user):
+        current_claims = await aresolve_claims(user.id)
+
+    return await sync_to_async(_refresh_tokens)(refresh, user, payload, current_claims)
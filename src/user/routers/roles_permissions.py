@@ -1,29 +1,60 @@
 from uuid import UUID
 
-from ninja import Router
+from django.http import HttpResponse
+from ninja import Query, Router
 from ninja.errors import HttpError
 
-from ..auth import AdminAuth
+from ..auth import AdminAuth, JWTAuth
+from ..catalog import InvalidCatalog, sync_catalog
+from ..etags import list_etag, not_modified
 from ..models import Permission, Role, RolePermission, Service
+from ..pagination import paginate
+from ..permission_index import get_index
 from ..schemas import (
+    PageParams,
     PermissionCreate,
+    PermissionIndexResponse,
     PermissionListResponse,
     PermissionResponse,
     RoleCreate,
     RoleListResponse,
     RoleResponse,
+    ServiceCatalog,
+    ServiceCatalogResponse,
 )
 
 router = Router()
 admin_auth = AdminAuth()
+jwt_auth = JWTAuth()
 
 
 @router.get('/{service_id}/permissions', response=PermissionListResponse, auth=admin_auth)
-def list_service_permissions(request, service_id: UUID):
-    """List all permissions for a service."""
+def list_service_permissions(
+    request, response: HttpResponse, service_id: UUID, params: Query[PageParams]
+):
+    """List a service's permissions, oldest first, a page at a time (304 when unchanged)."""
     permissions = Permission.objects.filter(service_id=service_id)
+    etag = list_etag(permissions, service_id, params.cursor, params.limit)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response['ETag'] = etag
+
+    page = paginate(permissions, params.cursor, params.limit)
     return PermissionListResponse(
-        permissions=[PermissionResponse.model_validate(p) for p in permissions]
+        permissions=[PermissionResponse.model_validate(p) for p in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get('/{service_id}/permissions/index', response=PermissionIndexResponse, auth=jwt_auth)
+def get_service_permission_index(request, service_id: UUID):
+    """Get the permission code -> bit index used by compact token claims."""
+    index = get_index(service_id)
+    if index is None:
+        raise HttpError(404, 'Service not found')
+
+    return PermissionIndexResponse(
+        service_id=service_id, version=index.version, permissions=index.bits
     )
 
 
@@ -46,10 +77,20 @@ def create_service_permission(request, service_id: UUID, payload: PermissionCrea
 
 
 @router.get('/{service_id}/roles', response=RoleListResponse, auth=admin_auth)
-def list_service_roles(request, service_id: UUID):
-    """List all roles for a service."""
+def list_service_roles(
+    request, response: HttpResponse, service_id: UUID, params: Query[PageParams]
+):
+    """List a service's roles, oldest first, a page at a time (304 when unchanged)."""
     roles = Role.objects.filter(service_id=service_id)
-    return RoleListResponse(roles=[RoleResponse.model_validate(r) for r in roles])
+    etag = list_etag(roles, service_id, params.cursor, params.limit)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response['ETag'] = etag
+
+    page = paginate(roles, params.cursor, params.limit)
+    return RoleListResponse(
+        roles=[RoleResponse.model_validate(r) for r in page.items], next_cursor=page.next_cursor
+    )
 
 
 @router.post('/{service_id}/roles', response=RoleResponse, auth=admin_auth)
@@ -69,3 +110,24 @@ def create_service_role(request, service_id: UUID, payload: RoleCreate):
             RolePermission.objects.create(role=role, permission=permission)
 
     return RoleResponse.model_validate(role)
+
+
+@router.put('/{service_id}/catalog', response=ServiceCatalogResponse, auth=admin_auth)
+def put_service_catalog(request, service_id: UUID, payload: ServiceCatalog):
+    """
+    Replace a service's permissions, roles and role -> permission mappings.
+
+    Only the differences are written, so putting an unchanged catalog changes nothing. Listed
+    items are matched by code and name; unlisted ones are deleted, with their grants.
+    """
+    try:
+        service = Service.objects.get(id=service_id)
+    except Service.DoesNotExist:
+        raise HttpError(404, 'Service not found')
+
+    try:
+        summary = sync_catalog(service, payload)
+    except InvalidCatalog as exc:
+        raise HttpError(400, str(exc))
+
+    return ServiceCatalogResponse.model_validate(summary)
@@ -0,0 +1,56 @@
+"""Async read endpoints for service roles and permissions, for ASGI deployments."""
+
+from uuid import UUID
+
+from django.http import HttpRequest, HttpResponse
+from ninja import Query, Router
+
+from ..auth import AsyncAdminAuth
+from ..etags import alist_etag, not_modified
+from ..models import Permission, Role
+from ..pagination import apaginate
+from ..schemas import (
+    PageParams,
+    PermissionListResponse,
+    PermissionResponse,
+    RoleListResponse,
+    RoleResponse,
+)
+
+router = Router()
+admin_auth = AsyncAdminAuth()
+
+
+@router.get('/{service_id}/permissions', response=PermissionListResponse, auth=admin_auth)
+async def list_service_permissions(
+    request: HttpRequest, response: HttpResponse, service_id: UUID, params: Query[PageParams]
+) -> PermissionListResponse | HttpResponse:
+    """Async list of a service's permissions, a page at a time."""
+    permissions = Permission.objects.filter(service_id=service_id)
+    etag = await alist_etag(permissions, service_id, params.cursor, params.limit)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response['ETag'] = etag
+
+    page = await apaginate(permissions, params.cursor, params.limit)
+    return PermissionListResponse(
+        permissions=[PermissionResponse.model_validate(p) for p in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get('/{service_id}/roles', response=RoleListResponse, auth=admin_auth)
+async def list_service_roles(
+    request: HttpRequest, response: HttpResponse, service_id: UUID, params: Query[PageParams]
+) -> RoleListResponse | HttpResponse:
+    """Async list of a service's roles, a page at a time."""
+    roles = Role.objects.filter(service_id=service_id)
+    etag = await alist_etag(roles, service_id, params.cursor, params.limit)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response['ETag'] = etag
+
+    page = await apaginate(roles, params.cursor, params.limit)
+    return RoleListResponse(
+        roles=[RoleResponse.model_validate(r) for r in page.items], next_cursor=page.next_cursor
+    )
@@ -1,27 +1,54 @@
 import secrets
 from uuid import UUID
 
-from ninja import Router
+from django.http import HttpResponse
+from ninja import Query, Router
 from ninja.errors import HttpError
 
 from ..auth import AdminAuth
+from ..etags import list_etag, not_modified
 from ..models import Service
-from ..schemas import ServiceCreate, ServiceListResponse, ServiceResponse, ServiceUpdate
+from ..pagination import paginate
+from ..schemas import (
+    PageParams,
+    ServiceCreate,
+    ServiceCredentialsResponse,
+    ServiceListResponse,
+    ServiceResponse,
+    ServiceUpdate,
+)
+from ..service_auth import hash_client_secret
 
 router = Router()
 admin_auth = AdminAuth()
 
 
 @router.get('', response=ServiceListResponse, auth=admin_auth)
-def list_services(request):
-    """List all services."""
-    services = Service.objects.all()
-    return ServiceListResponse(services=[ServiceResponse.model_validate(s) for s in services])
+def list_services(request, response: HttpResponse, params: Query[PageParams]):
+    """
+    List services, oldest first, a page at a time (pass ``next_cursor`` as ``cursor``).
+
+    Answers ``If-None-Match`` with 304 when no service changed (see ``etags.py``).
+    """
+    etag = list_etag(Service.objects.all(), params.cursor, params.limit)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response['ETag'] = etag
+
+    page = paginate(Service.objects.all(), params.cursor, params.limit)
+    return ServiceListResponse(
+        services=[ServiceResponse.model_validate(s) for s in page.items],
+        next_cursor=page.next_cursor,
+    )
 
 
-@router.post('', response=ServiceResponse, auth=admin_auth)
+@router.post('', response=ServiceCredentialsResponse, auth=admin_auth)
 def create_service(request, payload: ServiceCreate):
-    """Create a new service with generated client_id and client_secret."""
+    """
+    Create a new service with generated client_id and client_secret.
+
+    The secret is only returned here; the service stores its hash.
+    """
     client_id = secrets.token_urlsafe(32)
     client_secret = secrets.token_urlsafe(64)
 
@@ -30,10 +57,12 @@ def create_service(request, payload: ServiceCreate):
         description=payload.description,
         status=payload.status,
         client_id=client_id,
-        client_secret=client_secret,
+        client_secret=hash_client_secret(client_secret),
     )
 
-    return ServiceResponse.model_validate(service)
+    return ServiceCredentialsResponse(
+        **ServiceResponse.model_validate(service).model_dump(), client_secret=client_secret
+    )
 
 
 @router.get('/{service_id}', response=ServiceResponse, auth=admin_auth)
@@ -0,0 +1,49 @@
+"""
+Async read endpoints for services, for ASGI deployments.
+
+Same responses and checks as the corresponding ``/services/`` endpoints, served with the async
+ORM and ``AsyncAdminAuth`` so a request never holds a worker thread while waiting on the database.
+"""
+
+from uuid import UUID
+
+from django.http import HttpRequest, HttpResponse
+from ninja import Query, Router
+from ninja.errors import HttpError
+
+from ..auth import AsyncAdminAuth
+from ..etags import alist_etag, not_modified
+from ..models import Service
+from ..pagination import apaginate
+from ..schemas import PageParams, ServiceListResponse, ServiceResponse
+
+router = Router()
+admin_auth = AsyncAdminAuth()
+
+
+@router.get('', response=ServiceListResponse, auth=admin_auth)
+async def list_services(
+    request: HttpRequest, response: HttpResponse, params: Query[PageParams]
+) -> ServiceListResponse | HttpResponse:
+    """Async list of services, a page at a time."""
+    etag = await alist_etag(Service.objects.all(), params.cursor, params.limit)
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    response['ETag'] = etag
+
+    page = await apaginate(Service.objects.all(), params.cursor, params.limit)
+    return ServiceListResponse(
+        services=[ServiceResponse.model_validate(s) for s in page.items],
+        next_cursor=page.next_cursor,
+    )
+
+
+@router.get('/{service_id}', response=ServiceResponse, auth=admin_auth)
+async def get_service(request: HttpRequest, service_id: UUID) -> ServiceResponse:
+    """Async service details."""
+    try:
+        service = await Service.objects.aget(id=service_id)
+    except Service.DoesNotExist:
+        raise HttpError(404, 'Service not found')
+
+    return ServiceResponse.model_validate(service)
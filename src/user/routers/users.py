@@ -1,9 +1,17 @@
+from dataclasses import asdict
 from uuid import UUID
 
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
 from ninja import Router
 from ninja.errors import HttpError
 
 from ..auth import AdminAuth
+from ..entitlements import resolve_services
+from ..etags import not_modified, user_services_etag
+from ..export import export_lines
 from ..models import (
     Permission,
     Role,
@@ -13,11 +21,16 @@ from ..models import (
     UserServicePermission,
     UserServiceRole,
 )
+from ..provisioning import UnknownGrants, provision_users, set_service_grants
 from ..schemas import (
+    BulkUserCreateRequest,
+    BulkUserCreateResponse,
+    BulkUserResult,
     UserCreateRequest,
     UserDeactivateRequest,
     UserResponse,
     UserServiceAssignmentUpdate,
+    UserServiceAssignmentUpdateResponse,
     UserServiceInfo,
     UserServicesListResponse,
     UserUpdateRequest,
@@ -32,7 +45,9 @@ admin_auth = AdminAuth()
 def create_service_user(request, service_id: UUID, payload: UserCreateRequest):
     """Create or assign a user to a service."""
     # Get or create user
-    user, created = User.objects.get_or_create(email=payload.email, defaults={'name': payload.name})
+    user, created = User.objects.by_email(payload.email).get_or_create(
+        defaults={'email': payload.email, 'name': payload.name}
+    )
 
     if created and payload.password:
         user.set_password(payload.password)
@@ -46,7 +61,7 @@ def create_service_user(request, service_id: UUID, payload: UserCreateRequest):
 
     # Create service assignment
     UserServiceAssignment.objects.get_or_create(
-        user=user, service=service, defaults={'created_by': request.auth}
+        user=user, service=service, defaults={'created_by_id': request.auth.id}
     )
 
     # Assign roles
@@ -70,6 +85,53 @@ def create_service_user(request, service_id: UUID, payload: UserCreateRequest):
     return UserResponse.model_validate(user)
 
 
+@service_users_router.post(
+    '/{service_id}/users/bulk', response=BulkUserCreateResponse, auth=admin_auth
+)
+def bulk_create_service_users(request, service_id: UUID, payload: BulkUserCreateRequest):
+    """
+    Create or assign many users to a service, with per-user results.
+
+    Unlike the single-user endpoint, users naming unknown roles or permissions are reported as
+    failed and not provisioned.
+    """
+    if len(payload.users) > settings.BULK_PROVISION_MAX_USERS:
+        raise HttpError(400, f'At most {settings.BULK_PROVISION_MAX_USERS} users per request')
+
+    try:
+        service = Service.objects.get(id=service_id)
+    except Service.DoesNotExist:
+        raise HttpError(404, 'Service not found')
+
+    results = provision_users(service, payload.users, created_by_id=request.auth.id)
+
+    return BulkUserCreateResponse(
+        results=[BulkUserResult(**asdict(r)) for r in results],
+        created=sum(r.created for r in results),
+        failed=sum(r.error is not None for r in results),
+    )
+
+
+@service_users_router.get('/{service_id}/entitlements/export', auth=admin_auth)
+def export_service_entitlements(request, service_id: UUID):
+    """
+    Stream every user assigned to a service with their roles and effective permissions, as NDJSON.
+
+    Gzip-compressed when the client accepts it.
+    """
+    if not Service.objects.filter(id=service_id).exists():
+        raise HttpError(404, 'Service not found')
+
+    content = export_lines(service_id)
+    response = StreamingHttpResponse(content_type='application/x-ndjson')
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        content = compress_sequence(content)
+        response.headers['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response.streaming_content = content
+    return response
+
+
 @router.get('/{user_id}', response=UserResponse, auth=admin_auth)
 def get_user(request, user_id: UUID):
     """Get user details."""
@@ -90,6 +152,8 @@ def update_user(request, user_id: UUID, payload: UserUpdateRequest):
         raise HttpError(404, 'User not found')
 
     if payload.email is not None:
+        if User.objects.by_email(payload.email).exclude(id=user.id).exists():
+            raise HttpError(409, 'Email already in use')
         user.email = payload.email
     if payload.name is not None:
         user.name = payload.name
@@ -139,75 +203,64 @@ def reactivate_user(request, user_id: UUID):
 
 
 @router.get('/{user_id}/services', response=UserServicesListResponse, auth=admin_auth)
-def list_user_services(request, user_id: UUID):
-    """List all service assignments for a user."""
+def list_user_services(
+    request, response: HttpResponse, user_id: UUID, include_effective: bool = False
+):
+    """
+    List all service assignments for a user.
+
+    Answered in a fixed number of queries however many services the user has;
+    ``include_effective=true`` adds role-derived permissions, which the same queries return.
+    ``If-None-Match`` is answered with 304 when nothing changed, after the first query.
+    """
     try:
-        user = User.objects.get(id=user_id)
+        etag = user_services_etag(user_id, include_effective)
     except User.DoesNotExist:
         raise HttpError(404, 'User not found')
-
-    assignments = UserServiceAssignment.objects.filter(user=user).select_related('service')
-
-    services_data = []
-    for assignment in assignments:
-        service = assignment.service
-
-        # Get roles
-        roles = UserServiceRole.objects.filter(user=user, service=service).select_related('role')
-        role_names = [usr.role.name for usr in roles]
-
-        # Get permissions
-        perms = UserServicePermission.objects.filter(user=user, service=service).select_related(
-            'permission'
-        )
-        perm_codes = [usp.permission.code for usp in perms]
-
-        services_data.append(
-            UserServiceInfo(
-                service_id=str(service.id),
-                service_name=service.name,
-                roles=role_names,
-                permissions=perm_codes,
-            )
+    if unchanged := not_modified(request, etag):
+        return unchanged
+    if etag:
+        response['ETag'] = etag
+
+    services_data = [
+        UserServiceInfo(
+            service_id=s.service_id,
+            service_name=s.service_name,
+            roles=list(s.roles),
+            permissions=list(s.direct_permissions),
+            effective_permissions=list(s.permissions) if include_effective else None,
         )
+        for s in resolve_services(user_id)
+    ]
 
     return UserServicesListResponse(services=services_data)
 
 
-@router.patch('/{user_id}/services/{service_id}', auth=admin_auth)
+@router.patch(
+    '/{user_id}/services/{service_id}',
+    response=UserServiceAssignmentUpdateResponse,
+    auth=admin_auth,
+)
 def update_user_service_assignment(
     request, user_id: UUID, service_id: UUID, payload: UserServiceAssignmentUpdate
 ):
-    """Update user's roles and permissions for a service."""
+    """
+    Set user's roles and permissions for a service.
+
+    Only the differences are written; unknown role names or permission codes fail with 400.
+    """
     try:
         user = User.objects.get(id=user_id)
         service = Service.objects.get(id=service_id)
     except (User.DoesNotExist, Service.DoesNotExist):
         raise HttpError(404, 'User or service not found')
 
-    # Clear existing roles
-    UserServiceRole.objects.filter(user=user, service=service).delete()
-
-    # Assign new roles
-    for role_name in payload.roles:
-        try:
-            role = Role.objects.get(service=service, name=role_name)
-            UserServiceRole.objects.create(user=user, service=service, role=role)
-        except Role.DoesNotExist:
-            pass
-
-    # Clear existing permissions
-    UserServicePermission.objects.filter(user=user, service=service).delete()
-
-    # Assign new permissions
-    for perm_code in payload.permissions:
-        try:
-            permission = Permission.objects.get(service=service, code=perm_code)
-            UserServicePermission.objects.create(user=user, service=service, permission=permission)
-        except Permission.DoesNotExist:
-            pass
+    try:
+        changed = set_service_grants(user.id, service, payload.roles, payload.permissions)
+    except UnknownGrants as exc:
+        raise HttpError(400, str(exc))
 
-    return {'detail': 'Updated successfully'}
+    return UserServiceAssignmentUpdateResponse(detail='Updated successfully', changed=changed)
 
 
 @router.delete('/{user_id}/services/{service_id}', auth=admin_auth)
@@ -1,46 +1,98 @@
-from .auth import LoginRequest, RefreshRequest, TokenResponse
+from .auth import (
+    AccessTokenResponse,
+    ClientCredentialsRequest,
+    LoginRequest,
+    LogoutRequest,
+    RefreshRequest,
+    ServiceTokenResponse,
+    TokenExchangeRequest,
+    TokenResponse,
+)
+from .imports import (
+    AssignmentImport,
+    PermissionImport,
+    RoleImport,
+    RolePermissionImport,
+    ServiceImport,
+    UserImport,
+)
+from .pagination import PageParams
 from .roles_permissions import (
+    CatalogChangeCounts,
+    CatalogPermission,
+    CatalogRole,
     PermissionCreate,
+    PermissionIndexResponse,
     PermissionListResponse,
     PermissionResponse,
     RoleCreate,
     RoleListResponse,
     RoleResponse,
+    ServiceCatalog,
+    ServiceCatalogResponse,
 )
 from .services import (
     ServiceCreate,
+    ServiceCredentialsResponse,
     ServiceListResponse,
     ServiceResponse,
     ServiceUpdate,
 )
 from .users import (
+    BulkUserCreateRequest,
+    BulkUserCreateResponse,
+    BulkUserResult,
     UserCreateRequest,
     UserDeactivateRequest,
     UserResponse,
     UserServiceAssignmentUpdate,
+    UserServiceAssignmentUpdateResponse,
     UserServiceInfo,
     UserServicesListResponse,
     UserUpdateRequest,
 )
 
 __all__ = [
+    'AccessTokenResponse',
+    'ClientCredentialsRequest',
     'LoginRequest',
+    'LogoutRequest',
     'RefreshRequest',
+    'ServiceTokenResponse',
+    'TokenExchangeRequest',
     'TokenResponse',
+    'AssignmentImport',
+    'PermissionImport',
+    'RoleImport',
+    'RolePermissionImport',
+    'ServiceImport',
+    'UserImport',
+    'PageParams',
+    'CatalogChangeCounts',
+    'CatalogPermission',
+    'CatalogRole',
     'PermissionCreate',
+    'PermissionIndexResponse',
     'PermissionListResponse',
     'PermissionResponse',
     'RoleCreate',
     'RoleListResponse',
     'RoleResponse',
+    'ServiceCatalog',
+    'ServiceCatalogResponse',
     'ServiceCreate',
+    'ServiceCredentialsResponse',
     'ServiceListResponse',
     'ServiceResponse',
     'ServiceUpdate',
+    'BulkUserCreateRequest',
+    'BulkUserCreateResponse',
+    'BulkUserResult',
     'UserCreateRequest',
     'UserDeactivateRequest',
     'UserResponse',
     'UserServiceAssignmentUpdate',
+    'UserServiceAssignmentUpdateResponse',
     'UserServiceInfo',
     'UserServicesListResponse',
     'UserUpdateRequest',
@@ -1,13 +1,24 @@
+from typing import Literal
+
 from pydantic import BaseModel, EmailStr
 
+ClaimsFormat = Literal['full', 'compact']
+
 
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
+    # Service id or client_id; scopes the access token to that service.
+    audience: str | None = None
+    # Defaults to ``settings.JWT_CLAIMS_FORMAT``.
+    claims_format: ClaimsFormat | None = None
 
 
 class RefreshRequest(BaseModel):
     refresh_token: str
+    audience: str | None = None
+    # Defaults to the format the refresh token was issued with.
+    claims_format: ClaimsFormat | None = None
 
 
 class TokenResponse(BaseModel):
@@ -15,3 +26,36 @@ class TokenResponse(BaseModel):
     refresh_token: str
     token_type: str = 'Bearer'
     expires_in: int
+
+
+class TokenExchangeRequest(BaseModel):
+    subject_token: str
+    audience: str
+    claims_format: ClaimsFormat | None = None
+
+
+class AccessTokenResponse(BaseModel):
+    access_token: str
+    token_type: str = 'Bearer'
+    expires_in: int
+
+
+class LogoutRequest(BaseModel):
+    # Revoked together with the access token used to call the endpoint.
+    refresh_token: str | None = None
+
+
+class ClientCredentialsRequest(BaseModel):
+    grant_type: str
+    # May instead be sent with HTTP Basic authentication.
+    client_id: str | None = None
+    client_secret: str | None = None
+    # Space-separated permission codes of the service.
+    scope: str | None = None
+
+
+class ServiceTokenResponse(BaseModel):
+    access_token: str
+    token_type: str = 'Bearer'
+    expires_in: int
+    scope: str
@@ -0,0 +1,70 @@
+from typing import Literal
+
+from django.contrib.auth.hashers import identify_hasher
+from pydantic import BaseModel, EmailStr, field_validator, model_validator
+
+from .roles_permissions import RoleCreate
+from .services import ServiceCreate
+from .users import UserCreateRequest, UserServiceAssignmentUpdate
+
+
+def _encoded_hash(value: str | None) -> str | None:
+    if value:
+        try:
+            identify_hasher(value)
+        except ValueError:
+            raise ValueError('not an encoded hash of a supported hasher')
+    return value
+
+
+class ServiceImport(ServiceCreate):
+    status: Literal['ACTIVE', 'INACTIVE'] = 'ACTIVE'
+    # Generated when missing.
+    client_id: str | None = None
+    # Encoded hash, as stored (see ``service_auth.hash_client_secret``). Without one the service
+    # has no usable secret until a new one is set.
+    client_secret: str = ''
+
+    _check_client_secret = field_validator('client_secret')(_encoded_hash)
+
+
+class PermissionImport(BaseModel):
+    # Service name; global permission when empty.
+    service: str | None = None
+    code: str
+    description: str = ''
+
+
+class RoleImport(RoleCreate):
+    # Service name; global role when empty. ``permissions`` are codes in the same service.
+    service: str | None = None
+
+
+class RolePermissionImport(BaseModel):
+    # Service name of both the role and the permission; global when empty.
+    service: str | None = None
+    role: str
+    permission: str
+
+
+class UserImport(UserCreateRequest):
+    """A user, with global ``roles`` and ``permissions``."""
+
+    status: Literal['ACTIVE', 'INACTIVE'] = 'ACTIVE'
+    # Already encoded by one of ``PASSWORD_HASHERS``; stored as is instead of hashing ``password``.
+    password_hash: str | None = None
+
+    _check_password_hash = field_validator('password_hash')(_encoded_hash)
+
+    @model_validator(mode='after')
+    def _one_password(self) -> 'UserImport':
+        if self.password is not None and self.password_hash is not None:
+            raise ValueError('give either password or password_hash, not both')
+        return self
+
+
+class AssignmentImport(UserServiceAssignmentUpdate):
+    """An assignment of an existing user to a service, with roles and permissions there."""
+
+    email: EmailStr
+    service: str
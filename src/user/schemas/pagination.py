@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+
+
+class PageParams(BaseModel):
+    # ``next_cursor`` of the previous page; omit for the first page.
+    cursor: str | None = None
+    limit: int | None = Field(default=None, ge=1)
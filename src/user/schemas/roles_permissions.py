@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 
 
 class PermissionCreate(BaseModel):
@@ -18,13 +18,23 @@ class PermissionResponse(BaseModel):
     code: str
     description: str
     type: str
-    service: UUID | None
+    # Read from ``service_id``: no query for the related row (which async code cannot make).
+    service: UUID | None = Field(validation_alias=AliasChoices('service_id', 'service'))
     created_at: datetime
     updated_at: datetime
 
 
 class PermissionListResponse(BaseModel):
     permissions: list[PermissionResponse]
+    # Cursor of the next page, or ``None`` on the last one.
+    next_cursor: str | None = None
+
+
+class PermissionIndexResponse(BaseModel):
+    service_id: UUID
+    version: int
+    # Permission code -> bit position in compact ``permission_bits`` claims.
+    permissions: dict[str, int]
 
 
 class RoleCreate(BaseModel):
@@ -40,10 +50,47 @@ class RoleResponse(BaseModel):
     id: UUID
     name: str
     description: str
-    service: UUID | None
+    service: UUID | None = Field(validation_alias=AliasChoices('service_id', 'service'))
     created_at: datetime
     updated_at: datetime
 
 
 class RoleListResponse(BaseModel):
     roles: list[RoleResponse]
+    # Cursor of the next page, or ``None`` on the last one.
+    next_cursor: str | None = None
+
+
+class CatalogPermission(BaseModel):
+    code: str
+    description: str = ''
+
+
+class CatalogRole(BaseModel):
+    name: str
+    description: str = ''
+    # Codes of permissions in the same catalog.
+    permissions: list[str] = []
+
+
+class ServiceCatalog(BaseModel):
+    permissions: list[CatalogPermission] = []
+    roles: list[CatalogRole] = []
+
+
+class CatalogChangeCounts(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    created: int
+    updated: int
+    deleted: int
+
+
+class ServiceCatalogResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    changed: bool
+    permissions: CatalogChangeCounts
+    roles: CatalogChangeCounts
+    # Role -> permission mappings (never updated, only created or deleted).
+    role_permissions: CatalogChangeCounts
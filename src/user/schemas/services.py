@@ -30,3 +30,10 @@ class ServiceResponse(BaseModel):
 
 class ServiceListResponse(BaseModel):
     services: list[ServiceResponse]
+    # Cursor of the next page, or ``None`` on the last one.
+    next_cursor: str | None = None
+
+
+class ServiceCredentialsResponse(ServiceResponse):
+    # Only returned when the service is created; stored hashed.
+    client_secret: str
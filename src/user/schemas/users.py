@@ -12,6 +12,25 @@ class UserCreateRequest(BaseModel):
     permissions: list[str] = []
 
 
+class BulkUserCreateRequest(BaseModel):
+    users: list[UserCreateRequest]
+
+
+class BulkUserResult(BaseModel):
+    email: str
+    user_id: UUID | None = None
+    # Whether the user was created (rather than an existing user assigned).
+    created: bool = False
+    error: str | None = None
+
+
+class BulkUserCreateResponse(BaseModel):
+    # One result per requested user, in request order.
+    results: list[BulkUserResult]
+    created: int
+    failed: int
+
+
 class UserUpdateRequest(BaseModel):
     email: EmailStr | None = None
     name: str | None = None
@@ -40,6 +59,8 @@ class UserServiceInfo(BaseModel):
     service_name: str
     roles: list[str]
     permissions: list[str]
+    # Direct plus role-derived permissions; only with ``include_effective=true``.
+    effective_permissions: list[str] | None = None
 
 
 class UserServicesListResponse(BaseModel):
@@ -49,3 +70,9 @@ class UserServicesListResponse(BaseModel):
 class UserServiceAssignmentUpdate(BaseModel):
     roles: list[str] = []
     permissions: list[str] = []
+
+
+class UserServiceAssignmentUpdateResponse(BaseModel):
+    detail: str
+    # Whether any role or permission was added or removed.
+    changed: bool
@@ -0,0 +1,130 @@
+"""
+Authentication of services by ``client_id`` and ``client_secret``.
+
+Client secrets are stored as PBKDF2 hashes with ``SERVICE_SECRET_HASH_ITERATIONS`` iterations
+(generated secrets are long and random, so far fewer than for passwords are needed); stored
+hashes with another iteration count are re-hashed on the next successful check.
+
+Successful checks are remembered in ``verified_secrets`` for ``SERVICE_SECRET_CACHE_TTL_SECONDS``
+under an HMAC (keyed with a per-process random key) of the stored hash and presented secret, so
+repeated token requests skip the hash and no secret is kept in memory. Since the stored hash is
+part of the key, a rotated secret is never accepted from the cache.
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.utils.crypto import get_random_string
+
+from .metrics import Counters
+from .models import Service
+
+DEFAULT_HASH_ITERATIONS = 20_000
+DEFAULT_CACHE_TTL_SECONDS = 60
+DEFAULT_CACHE_MAX_ENTRIES = 10_000
+
+_hasher = PBKDF2PasswordHasher()
+
+
+def _hash_iterations() -> int:
+    return getattr(settings, 'SERVICE_SECRET_HASH_ITERATIONS', DEFAULT_HASH_ITERATIONS)
+
+
+def hash_client_secret(raw_secret: str) -> str:
+    """Return the encoded hash to store in ``Service.client_secret``."""
+    return _hasher.encode(raw_secret, get_random_string(22), _hash_iterations())
+
+
+class VerifiedSecretCache:
+    """Bounded TTL set of keyed digests of successfully verified (stored hash, secret) pairs."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._key = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[bytes, float] = OrderedDict()
+        self.counters = Counters('verified_secrets')
+
+    @property
+    def ttl(self) -> float:
+        return getattr(settings, 'SERVICE_SECRET_CACHE_TTL_SECONDS', DEFAULT_CACHE_TTL_SECONDS)
+
+    @property
+    def max_entries(self) -> int:
+        return getattr(settings, 'SERVICE_SECRET_CACHE_MAX_ENTRIES', DEFAULT_CACHE_MAX_ENTRIES)
+
+    def _digest(self, encoded: str, raw_secret: str) -> bytes:
+        message = f'{encoded}\0{raw_secret}'.encode()
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def contains(self, encoded: str, raw_secret: str) -> bool:
+        if self.ttl <= 0:
+            return False
+        digest = self._digest(encoded, raw_secret)
+        with self._lock:
+            expires_at = self._entries.get(digest)
+            if expires_at is None:
+                self.counters.incr('misses')
+                return False
+            if expires_at <= self._clock():
+                del self._entries[digest]
+                self.counters.incr('misses')
+                return False
+            self.counters.incr('hits')
+            return True
+
+    def add(self, encoded: str, raw_secret: str) -> None:
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        digest = self._digest(encoded, raw_secret)
+        with self._lock:
+            self._entries[digest] = self._clock() + self.ttl
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the number of entries."""
+        return {'hits': 0, 'misses': 0} | self.counters.snapshot() | {'size': len(self._entries)}
+
+
+verified_secrets = VerifiedSecretCache()
+
+
+def check_client_secret(service: Service, raw_secret: str) -> bool:
+    """Whether ``raw_secret`` is the service's client secret (hash skipped when cached)."""
+    encoded = service.client_secret
+    if verified_secrets.contains(encoded, raw_secret):
+        return True
+
+    if not encoded.startswith(f'{_hasher.algorithm}$') or not _hasher.verify(raw_secret, encoded):
+        return False
+
+    if _hasher.decode(encoded)['iterations'] != _hash_iterations():
+        encoded = hash_client_secret(raw_secret)
+        Service.objects.filter(pk=service.pk).update(client_secret=encoded)
+        service.client_secret = encoded
+    verified_secrets.add(encoded, raw_secret)
+    return True
+
+
+def authenticate_client(client_id: str, raw_secret: str) -> Service | None:
+    """Return the active service with these credentials, or ``None``."""
+    service = Service.objects.filter(client_id=client_id, status='ACTIVE').first()
+    if service is None or not check_client_secret(service, raw_secret):
+        return None
+    return service
@@ -0,0 +1,124 @@
+"""
+Reuse of service tokens issued by the client-credentials grant.
+
+Machine clients tend to request a token per job run. ``service_token_cache`` keeps the last token
+minted per service and scope, and hands it out again while more than
+``SERVICE_TOKEN_REUSE_MIN_REMAINING`` of its lifetime is left, which saves signing it and the
+scope lookup. Concurrent requests that find no reusable token are coalesced, so one mint serves
+all of them. The client is still authenticated on every request.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from .metrics import Counters
+from .singleflight import SingleFlight
+
+DEFAULT_REUSE_MIN_REMAINING = 0.5
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class IssuedToken:
+    token: str
+    scope: str
+    issued_at: int
+    expires_at: int
+
+
+class ServiceTokenCache:
+    """Per-process cache of the latest token per (service, scope)."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, str], IssuedToken] = OrderedDict()
+        self._flights: SingleFlight[IssuedToken] = SingleFlight()
+        self.counters = Counters('service_tokens')
+
+    @property
+    def min_remaining(self) -> float:
+        return getattr(settings, 'SERVICE_TOKEN_REUSE_MIN_REMAINING', DEFAULT_REUSE_MIN_REMAINING)
+
+    @property
+    def max_entries(self) -> int:
+        return getattr(settings, 'SERVICE_TOKEN_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    @property
+    def enabled(self) -> bool:
+        return self.min_remaining < 1 and self.max_entries > 0
+
+    def _reusable(self, key: tuple[str, str]) -> IssuedToken | None:
+        with self._lock:
+            issued = self._entries.get(key)
+            if issued is None:
+                return None
+            lifetime = issued.expires_at - issued.issued_at
+            if issued.expires_at - self._clock() > self.min_remaining * lifetime:
+                self._entries.move_to_end(key)
+                return issued
+            del self._entries[key]
+            return None
+
+    def _store(self, key: tuple[str, str], issued: IssuedToken) -> None:
+        with self._lock:
+            self._entries[key] = issued
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_mint(
+        self, service_id: str, scope: str, mint: Callable[[], IssuedToken]
+    ) -> IssuedToken:
+        """Return a reusable token for the service and scope, or the one ``mint()`` returns."""
+        if not self.enabled:
+            self.counters.incr('minted')
+            return mint()
+
+        key = (service_id, scope)
+        issued = self._reusable(key)
+        if issued is not None:
+            self.counters.incr('reused')
+            return issued
+
+        def load() -> IssuedToken:
+            # Another flight may have stored one between the check above and this one starting.
+            issued = self._reusable(key)
+            if issued is None:
+                issued = mint()
+                self._store(key, issued)
+                self.counters.incr('minted')
+            return issued
+
+        issued, shared = self._flights.do(key, load)
+        if shared:
+            self.counters.incr('coalesced')
+        return issued
+
+    def discard_service(self, service_id: str) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == service_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, int]:
+        """Return reused/minted/coalesced counters and the number of cached tokens."""
+        return (
+            {'reused': 0, 'minted': 0, 'coalesced': 0}
+            | self.counters.snapshot()
+            | {'size': len(self._entries)}
+        )
+
+
+service_token_cache = ServiceTokenCache()
@@ -0,0 +1,197 @@
+"""
+Entitlement and account change tracking.
+
+Every write that can change a user's resolved roles or permissions ends up sending
+``entitlements_changed`` with the affected user ids. Row-level writes are picked up from the
+model ``post_save``/``post_delete`` signals below; bulk write paths that bypass model signals
+(``bulk_create``, ``QuerySet.update``) must send ``entitlements_changed`` themselves. Writes
+made inside ``batched_entitlement_changes()`` send it once, at the end of the block.
+
+Changes to a user's status or staff flag revoke the user's access tokens (see ``revocation.py``).
+"""
+
+import threading
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from uuid import UUID
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete
+from django.dispatch import Signal, receiver
+
+from .claims_cache import bump_entitlement_version
+from .models import (
+    Permission,
+    Role,
+    RolePermission,
+    User,
+    UserGlobalPermission,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+from .permission_index import bump_index_version
+from .revocation import revoke_tokens
+from .service_tokens import service_token_cache
+from .snapshots import refresh_snapshots
+
+# Sent with ``user_ids``: a set of ids whose entitlements may have changed.
+entitlements_changed = Signal()
+
+# Users whose hard delete is in progress in this thread; their cascaded grant deletions must not
+# recreate the snapshot row that is being deleted alongside them.
+_deleting = threading.local()
+
+# Ids collected by the innermost ``batched_entitlement_changes`` block of this thread.
+_batch = threading.local()
+
+USER_GRANT_MODELS = (
+    UserGlobalPermission,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+
+
+def notify_entitlements_changed(sender: type, user_ids: Iterable[UUID | str]) -> None:
+    """Send ``entitlements_changed`` for the given users, if there are any."""
+    ids = set(user_ids) - getattr(_deleting, 'user_ids', set())
+    pending = getattr(_batch, 'user_ids', None)
+    if pending is not None:
+        pending |= ids
+    elif ids:
+        entitlements_changed.send(sender=sender, user_ids=ids)
+
+
+@contextmanager
+def batched_entitlement_changes(sender: type) -> Iterator[None]:
+    """
+    Send one ``entitlements_changed`` for all the changes made in the block, when it exits.
+
+    Saves a snapshot refresh per row for writes that go through model signals, such as
+    ``QuerySet.delete()``. Nothing is sent if the block raises.
+    """
+    if getattr(_batch, 'user_ids', None) is not None:
+        yield
+        return
+
+    _batch.user_ids = set()
+    try:
+        yield
+        user_ids = _batch.user_ids
+    finally:
+        _batch.user_ids = None
+    notify_entitlements_changed(sender, user_ids)
+
+
+def users_with_roles(role_ids: Iterable[UUID | str]) -> set[UUID]:
+    """Return ids of users holding any of the roles, globally or in a service."""
+    role_ids = list(role_ids)
+    global_holders = UserGlobalRole.objects.filter(role_id__in=role_ids).values_list('user_id')
+    service_holders = UserServiceRole.objects.filter(role_id__in=role_ids).values_list('user_id')
+    return {uid for (uid,) in global_holders.union(service_holders)}
+
+
+def users_with_permissions(permission_ids: Iterable[UUID | str]) -> set[UUID]:
+    """Return ids of users granted any of the permissions, directly or through a role."""
+    permission_ids = list(permission_ids)
+    direct = UserGlobalPermission.objects.filter(permission_id__in=permission_ids).values_list(
+        'user_id'
+    )
+    direct_service = UserServicePermission.objects.filter(
+        permission_id__in=permission_ids
+    ).values_list('user_id')
+    role_ids = RolePermission.objects.filter(permission_id__in=permission_ids).values_list(
+        'role_id', flat=True
+    )
+    return {uid for (uid,) in direct.union(direct_service)} | users_with_roles(role_ids)
+
+
+@receiver(pre_delete, sender=User)
+def _user_deleting(sender: type, instance: User, **kwargs) -> None:
+    if not hasattr(_deleting, 'user_ids'):
+        _deleting.user_ids = set()
+    _deleting.user_ids.add(instance.id)
+
+
+@receiver(post_delete, sender=User)
+def _user_deleted(sender: type, instance: User, **kwargs) -> None:
+    getattr(_deleting, 'user_ids', set()).discard(instance.id)
+    revoke_tokens([instance.id])
+
+
+# Fields carried as token claims that stateless authentication trusts.
+ACCOUNT_STATE_FIELDS = ('status', 'is_staff', 'is_active')
+
+
+def _account_state(user: User) -> tuple:
+    return tuple(getattr(user, name) for name in ACCOUNT_STATE_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def _user_loaded(sender: type, instance: User, **kwargs) -> None:
+    instance._saved_account_state = _account_state(instance)  # type: ignore[attr-defined]
+
+
+@receiver(post_save, sender=User)
+def _user_saved(sender: type, instance: User, created: bool, **kwargs) -> None:
+    state = _account_state(instance)
+    if not created and state != instance._saved_account_state:  # type: ignore[attr-defined]
+        revoke_tokens([instance.id])
+    instance._saved_account_state = state  # type: ignore[attr-defined]
+
+
+@receiver(entitlements_changed)
+def _refresh_snapshots(sender: type, user_ids: set[UUID | str], **kwargs) -> None:
+    refresh_snapshots(user_ids)
+
+
+@receiver(entitlements_changed)
+def _bump_versions(sender: type, user_ids: set[UUID | str], **kwargs) -> None:
+    # Only once the refreshed snapshots are committed: a reader that sees the new version before
+    # then would load the old snapshot and cache it under that version.
+    ids = set(user_ids)
+    transaction.on_commit(lambda: bump_entitlement_version(ids))
+
+
+def _user_grant_changed(sender: type, instance, **kwargs) -> None:
+    notify_entitlements_changed(sender, [instance.user_id])
+
+
+for _model in USER_GRANT_MODELS:
+    post_save.connect(_user_grant_changed, sender=_model, dispatch_uid=f'{_model.__name__}_save')
+    post_delete.connect(
+        _user_grant_changed, sender=_model, dispatch_uid=f'{_model.__name__}_delete'
+    )
+
+
+@receiver(post_save, sender=RolePermission)
+@receiver(post_delete, sender=RolePermission)
+def _role_permission_changed(sender: type, instance: RolePermission, **kwargs) -> None:
+    # Fan out to every holder of the role.
+    notify_entitlements_changed(sender, users_with_roles([instance.role_id]))
+
+
+@receiver(post_save, sender=Role)
+def _role_saved(sender: type, instance: Role, created: bool, **kwargs) -> None:
+    # Role names are embedded in claims, so a rename affects every holder.
+    if not created:
+        notify_entitlements_changed(sender, users_with_roles([instance.id]))
+
+
+@receiver(post_save, sender=Permission)
+def _permission_saved(sender: type, instance: Permission, created: bool, **kwargs) -> None:
+    # Permission codes are embedded in claims, so a code change affects every grantee.
+    if not created:
+        notify_entitlements_changed(sender, users_with_permissions([instance.id]))
+
+
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def _permission_index_changed(sender: type, instance: Permission, **kwargs) -> None:
+    if instance.type == Permission.TYPE_SERVICE and instance.service_id:
+        bump_index_version([instance.service_id])
+        # Reused service tokens may carry the old code in their scope.
+        service_token_cache.discard_service(str(instance.service_id))
@@ -0,0 +1,296 @@
+"""
+Asymmetric JWT signing keys, rotation and JWKS publication.
+
+Keys are stored as ``SigningKey`` rows and identified by ``kid`` (the RFC 7638 thumbprint of the
+public key). When an ``ACTIVE`` key exists, tokens are signed with it and carry its ``kid`` in
+the header; otherwise the shared ``NINJA_JWT['SIGNING_KEY']`` (HS256) is used as before. Tokens
+are verified with the key named by their ``kid``, so every non-retired key keeps verifying the
+tokens it signed. Tokens without a ``kid`` are verified with the shared secret unless
+``JWT_VERIFY_SHARED_SECRET`` is disabled.
+
+Each process holds the parsed keys in ``key_ring`` and reloads them every
+``JWT_KEY_RING_REFRESH_SECONDS``. Publish a new key (``VERIFY_ONLY``) at least that long, plus the
+JWKS ``max-age``, before activating it, so every process and client knows it when the first token
+signed with it shows up.
+"""
+
+import base64
+import hashlib
+import json
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import jwt
+from asgiref.sync import sync_to_async
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from django.conf import settings
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from jwt import InvalidTokenError
+from ninja_jwt.backends import TokenBackend
+from ninja_jwt.exceptions import TokenBackendError
+from ninja_jwt.settings import api_settings
+
+from .models import SigningKey
+
+ALGORITHMS = tuple(alg for alg, _label in SigningKey.ALGORITHM_CHOICES)
+
+DEFAULT_REFRESH_SECONDS = 60
+DEFAULT_JWKS_MAX_AGE_SECONDS = 300
+
+# Members that define a JWK's RFC 7638 thumbprint, per key type.
+_THUMBPRINT_MEMBERS = {
+    'RSA': ('e', 'kty', 'n'),
+    'EC': ('crv', 'kty', 'x', 'y'),
+    'OKP': ('crv', 'kty', 'x'),
+}
+
+
+def generate_private_key(algorithm: str) -> str:
+    """Generate a new private key for ``algorithm`` and return it PEM encoded."""
+    if algorithm == SigningKey.ALG_RS256:
+        key: Any = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    elif algorithm == SigningKey.ALG_ES256:
+        key = ec.generate_private_key(ec.SECP256R1())
+    elif algorithm == SigningKey.ALG_EDDSA:
+        key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        raise ValueError(f'Unsupported signing algorithm: {algorithm}')
+
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+
+
+def public_key_pem(private_key: str) -> str:
+    """Return the PEM encoded public key of a PEM encoded private key."""
+    key = serialization.load_pem_private_key(private_key.encode(), password=None)
+    return (
+        key.public_key()
+        .public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        .decode()
+    )
+
+
+def _public_jwk(algorithm: str, public_key: Any) -> dict[str, Any]:
+    return jwt.get_algorithm_by_name(algorithm).to_jwk(public_key, as_dict=True)
+
+
+def key_id(algorithm: str, public_key: str) -> str:
+    """Return the RFC 7638 JWK thumbprint of a PEM encoded public key."""
+    jwk = _public_jwk(algorithm, serialization.load_pem_public_key(public_key.encode()))
+    members = {name: jwk[name] for name in _THUMBPRINT_MEMBERS[jwk['kty']]}
+    digest = hashlib.sha256(json.dumps(members, separators=(',', ':')).encode()).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b'=').decode()
+
+
+@dataclass(frozen=True, slots=True)
+class LoadedKey:
+    kid: str
+    algorithm: str
+    public_key: Any
+    private_key: Any = None
+
+
+@dataclass(frozen=True, slots=True)
+class KeySet:
+    """Parsed non-retired keys, plus the JWKS document that publishes them."""
+
+    active: LoadedKey | None = None
+    keys: dict[str, LoadedKey] = field(default_factory=dict)
+    jwks: bytes = b'{"keys":[]}'
+    etag: str = ''
+
+
+def _load_key_set() -> KeySet:
+    rows = SigningKey.objects.exclude(state=SigningKey.STATE_RETIRED).order_by(
+        'state', '-created_at'
+    )
+    active = None
+    keys: dict[str, LoadedKey] = {}
+    published = []
+    for row in rows:
+        private_key = None
+        if row.state == SigningKey.STATE_ACTIVE:
+            private_key = serialization.load_pem_private_key(row.private_key.encode(), None)
+        loaded = LoadedKey(
+            kid=row.kid,
+            algorithm=row.algorithm,
+            public_key=serialization.load_pem_public_key(row.public_key.encode()),
+            private_key=private_key,
+        )
+        keys[row.kid] = loaded
+        if private_key is not None:
+            active = loaded
+        published.append(
+            _public_jwk(row.algorithm, loaded.public_key)
+            | {'kid': row.kid, 'alg': row.algorithm, 'use': 'sig'}
+        )
+
+    document = json.dumps({'keys': published}, sort_keys=True, separators=(',', ':')).encode()
+    etag = f'"{hashlib.sha256(document).hexdigest()[:32]}"'
+    return KeySet(active=active, keys=keys, jwks=document, etag=etag)
+
+
+class KeyRing:
+    """Per-process view of the signing keys, reloaded every ``JWT_KEY_RING_REFRESH_SECONDS``."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._key_set: KeySet | None = None
+        self._loaded_at = 0.0
+
+    @property
+    def refresh_interval(self) -> float:
+        return getattr(settings, 'JWT_KEY_RING_REFRESH_SECONDS', DEFAULT_REFRESH_SECONDS)
+
+    def get(self) -> KeySet:
+        """Return the current key set, reloading it when it is older than the refresh interval."""
+        now = self._clock()
+        key_set = self._key_set
+        if key_set is not None and now - self._loaded_at < self.refresh_interval:
+            return key_set
+
+        with self._lock:
+            if self._key_set is None or now - self._loaded_at >= self.refresh_interval:
+                self._key_set = _load_key_set()
+                self._loaded_at = now
+            return self._key_set
+
+    async def aget(self) -> KeySet:
+        """Async ``get``: reloads in a worker thread, and only when the key set is stale."""
+        key_set = self._key_set
+        if key_set is not None and self._clock() - self._loaded_at < self.refresh_interval:
+            return key_set
+        return await sync_to_async(self.get)()
+
+    def invalidate(self) -> None:
+        """Force a reload on next use (changes made by other processes are picked up on refresh)."""
+        with self._lock:
+            self._key_set = None
+
+
+key_ring = KeyRing()
+
+
+class KeyRingTokenBackend(TokenBackend):
+    """``TokenBackend`` that signs with the active ``SigningKey`` and verifies by ``kid``."""
+
+    def encode(self, payload: dict) -> str:
+        active = key_ring.get().active
+        if active is None:
+            return super().encode(payload)
+
+        jwt_payload = payload.copy()
+        if self.audience is not None:
+            jwt_payload['aud'] = self.audience
+        if self.issuer is not None:
+            jwt_payload['iss'] = self.issuer
+
+        return jwt.encode(
+            jwt_payload,
+            active.private_key,
+            algorithm=active.algorithm,
+            headers={'kid': active.kid},
+            json_encoder=self.json_encoder,
+        )
+
+    def decode(self, token, verify=True) -> dict[str, Any]:
+        try:
+            kid = jwt.get_unverified_header(token).get('kid')
+        except InvalidTokenError as ex:
+            raise TokenBackendError(_('Token is invalid or expired')) from ex
+
+        if kid is None:
+            if not getattr(settings, 'JWT_VERIFY_SHARED_SECRET', True):
+                raise TokenBackendError(_('Token is invalid or expired'))
+            return super().decode(token, verify=verify)
+
+        key = key_ring.get().keys.get(kid)
+        if key is None:
+            raise TokenBackendError(_('Token is invalid or expired'))
+
+        try:
+            return jwt.decode(
+                token,
+                key.public_key,
+                algorithms=[key.algorithm],
+                audience=self.audience,
+                issuer=self.issuer,
+                leeway=self.get_leeway(),
+                options={
+                    'verify_aud': self.audience is not None,
+                    'verify_signature': verify,
+                },
+            )
+        except InvalidTokenError as ex:
+            raise TokenBackendError(_('Token is invalid or expired')) from ex
+
+
+token_backend = KeyRingTokenBackend(
+    api_settings.ALGORITHM,
+    api_settings.SIGNING_KEY,
+    api_settings.VERIFYING_KEY,
+    api_settings.AUDIENCE,
+    api_settings.ISSUER,
+    api_settings.JWK_URL,
+    api_settings.LEEWAY,
+    api_settings.JSON_ENCODER,
+)
+
+
+def create_signing_key(algorithm: str, activate: bool = False) -> SigningKey:
+    """Generate and store a new key, published for verification (or made active right away)."""
+    private_key = generate_private_key(algorithm)
+    public_key = public_key_pem(private_key)
+    key = SigningKey.objects.create(
+        kid=key_id(algorithm, public_key),
+        algorithm=algorithm,
+        private_key=private_key,
+        public_key=public_key,
+    )
+    if activate:
+        key = activate_signing_key(key.kid)
+    key_ring.invalidate()
+    return key
+
+
+def activate_signing_key(kid: str) -> SigningKey:
+    """Make ``kid`` the signing key; the previously active key stays valid for verification."""
+    with transaction.atomic():
+        key = SigningKey.objects.select_for_update().get(kid=kid)
+        if key.state == SigningKey.STATE_RETIRED:
+            raise ValueError(f'Signing key {kid} is retired.')
+        if not key.private_key:
+            raise ValueError(f'Signing key {kid} has no private key.')
+
+        SigningKey.objects.filter(state=SigningKey.STATE_ACTIVE).exclude(kid=kid).update(
+            state=SigningKey.STATE_VERIFY_ONLY
+        )
+        key.state = SigningKey.STATE_ACTIVE
+        key.save(update_fields=['state', 'updated_at'])
+
+    key_ring.invalidate()
+    return key
+
+
+def retire_signing_key(kid: str) -> SigningKey:
+    """Stop accepting tokens signed with ``kid`` and remove it from the JWKS."""
+    key = SigningKey.objects.get(kid=kid)
+    if key.state == SigningKey.STATE_ACTIVE:
+        raise ValueError(f'Signing key {kid} is active; activate another key first.')
+
+    key.state = SigningKey.STATE_RETIRED
+    key.save(update_fields=['state', 'updated_at'])
+    key_ring.invalidate()
+    return key
@@ -0,0 +1,73 @@
+"""
+Single-flight execution: concurrent calls with the same key share one execution.
+
+The first caller for a key runs the function; callers arriving while it runs wait for and share
+its result (or exception) instead of repeating the work. Threads use ``do`` and coroutines
+``ado``; both share the same flights, and waiting coroutines do not block their event loop.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Hashable
+from concurrent.futures import Future
+from typing import Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, Future] = {}
+
+    def _join(self, key: Hashable) -> tuple[Future, bool]:
+        """Return the flight for ``key`` and whether the caller leads it."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = Future()
+            return call, True
+
+    def _land(self, key: Hashable) -> None:
+        with self._lock:
+            del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> tuple[T, bool]:
+        """Return ``fn()``'s result and whether it was shared from another caller's execution."""
+        call, leader = self._join(key)
+        if not leader:
+            return call.result(), True
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            self._land(key)
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """Async ``do``: awaits ``fn()``, or the flight already running for ``key``."""
+        call, leader = self._join(key)
+        if not leader:
+            # Shielded: a cancelled waiter must not cancel the flight for everyone else.
+            return await asyncio.shield(asyncio.wrap_future(call)), True
+
+        try:
+            result = await fn()
+        except BaseException as exc:
+            call.set_exception(exc)
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            self._land(key)
+
+    def __len__(self) -> int:
+        """Number of keys currently in flight."""
+        return len(self._calls)
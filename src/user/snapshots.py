@@ -0,0 +1,131 @@
+"""
+Materialized entitlement snapshots.
+
+``UserEntitlementSnapshot`` stores each user's resolved entitlement claims so that minting a token
+is a single primary-key read. Snapshots are refreshed incrementally from the model signals in
+``signals.py`` and can be rebuilt or verified in bulk with
+``manage.py entitlement_snapshots``.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from typing import Any
+from uuid import UUID
+
+from .entitlements import resolve_entitlements_bulk
+from .models import User, UserEntitlementSnapshot
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Claim carrying a short form of the snapshot fingerprint, so a token can be checked against the
+# user's current entitlements without resolving them.
+ENTITLEMENT_FINGERPRINT_CLAIM = 'efp'
+
+
+def fingerprint_claims(claims: dict[str, Any]) -> str:
+    """Return a stable SHA-256 hex digest of entitlement claims."""
+    canonical = json.dumps(claims, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def short_fingerprint(fingerprint: str) -> str:
+    """Return the prefix of a snapshot fingerprint that is embedded in tokens."""
+    return fingerprint[:16]
+
+
+def refresh_snapshots(user_ids: Iterable[UUID | str]) -> list[UserEntitlementSnapshot]:
+    """
+    Re-resolve and store snapshots for the given users.
+
+    Ids of users that no longer exist are skipped. Costs a constant number of queries per call,
+    so pass ids in batches rather than one at a time.
+    """
+    ids = list(User.objects.filter(id__in=list(user_ids)).values_list('id', flat=True))
+    if not ids:
+        return []
+
+    snapshots = []
+    for uid, entitlements in resolve_entitlements_bulk(ids).items():
+        claims = entitlements.to_claims()
+        snapshots.append(
+            UserEntitlementSnapshot(
+                user_id=uid, claims=claims, fingerprint=fingerprint_claims(claims)
+            )
+        )
+
+    return UserEntitlementSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['claims', 'fingerprint', 'updated_at'],
+    )
+
+
+def get_claims(user_id: UUID | str) -> dict[str, Any]:
+    """
+    Return the entitlement claims for a user, including ``ENTITLEMENT_FINGERPRINT_CLAIM``.
+
+    A single primary-key read when the snapshot exists; otherwise the snapshot is built first.
+    """
+    row = (
+        UserEntitlementSnapshot.objects.filter(pk=user_id)
+        .values_list('claims', 'fingerprint')
+        .first()
+    )
+    if row is None:
+        snapshots = refresh_snapshots([user_id])
+        if not snapshots:
+            return {}
+        row = (snapshots[0].claims, snapshots[0].fingerprint)
+
+    claims, fingerprint = row
+    return claims | {ENTITLEMENT_FINGERPRINT_CLAIM: short_fingerprint(fingerprint)}
+
+
+def _batched_user_ids(batch_size: int) -> Iterator[list[UUID]]:
+    batch: list[UUID] = []
+    for uid in User.objects.order_by('id').values_list('id', flat=True).iterator(batch_size):
+        batch.append(uid)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rebuild_all(batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Rebuild the snapshot of every user. Returns the number of snapshots written."""
+    return sum(len(refresh_snapshots(batch)) for batch in _batched_user_ids(batch_size))
+
+
+@dataclass(slots=True)
+class VerifyResult:
+    checked: int = 0
+    missing: int = 0
+    stale: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return not (self.missing or self.stale)
+
+
+def verify_all(batch_size: int = DEFAULT_BATCH_SIZE) -> VerifyResult:
+    """Compare stored snapshots with freshly resolved entitlements without writing anything."""
+    result = VerifyResult()
+    for batch in _batched_user_ids(batch_size):
+        stored = dict(
+            UserEntitlementSnapshot.objects.filter(user_id__in=batch).values_list(
+                'user_id', 'fingerprint'
+            )
+        )
+        stored = {str(uid): fp for uid, fp in stored.items()}
+        for uid, entitlements in resolve_entitlements_bulk(batch).items():
+            result.checked += 1
+            if uid not in stored:
+                result.missing += 1
+            elif stored[uid] != fingerprint_claims(entitlements.to_claims()):
+                result.stale += 1
+
+    return result
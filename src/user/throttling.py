@@ -0,0 +1,240 @@
+"""
+Login throttling with token buckets keyed by client IP and by normalized email.
+
+Every login attempt takes a token from the bucket of its IP and of its email; an attempt finding
+either bucket empty is rejected before any user lookup or password hashing. A successful login
+refills the email's bucket and returns the IP's token, so only failed attempts accumulate.
+
+Buckets are kept in process memory (``LOGIN_THROTTLE_BACKEND = 'memory'``, per worker) or in the
+default Django cache (``'cache'``, shared between workers; updates are not atomic, so concurrent
+attempts may slightly overshoot a limit). Limits come from the ``LOGIN_THROTTLE_*`` settings.
+"""
+
+import hashlib
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest
+
+from .metrics import Counters
+from .models import normalized_email
+
+DEFAULT_MAX_KEYS = 100_000
+
+
+@dataclass(frozen=True, slots=True)
+class BucketLimit:
+    capacity: float
+    refill_per_second: float
+
+
+class BucketStore(ABC):
+    """Token bucket state; subclasses provide storage of ``(tokens, updated_at)`` per key."""
+
+    def __init__(self, clock: Callable[[], float]) -> None:
+        self._clock = clock
+
+    def _locked(self) -> AbstractContextManager:
+        return nullcontext()
+
+    @abstractmethod
+    def _load(self, key: str) -> tuple[float, float] | None: ...
+
+    @abstractmethod
+    def _save(self, key: str, state: tuple[float, float], limit: BucketLimit) -> None: ...
+
+    @abstractmethod
+    def _delete(self, key: str) -> None: ...
+
+    def _tokens(self, key: str, limit: BucketLimit, now: float) -> float:
+        state = self._load(key)
+        if state is None:
+            return limit.capacity
+        tokens, updated_at = state
+        return min(limit.capacity, tokens + (now - updated_at) * limit.refill_per_second)
+
+    def take(self, key: str, limit: BucketLimit) -> float:
+        """Take a token. Returns ``0`` if one was available, else the seconds until there is one."""
+        now = self._clock()
+        with self._locked():
+            tokens = self._tokens(key, limit, now)
+            if tokens >= 1:
+                self._save(key, (tokens - 1, now), limit)
+                return 0.0
+            self._save(key, (tokens, now), limit)
+        return (1 - tokens) / limit.refill_per_second
+
+    def give(self, key: str, limit: BucketLimit, amount: float) -> None:
+        """Return ``amount`` tokens to a bucket (a full bucket is forgotten)."""
+        now = self._clock()
+        with self._locked():
+            tokens = min(limit.capacity, self._tokens(key, limit, now) + amount)
+            if tokens >= limit.capacity:
+                self._delete(key)
+            else:
+                self._save(key, (tokens, now), limit)
+
+    def reset(self, key: str) -> None:
+        with self._locked():
+            self._delete(key)
+
+
+class InMemoryBucketStore(BucketStore):
+    """Per-process buckets; the least recently used are dropped beyond ``max_keys``."""
+
+    def __init__(
+        self, clock: Callable[[], float] = time.monotonic, max_keys: int = DEFAULT_MAX_KEYS
+    ) -> None:
+        super().__init__(clock)
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def _locked(self) -> AbstractContextManager:
+        return self._lock
+
+    def _load(self, key: str) -> tuple[float, float] | None:
+        return self._buckets.get(key)
+
+    def _save(self, key: str, state: tuple[float, float], limit: BucketLimit) -> None:
+        self._buckets[key] = state
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def _delete(self, key: str) -> None:
+        self._buckets.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBucketStore(BucketStore):
+    """Buckets in the default Django cache, shared by every process using that cache."""
+
+    KEY_PREFIX = 'login-throttle:'
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        super().__init__(clock)
+
+    def _load(self, key: str) -> tuple[float, float] | None:
+        return cache.get(self.KEY_PREFIX + key)
+
+    def _save(self, key: str, state: tuple[float, float], limit: BucketLimit) -> None:
+        # Expire once the bucket would be full again anyway.
+        timeout = int((limit.capacity - state[0]) / limit.refill_per_second) + 1
+        cache.set(self.KEY_PREFIX + key, state, timeout=timeout)
+
+    def _delete(self, key: str) -> None:
+        cache.delete(self.KEY_PREFIX + key)
+
+
+def client_ip(request: HttpRequest) -> str:
+    """
+    Return the client address.
+
+    Behind ``LOGIN_THROTTLE_NUM_PROXIES`` trusted proxies, it is taken from ``X-Forwarded-For``.
+    """
+    num_proxies = getattr(settings, 'LOGIN_THROTTLE_NUM_PROXIES', 0)
+    forwarded = request.META.get('HTTP_X_FORWARDED_FOR')
+    if num_proxies > 0 and forwarded:
+        addresses = [address.strip() for address in forwarded.split(',')]
+        return addresses[-min(num_proxies, len(addresses))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+class LoginThrottle:
+    """Token-bucket limits on login attempts per client IP and per email."""
+
+    def __init__(self, store: BucketStore | None = None) -> None:
+        self._store = store
+        self._default_stores: dict[str, BucketStore] = {}
+        self.counters = Counters('login_throttle')
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, 'LOGIN_THROTTLE_ENABLED', True)
+
+    @property
+    def store(self) -> BucketStore:
+        if self._store is not None:
+            return self._store
+        backend = getattr(settings, 'LOGIN_THROTTLE_BACKEND', 'memory')
+        if backend not in self._default_stores:
+            self._default_stores[backend] = (
+                CacheBucketStore() if backend == 'cache' else InMemoryBucketStore()
+            )
+        return self._default_stores[backend]
+
+    @property
+    def ip_limit(self) -> BucketLimit:
+        return BucketLimit(
+            capacity=settings.LOGIN_THROTTLE_IP_BURST,
+            refill_per_second=settings.LOGIN_THROTTLE_IP_PER_MINUTE / 60,
+        )
+
+    @property
+    def email_limit(self) -> BucketLimit:
+        return BucketLimit(
+            capacity=settings.LOGIN_THROTTLE_EMAIL_BURST,
+            refill_per_second=settings.LOGIN_THROTTLE_EMAIL_PER_MINUTE / 60,
+        )
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return f'ip:{ip}'
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        # Hashed so arbitrary input makes a valid cache key.
+        return f'email:{hashlib.sha256(normalized_email(email).encode()).hexdigest()[:32]}'
+
+    def check(self, ip: str, email: str) -> float | None:
+        """Record a login attempt. Returns the seconds to wait if it must be rejected."""
+        if not self.enabled:
+            return None
+
+        wait = self.store.take(self._ip_key(ip), self.ip_limit)
+        if wait:
+            self.counters.incr('rejected_ip')
+            return wait
+
+        wait = self.store.take(self._email_key(email), self.email_limit)
+        if wait:
+            self.counters.incr('rejected_email')
+            return wait
+
+        self.counters.incr('allowed')
+        return None
+
+    def succeeded(self, ip: str, email: str) -> None:
+        """Forgive the attempt of a successful login and the email's earlier failures."""
+        if not self.enabled:
+            return
+
+        self.store.reset(self._email_key(email))
+        self.store.give(self._ip_key(ip), self.ip_limit, 1)
+        self.counters.incr('succeeded')
+
+    def clear(self) -> None:
+        self._default_stores.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return allowed/rejected/succeeded attempt counters."""
+        return {
+            'allowed': 0,
+            'rejected_ip': 0,
+            'rejected_email': 0,
+            'succeeded': 0,
+        } | self.counters.snapshot()
+
+
+login_throttle = LoginThrottle()
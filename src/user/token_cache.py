@@ -0,0 +1,128 @@
+"""
+In-process cache of verified access tokens.
+
+Maps a digest of the raw bearer token to its validated payload and the user it authenticated, so
+repeated requests with the same token skip decoding, signature verification and the user lookup.
+An entry lives until the token's ``exp`` or ``AUTH_TOKEN_CACHE_MAX_AGE_SECONDS``, whichever comes
+first; the cache holds at most ``AUTH_TOKEN_CACHE_MAX_ENTRIES`` entries (least recently used are
+evicted first; ``0`` disables it).
+
+Entries of a user are dropped when the user's tokens are revoked (see ``revocation.py``); hits are
+also checked against the revocation epochs, so revocations made by other processes apply here
+too.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+from django.conf import settings
+
+from .metrics import Counters
+
+DEFAULT_MAX_ENTRIES = 0
+DEFAULT_MAX_AGE_SECONDS = 60
+
+
+def _digest(raw_token: str) -> bytes:
+    return hashlib.sha256(raw_token.encode()).digest()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of ``(validated token, user)`` keyed by raw token digest."""
+
+    def __init__(self, clock: Callable[[], float] = time.time) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        # digest -> (expires_at, user id, validated token, user)
+        self._entries: OrderedDict[bytes, tuple[float, str, Any, Any]] = OrderedDict()
+        # user id -> digests of that user's cached tokens
+        self._by_user: dict[str, set[bytes]] = {}
+        self.counters = Counters('token_cache')
+
+    @property
+    def max_entries(self) -> int:
+        return getattr(settings, 'AUTH_TOKEN_CACHE_MAX_ENTRIES', DEFAULT_MAX_ENTRIES)
+
+    @property
+    def max_age(self) -> float:
+        return getattr(settings, 'AUTH_TOKEN_CACHE_MAX_AGE_SECONDS', DEFAULT_MAX_AGE_SECONDS)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, digest: bytes) -> None:
+        # Caller holds the lock.
+        _expires_at, user_id, _token, _user = self._entries.pop(digest)
+        digests = self._by_user.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[user_id]
+
+    def get(self, raw_token: str) -> tuple[Any, Any] | None:
+        """Return ``(validated token, user)`` for a cached, unexpired token."""
+        if not self.enabled:
+            return None
+
+        digest = _digest(raw_token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.counters.incr('misses')
+                return None
+            if entry[0] <= self._clock():
+                self._remove(digest)
+                self.counters.incr('expired')
+                self.counters.incr('misses')
+                return None
+            self._entries.move_to_end(digest)
+            self.counters.incr('hits')
+            return entry[2], entry[3]
+
+    def put(self, raw_token: str, validated_token: Any, user: Any) -> None:
+        if not self.enabled:
+            return
+
+        expires_at = min(float(validated_token['exp']), self._clock() + self.max_age)
+        digest = _digest(raw_token)
+        user_id = str(user.id)
+        with self._lock:
+            if digest in self._entries:
+                self._remove(digest)
+            self._entries[digest] = (expires_at, user_id, validated_token, user)
+            self._by_user.setdefault(user_id, set()).add(digest)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.counters.incr('evictions')
+
+    def discard_user(self, user_id: UUID | str) -> None:
+        """Drop every cached token of the user."""
+        with self._lock:
+            for digest in list(self._by_user.get(str(user_id), ())):
+                self._remove(digest)
+                self.counters.incr('invalidations')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction/expiry/invalidation counters and the current size."""
+        return (
+            {'hits': 0, 'misses': 0, 'evictions': 0, 'expired': 0, 'invalidations': 0}
+            | self.counters.snapshot()
+            | {'size': len(self._entries)}
+        )
+
+
+token_cache = VerifiedTokenCache()
@@ -1,96 +1,178 @@
+from datetime import datetime, timedelta
 from typing import Any
+from uuid import UUID
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from ninja_jwt.tokens import Token
 
-from .models import (
-    RolePermission,
-    User,
-    UserGlobalPermission,
-    UserGlobalRole,
-    UserServiceAssignment,
-    UserServicePermission,
-    UserServiceRole,
+from .claims_cache import claims_cache
+from .metrics import Counters
+from .models import Service, User
+from .permission_index import CLAIMS_FORMAT_COMPACT, CLAIMS_FORMAT_FULL, compact_claims
+from .signing_keys import token_backend
+from .singleflight import SingleFlight
+from .snapshots import ENTITLEMENT_FINGERPRINT_CLAIM, get_claims
+
+AUDIENCE_CLAIM = 'aud'
+CLAIMS_FORMAT_CLAIM = 'claims_format'
+# Account state carried by access tokens, trusted by stateless authentication.
+STATUS_CLAIM = 'status'
+STAFF_CLAIM = 'is_staff'
+# Claims of service tokens (client-credentials grant).
+CLIENT_ID_CLAIM = 'client_id'
+SCOPE_CLAIM = 'scope'
+ENTITLEMENT_CLAIMS = (
+    'global_permissions',
+    'global_roles',
+    'services',
+    ENTITLEMENT_FINGERPRINT_CLAIM,
 )
 
 
-class CustomAccessToken(Token):
+def scope_claims(claims: dict[str, Any], service_id: str) -> dict[str, Any]:
+    """Return a copy of entitlement claims whose ``services`` only contains ``service_id``."""
+    services = claims.get('services', {})
+    return claims | {
+        'services': {service_id: services[service_id]} if service_id in services else {}
+    }
+
+
+# Concurrent resolutions for the same user (e.g. many tabs refreshing at once) share one load.
+_resolutions: SingleFlight[dict[str, Any]] = SingleFlight()
+resolution_counters = Counters('entitlement_resolutions')
+
+
+def _load_claims(user_id: UUID | str) -> dict[str, Any]:
+    resolution_counters.incr('resolved')
+    return claims_cache.get_or_load(user_id, lambda: get_claims(user_id))
+
+
+def resolve_claims(user_id: UUID | str) -> dict[str, Any]:
+    """Return the user's current (unscoped) entitlement claims, coalescing concurrent calls."""
+    claims, shared = _resolutions.do(str(user_id), lambda: _load_claims(user_id))
+    if shared:
+        resolution_counters.incr('coalesced')
+    return claims
+
+
+async def aresolve_claims(user_id: UUID | str) -> dict[str, Any]:
+    """Async ``resolve_claims``; shares flights with threads calling ``resolve_claims``."""
+    claims, shared = await _resolutions.ado(
+        str(user_id), lambda: sync_to_async(_load_claims)(user_id)
+    )
+    if shared:
+        resolution_counters.incr('coalesced')
+    return claims
+
+
+def entitlement_claims(
+    user: User, audience: Service | None = None, claims: dict[str, Any] | None = None
+) -> dict[str, Any]:
+    """
+    Return the user's current entitlement claims, scoped to ``audience`` if given.
+
+    Cached, and a single snapshot read on a miss; ``claims`` passes in an already resolved result.
+    """
+    if claims is None:
+        claims = resolve_claims(user.id)
+    if audience is not None:
+        claims = scope_claims(claims, str(audience.id))
+    return claims
+
+
+class SettingsLifetimeToken(Token):
+    """
+    Token whose lifetime is read from ``settings.NINJA_JWT[lifetime_setting]``.
+
+    Signed and verified through the key ring (see ``signing_keys.py``).
+    """
+
+    lifetime_setting: str
+
+    def get_token_backend(self):
+        return token_backend
+
+    @property
+    def lifetime(self) -> timedelta:  # type: ignore[override]
+        return settings.NINJA_JWT[self.lifetime_setting]  # type: ignore
+
+    @property
+    def entitlements(self) -> dict[str, Any]:
+        """Entitlement claims carried by this token."""
+        return {claim: self.payload[claim] for claim in ENTITLEMENT_CLAIMS if claim in self}
+
+    def set_entitlements(self, claims: dict[str, Any]) -> None:
+        for claim, value in claims.items():
+            self[claim] = value
+
+
+class CustomAccessToken(SettingsLifetimeToken):
     """Custom access token that includes permission and role claims."""
 
     token_type = 'access'
     lifetime_setting = 'ACCESS_TOKEN_LIFETIME'
 
+    def set_iat(self, claim: str = 'iat', at_time: datetime | None = None) -> None:
+        # Keep microseconds (a JWT NumericDate may be fractional) so ``iat`` can be compared with
+        # revocation epochs taken earlier in the same second (see ``revocation.py``).
+        if at_time is None:
+            at_time = self.current_time
+        self.payload[claim] = at_time.timestamp()
+
     @classmethod
-    def for_user(cls, user: User) -> 'CustomAccessToken':  # type: ignore[override]
+    def for_user(  # type: ignore[override]
+        cls,
+        user: User,
+        audience: Service | None = None,
+        claims_format: str = CLAIMS_FORMAT_FULL,
+    ) -> 'CustomAccessToken':
         """
         Create a token for the given user with custom claims.
 
-        Includes global_permissions, global_roles, and services data.
+        Includes global_permissions, global_roles, and services data. When ``audience`` is given,
+        ``services`` only contains that service and the token gets an ``aud`` claim. With the
+        compact ``claims_format``, service permissions are encoded as index bitmaps.
         """
+        return cls.for_user_with_claims(
+            user, entitlement_claims(user, audience), audience, claims_format
+        )
+
+    @classmethod
+    def for_user_with_claims(
+        cls,
+        user: User,
+        claims: dict[str, Any],
+        audience: Service | None = None,
+        claims_format: str = CLAIMS_FORMAT_FULL,
+    ) -> 'CustomAccessToken':
+        """Create a token for the given user from already resolved entitlement claims."""
         token = super().for_user(user)
 
-        # Add email to token
+        # Add email and account state to token
         token['email'] = user.email
+        token[STATUS_CLAIM] = user.status
+        token[STAFF_CLAIM] = user.is_staff
 
-        # Collect global permissions
-        global_perms: set[str] = set()
-        direct_global_perms = UserGlobalPermission.objects.filter(user=user).select_related(
-            'permission'
-        )
-        for ugp in direct_global_perms:
-            global_perms.add(ugp.permission.code)
-
-        # Collect global roles and their permissions
-        global_roles: list[str] = []
-        user_global_roles = UserGlobalRole.objects.filter(user=user).select_related('role')
-        for ugr in user_global_roles:
-            global_roles.append(ugr.role.name)
-            role_perms = RolePermission.objects.filter(role=ugr.role).select_related('permission')
-            for rp in role_perms:
-                global_perms.add(rp.permission.code)
-
-        # Collect service-specific data
-        services_data: dict[str, dict[str, Any]] = {}
-        assignments = UserServiceAssignment.objects.filter(user=user).select_related('service')
-
-        for assignment in assignments:
-            service_id = str(assignment.service.id)
-            service_perms: set[str] = set()
-            service_roles: list[str] = []
-
-            # Direct service permissions
-            direct_perms = UserServicePermission.objects.filter(
-                user=user, service=assignment.service
-            ).select_related('permission')
-            for usp in direct_perms:
-                service_perms.add(usp.permission.code)
-
-            # Service roles and their permissions
-            user_roles = UserServiceRole.objects.filter(
-                user=user, service=assignment.service
-            ).select_related('role')
-            for usr in user_roles:
-                service_roles.append(usr.role.name)
-                role_perms = RolePermission.objects.filter(role=usr.role).select_related(
-                    'permission'
-                )
-                for rp in role_perms:
-                    service_perms.add(rp.permission.code)
-
-            services_data[service_id] = {
-                'permissions': sorted(list(service_perms)),
-                'roles': service_roles,
-            }
+        if audience is not None:
+            token[AUDIENCE_CLAIM] = str(audience.id)
+        if claims_format == CLAIMS_FORMAT_COMPACT:
+            token[CLAIMS_FORMAT_CLAIM] = CLAIMS_FORMAT_COMPACT
+            claims = compact_claims(claims)
 
         # Add custom claims to token
-        token['global_permissions'] = sorted(list(global_perms))
-        token['global_roles'] = global_roles
-        token['services'] = services_data
+        token.set_entitlements(claims)
 
         return token  # type: ignore
 
 
-class CustomRefreshToken(Token):
-    """Custom refresh token."""
+class CustomRefreshToken(SettingsLifetimeToken):
+    """
+    Custom refresh token.
+
+    Carries the entitlement claims (always in the full format) and fingerprint that were current
+    when it was last signed, so a refresh can re-issue them while they are unchanged.
+    """
 
     token_type = 'refresh'
     lifetime_setting = 'REFRESH_TOKEN_LIFETIME'
@@ -99,6 +181,7 @@ class CustomRefreshToken(Token):
         'exp',
         'iat',
         'jti',
+        CLAIMS_FORMAT_CLAIM,
     )
 
     @property
@@ -115,9 +198,46 @@ class CustomRefreshToken(Token):
         return access
 
     @classmethod
-    def for_user(cls, user: User) -> 'CustomRefreshToken':  # type: ignore[override]
-        """Create a refresh token for the given user."""
+    def for_user(  # type: ignore[override]
+        cls,
+        user: User,
+        audience: Service | None = None,
+        claims_format: str = CLAIMS_FORMAT_FULL,
+    ) -> 'CustomRefreshToken':
+        """
+        Create a refresh token for the given user.
+
+        The audience and claims format are recorded so refreshed access tokens keep them.
+        """
         token = super().for_user(user)
         token['email'] = user.email
+        if audience is not None:
+            token[AUDIENCE_CLAIM] = str(audience.id)
+        if claims_format != CLAIMS_FORMAT_FULL:
+            token[CLAIMS_FORMAT_CLAIM] = claims_format
+        token.set_entitlements(entitlement_claims(user, audience))
 
         return token  # type: ignore
+
+
+class ServiceAccessToken(SettingsLifetimeToken):
+    """
+    Short-lived token issued to a service by the client-credentials grant.
+
+    ``sub`` is the service id and ``scope`` the granted permission codes of that service,
+    separated by spaces. Its ``token_type`` keeps it from authenticating as a user.
+    """
+
+    token_type = 'service'
+
+    @property
+    def lifetime(self) -> timedelta:  # type: ignore[override]
+        return timedelta(seconds=settings.SERVICE_TOKEN_LIFETIME_SECONDS)
+
+    @classmethod
+    def for_service(cls, service: Service, scopes: list[str]) -> 'ServiceAccessToken':
+        token = cls()
+        token['sub'] = str(service.id)
+        token[CLIENT_ID_CLAIM] = service.client_id
+        token[SCOPE_CLAIM] = ' '.join(scopes)
+        return token
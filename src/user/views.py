@@ -0,0 +1,22 @@
+"""Plain Django views served outside the Ninja API."""
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_safe
+
+from .signing_keys import DEFAULT_JWKS_MAX_AGE_SECONDS, key_ring
+
+
+@require_safe
+def jwks(request: HttpRequest) -> HttpResponse:
+    """Public keys for verifying tokens locally (``/.well-known/jwks.json``)."""
+    key_set = key_ring.get()
+    max_age = getattr(settings, 'JWKS_MAX_AGE_SECONDS', DEFAULT_JWKS_MAX_AGE_SECONDS)
+
+    response = get_conditional_response(request, etag=key_set.etag)
+    if response is None:
+        response = HttpResponse(key_set.jwks, content_type='application/json')
+    response['ETag'] = key_set.etag
+    patch_cache_control(response, public=True, max_age=max_age)
+    return response
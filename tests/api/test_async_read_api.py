@@ -0,0 +1,76 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from src.user.models import (
+    Permission,
+    Role,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture()
+def async_client():
+    from ninja.testing import TestAsyncClient
+
+    from src.user.api import api
+
+    return TestAsyncClient(api)
+
+
+def _get(client, path: str, headers: dict[str, str]):
+    return async_to_sync(client.get)(path, headers=headers)
+
+
+@pytest.mark.parametrize(
+    'path',
+    [
+        '/services/',
+        '/services/{service}',
+        '/services/{service}/roles',
+        '/services/{service}/permissions',
+        '/users/{user}',
+        '/users/{user}/services',
+    ],
+)
+def test_async_reads_match_sync_endpoints(
+    api_client,
+    async_client,
+    admin_headers,
+    regular_user: User,
+    service: Service,
+    service_role: Role,
+    service_permission: Permission,
+    path: str,
+):
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+    path = path.format(service=service.id, user=regular_user.id)
+
+    sync_response = api_client.get(path, headers=admin_headers)
+    async_response = _get(async_client, f'/async{path}', admin_headers)
+
+    assert sync_response.status_code == 200
+    assert async_response.status_code == 200
+    assert async_response.json() == sync_response.json()
+
+
+@pytest.mark.parametrize('path', ['/async/services/{missing}', '/async/users/{missing}/services'])
+def test_async_reads_return_404_for_unknown_ids(async_client, admin_headers, path: str):
+    path = path.format(missing='00000000-0000-0000-0000-000000000000')
+
+    response = _get(async_client, path, admin_headers)
+
+    assert response.status_code == 404
+
+
+def test_async_reads_require_admin(async_client, regular_user: User, service: Service):
+    headers = {'Authorization': f'Bearer {CustomAccessToken.for_user(regular_user)}'}
+
+    assert _get(async_client, '/async/services/', headers).status_code == 401
+    assert _get(async_client, f'/async/services/{service.id}/roles', {}).status_code == 401
@@ -0,0 +1,81 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from src.user.models import User
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture()
+def async_client():
+    from ninja.testing import TestAsyncClient
+
+    from src.user.api import api
+
+    return TestAsyncClient(api)
+
+
+def _post(client, path: str, payload: dict):
+    return async_to_sync(client.post)(path, json=payload)
+
+
+def test_async_login_returns_tokens(async_client, regular_user: User):
+    response = _post(
+        async_client,
+        '/auth/async/login',
+        {'email': regular_user.email, 'password': 'password123'},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert CustomAccessToken(data['access_token'])['sub'] == str(regular_user.id)
+
+    refreshed = _post(async_client, '/auth/async/refresh', {'refresh_token': data['refresh_token']})
+    assert refreshed.status_code == 200
+    assert CustomAccessToken(refreshed.json()['access_token'])['sub'] == str(regular_user.id)
+
+
+def test_async_login_rejects_invalid_credentials(async_client, regular_user: User):
+    wrong_password = _post(
+        async_client, '/auth/async/login', {'email': regular_user.email, 'password': 'nope'}
+    )
+    unknown_user = _post(
+        async_client, '/auth/async/login', {'email': 'nobody@example.com', 'password': 'nope'}
+    )
+
+    assert wrong_password.status_code == 400
+    assert unknown_user.status_code == 400
+
+
+def test_async_login_rejects_inactive_user(async_client, regular_user: User):
+    regular_user.deactivate()
+
+    response = _post(
+        async_client,
+        '/auth/async/login',
+        {'email': regular_user.email, 'password': 'password123'},
+    )
+
+    assert response.status_code == 403
+
+
+def test_async_login_fails_fast_when_hash_pool_is_saturated(
+    async_client, regular_user: User, settings
+):
+    settings.PASSWORD_HASH_WORKERS = 0
+    settings.PASSWORD_HASH_MAX_QUEUE = 0
+
+    response = _post(
+        async_client,
+        '/auth/async/login',
+        {'email': regular_user.email, 'password': 'password123'},
+    )
+
+    assert response.status_code == 503
+
+
+def test_async_refresh_rejects_invalid_token(async_client):
+    response = _post(async_client, '/auth/async/refresh', {'refresh_token': 'not-a-jwt'})
+
+    assert response.status_code == 401
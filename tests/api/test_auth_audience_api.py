@@ -0,0 +1,88 @@
+import pytest
+
+from src.user.models import Service, User, UserServiceAssignment, UserServiceRole
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture()
+def other_service():
+    return Service.objects.create(name='other', client_id='other-client', client_secret='x')
+
+
+@pytest.fixture()
+def assigned_user(regular_user: User, service, other_service, service_role) -> User:
+    for svc in (service, other_service):
+        UserServiceAssignment.objects.create(user=regular_user, service=svc)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+    return regular_user
+
+
+def _login(api_client, user: User, **extra):
+    return api_client.post(
+        '/auth/login', json={'email': user.email, 'password': 'password123', **extra}
+    )
+
+
+def test_login_with_audience_scopes_services_claim(api_client, assigned_user: User, service):
+    response = _login(api_client, assigned_user, audience=service.client_id)
+
+    assert response.status_code == 200
+    token = CustomAccessToken(response.json()['access_token'])
+    assert token['aud'] == str(service.id)
+    assert list(token['services']) == [str(service.id)]
+    assert token['services'][str(service.id)]['roles'] == ['editor']
+
+
+def test_login_without_audience_keeps_all_services(api_client, assigned_user: User):
+    response = _login(api_client, assigned_user)
+
+    token = CustomAccessToken(response.json()['access_token'])
+    assert 'aud' not in token
+    assert len(token['services']) == 2
+
+
+def test_login_rejects_unknown_or_unassigned_audience(api_client, regular_user: User, service):
+    assert _login(api_client, regular_user, audience='nope').status_code == 400
+    assert _login(api_client, regular_user, audience=str(service.id)).status_code == 403
+
+
+def test_refresh_keeps_bound_audience(api_client, assigned_user: User, service, other_service):
+    refresh = _login(api_client, assigned_user, audience=str(service.id)).json()['refresh_token']
+
+    response = api_client.post('/auth/refresh', json={'refresh_token': refresh})
+    assert response.status_code == 200
+    assert CustomAccessToken(response.json()['access_token'])['aud'] == str(service.id)
+
+    widened = api_client.post(
+        '/auth/refresh', json={'refresh_token': refresh, 'audience': str(other_service.id)}
+    )
+    assert widened.status_code == 403
+
+
+def test_exchange_narrows_broad_token(api_client, assigned_user: User, service, other_service):
+    broad = _login(api_client, assigned_user).json()['access_token']
+
+    response = api_client.post(
+        '/auth/exchange', json={'subject_token': broad, 'audience': str(other_service.id)}
+    )
+
+    assert response.status_code == 200
+    narrow = CustomAccessToken(response.json()['access_token'])
+    assert narrow['aud'] == str(other_service.id)
+    assert list(narrow['services']) == [str(other_service.id)]
+
+    rescoped = api_client.post(
+        '/auth/exchange',
+        json={'subject_token': response.json()['access_token'], 'audience': str(service.id)},
+    )
+    assert rescoped.status_code == 403
+
+
+def test_exchange_rejects_invalid_subject_token(api_client, service):
+    response = api_client.post(
+        '/auth/exchange', json={'subject_token': 'garbage', 'audience': str(service.id)}
+    )
+
+    assert response.status_code == 401
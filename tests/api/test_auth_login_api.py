@@ -46,3 +46,20 @@ def test_login_rejects_inactive_user(api_client, regular_user: User):
 
     assert response.status_code == 403
     assert response.json()['detail'] == 'User not active'
+
+
+def test_login_right_after_reactivation_gets_a_working_token(
+    api_client, regular_user: User, settings
+):
+    settings.JWT_STATELESS_AUTH = True
+    regular_user.deactivate()
+    regular_user.reactivate()
+
+    # Same second as the revocation made by ``reactivate``.
+    response = api_client.post(
+        '/auth/login',
+        json={'email': regular_user.email, 'password': 'password123'},
+    )
+    headers = {'Authorization': f'Bearer {response.json()["access_token"]}'}
+
+    assert api_client.post('/auth/logout', json={}, headers=headers).status_code == 200
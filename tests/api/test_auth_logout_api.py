@@ -0,0 +1,84 @@
+import pytest
+
+from src.user.models import RevokedToken, User
+from tests.factories import UserFactory
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def _login(api_client, user: User) -> dict:
+    response = api_client.post('/auth/login', json={'email': user.email, 'password': 'password123'})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_logout_revokes_access_and_refresh_tokens(api_client, regular_user: User, service):
+    tokens = _login(api_client, regular_user)
+    headers = {'Authorization': f'Bearer {tokens["access_token"]}'}
+    index_url = f'/services/{service.id}/permissions/index'
+    assert api_client.get(index_url, headers=headers).status_code == 200
+
+    response = api_client.post(
+        '/auth/logout', json={'refresh_token': tokens['refresh_token']}, headers=headers
+    )
+
+    assert response.status_code == 200
+    assert RevokedToken.objects.count() == 2
+    assert api_client.get(index_url, headers=headers).status_code == 401
+    refreshed = api_client.post('/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+    assert refreshed.status_code == 401
+
+
+def test_logout_leaves_other_sessions_valid(api_client, regular_user: User):
+    first = _login(api_client, regular_user)
+    second = _login(api_client, regular_user)
+
+    api_client.post(
+        '/auth/logout', json={}, headers={'Authorization': f'Bearer {first["access_token"]}'}
+    )
+
+    response = api_client.post('/auth/refresh', json={'refresh_token': second['refresh_token']})
+    assert response.status_code == 200
+
+
+def test_logout_refuses_refresh_token_of_another_user(api_client, regular_user: User):
+    mine = _login(api_client, regular_user)
+    theirs = _login(api_client, UserFactory())
+
+    response = api_client.post(
+        '/auth/logout',
+        json={'refresh_token': theirs['refresh_token']},
+        headers={'Authorization': f'Bearer {mine["access_token"]}'},
+    )
+
+    assert response.status_code == 403
+    assert RevokedToken.objects.count() == 0
+
+
+def test_logged_out_token_cannot_be_exchanged(api_client, regular_user: User, service):
+    tokens = _login(api_client, regular_user)
+    api_client.post(
+        '/auth/logout', json={}, headers={'Authorization': f'Bearer {tokens["access_token"]}'}
+    )
+
+    response = api_client.post(
+        '/auth/exchange',
+        json={'subject_token': tokens['access_token'], 'audience': str(service.id)},
+    )
+
+    assert response.status_code == 401
+
+
+def test_token_issued_before_revocation_cannot_be_exchanged(
+    api_client, regular_user: User, service
+):
+    tokens = _login(api_client, regular_user)
+    regular_user.deactivate()
+    regular_user.reactivate()
+
+    response = api_client.post(
+        '/auth/exchange',
+        json={'subject_token': tokens['access_token'], 'audience': str(service.id)},
+    )
+
+    assert response.status_code == 401
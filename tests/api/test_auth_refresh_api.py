@@ -0,0 +1,57 @@
+import pytest
+
+from src.user.models import User, UserGlobalRole
+from src.user.revoked_tokens import revoked_tokens
+from src.user.routers.auth import refresh_counters
+from src.user.tokens import CustomAccessToken, CustomRefreshToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture(autouse=True)
+def _reset_counters():
+    refresh_counters.reset()
+
+
+def _login(api_client, user: User) -> dict:
+    response = api_client.post('/auth/login', json={'email': user.email, 'password': 'password123'})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_unchanged_entitlements_take_the_fast_path(
+    api_client, regular_user: User, django_assert_num_queries
+):
+    tokens = _login(api_client, regular_user)
+    revoked_tokens.is_revoked('warm-up')
+
+    with django_assert_num_queries(1):
+        response = api_client.post('/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+
+    assert response.status_code == 200
+    access = CustomAccessToken(response.json()['access_token'])
+    assert access['efp'] == CustomAccessToken(tokens['access_token'])['efp']
+    assert access['jti'] != CustomAccessToken(tokens['access_token'])['jti']
+    assert refresh_counters.snapshot() == {'fast_path': 1}
+
+
+def test_changed_entitlements_are_reloaded_and_restamped(
+    api_client, regular_user: User, global_role, django_capture_on_commit_callbacks
+):
+    tokens = _login(api_client, regular_user)
+    with django_capture_on_commit_callbacks(execute=True):
+        UserGlobalRole.objects.create(user=regular_user, role=global_role)
+
+    response = api_client.post('/auth/refresh', json={'refresh_token': tokens['refresh_token']})
+
+    assert response.status_code == 200
+    assert CustomAccessToken(response.json()['access_token'])['global_roles'] == ['super_admin']
+    assert refresh_counters.snapshot() == {'slow_path': 1}
+
+    old_refresh = CustomRefreshToken(tokens['refresh_token'])
+    new_refresh = CustomRefreshToken(response.json()['refresh_token'])
+    assert new_refresh['global_roles'] == ['super_admin']
+    assert (new_refresh['jti'], new_refresh['exp']) == (old_refresh['jti'], old_refresh['exp'])
+
+    api_client.post('/auth/refresh', json={'refresh_token': response.json()['refresh_token']})
+    assert refresh_counters.get('fast_path') == 1
@@ -0,0 +1,103 @@
+"""Concurrent refreshes of one user share a single entitlement resolution."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from src.user import tokens
+from src.user.models import User
+from src.user.tokens import CustomAccessToken, CustomRefreshToken, resolution_counters
+
+pytestmark = pytest.mark.integration
+
+CONCURRENT_REFRESHES = 8
+
+
+@pytest.fixture(autouse=True)
+def _uncached(settings):
+    # Without the claims cache, only coalescing can keep the resolutions down to one.
+    settings.CLAIMS_CACHE_MAX_ENTRIES = 0
+
+
+@pytest.fixture()
+def stale_refresh_token(regular_user: User) -> str:
+    # Claims with an outdated fingerprint force the slow path, which resolves entitlements.
+    refresh = CustomRefreshToken.for_user(regular_user)
+    refresh['efp'] = 'stale'
+    return str(refresh)
+
+
+@pytest.fixture()
+def counted_resolutions(monkeypatch):
+    """Count ``get_claims`` calls; each is held until ``release`` is set."""
+    calls = []
+    release = threading.Event()
+    get_claims = tokens.get_claims
+
+    def slow_get_claims(user_id):
+        calls.append(user_id)
+        release.wait(5)
+        return get_claims(user_id)
+
+    monkeypatch.setattr(tokens, 'get_claims', slow_get_claims)
+    return calls, release
+
+
+@pytest.mark.django_db(transaction=True)
+def test_threaded_refreshes_share_one_resolution(
+    api_client, regular_user: User, stale_refresh_token: str, counted_resolutions
+):
+    calls, release = counted_resolutions
+    coalesced = resolution_counters.get('coalesced')
+    responses = []
+
+    def refresh() -> None:
+        responses.append(
+            api_client.post('/auth/refresh', json={'refresh_token': stale_refresh_token})
+        )
+
+    threads = [threading.Thread(target=refresh) for _ in range(CONCURRENT_REFRESHES)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.3)  # let every request reach the resolution in flight
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REFRESHES
+    assert len(calls) == 1
+    assert resolution_counters.get('coalesced') - coalesced == CONCURRENT_REFRESHES - 1
+    jtis = {CustomAccessToken(r.json()['access_token'])['jti'] for r in responses}
+    assert len(jtis) == CONCURRENT_REFRESHES
+
+
+@pytest.mark.django_db
+def test_async_refreshes_share_one_resolution(
+    regular_user: User, stale_refresh_token: str, counted_resolutions
+):
+    from ninja.testing import TestAsyncClient
+
+    from src.user.api import api
+
+    calls, release = counted_resolutions
+    # The leader's resolution runs on the sync thread; the rest wait on the event loop.
+    release.set()
+    client = TestAsyncClient(api)
+
+    async def refresh_all():
+        return await asyncio.gather(
+            *[
+                client.post('/auth/async/refresh', json={'refresh_token': stale_refresh_token})
+                for _ in range(CONCURRENT_REFRESHES)
+            ]
+        )
+
+    responses = async_to_sync(refresh_all)()
+
+    assert [response.status_code for response in responses] == [200] * CONCURRENT_REFRESHES
+    assert len(calls) == 1
+    jtis = {CustomAccessToken(r.json()['access_token'])['jti'] for r in responses}
+    assert len(jtis) == CONCURRENT_REFRESHES
@@ -0,0 +1,57 @@
+import pytest
+
+from src.user.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture(autouse=True)
+def _limits(settings):
+    settings.LOGIN_THROTTLE_ENABLED = True
+    settings.LOGIN_THROTTLE_BACKEND = 'memory'
+    settings.LOGIN_THROTTLE_IP_BURST = 100
+    settings.LOGIN_THROTTLE_EMAIL_BURST = 2
+    settings.LOGIN_THROTTLE_EMAIL_PER_MINUTE = 1
+
+
+def _login(api_client, email: str, password: str):
+    return api_client.post('/auth/login', json={'email': email, 'password': password})
+
+
+def test_repeated_failures_are_throttled_before_any_query(
+    api_client, regular_user: User, django_assert_num_queries
+):
+    for _ in range(2):
+        assert _login(api_client, regular_user.email, 'wrong').status_code == 400
+
+    with django_assert_num_queries(0):
+        response = _login(api_client, regular_user.email, 'password123')
+
+    assert response.status_code == 429
+    assert response.json()['detail'] == 'Too many requests.'
+    # One token per minute; less any time the failed attempts took to hash.
+    assert 50 <= int(response['Retry-After']) <= 60
+
+
+def test_successful_login_resets_email_penalty(api_client, regular_user: User):
+    assert _login(api_client, regular_user.email, 'wrong').status_code == 400
+    assert _login(api_client, regular_user.email, 'password123').status_code == 200
+
+    assert _login(api_client, regular_user.email, 'wrong').status_code == 400
+    assert _login(api_client, regular_user.email, 'password123').status_code == 200
+
+
+def test_async_login_shares_the_throttle(api_client, regular_user: User):
+    from asgiref.sync import async_to_sync
+    from ninja.testing import TestAsyncClient
+
+    from src.user.api import api
+
+    for _ in range(2):
+        assert _login(api_client, regular_user.email, 'wrong').status_code == 400
+
+    response = async_to_sync(TestAsyncClient(api).post)(
+        '/auth/async/login', json={'email': regular_user.email, 'password': 'password123'}
+    )
+
+    assert response.status_code == 429
@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+
+from src.user.models import Permission, Role, Service, User
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+CATALOG = {
+    'permissions': [{'code': 'read', 'description': 'Read'}, {'code': 'write'}],
+    'roles': [{'name': 'editor', 'permissions': ['read', 'write']}],
+}
+
+
+def test_put_catalog_is_idempotent(api_client, admin_headers, service: Service):
+    first = api_client.put(f'/services/{service.id}/catalog', json=CATALOG, headers=admin_headers)
+    second = api_client.put(f'/services/{service.id}/catalog', json=CATALOG, headers=admin_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == {
+        'changed': True,
+        'permissions': {'created': 2, 'updated': 0, 'deleted': 0},
+        'roles': {'created': 1, 'updated': 0, 'deleted': 0},
+        'role_permissions': {'created': 2, 'updated': 0, 'deleted': 0},
+    }
+    assert second.json()['changed'] is False
+    assert Permission.objects.filter(service=service).count() == 2
+    assert Role.objects.get(service=service).role_permissions.count() == 2
+
+
+def test_put_catalog_rejects_inconsistent_catalog(api_client, admin_headers, service: Service):
+    catalog = {'roles': [{'name': 'editor', 'permissions': ['read']}]}
+
+    response = api_client.put(
+        f'/services/{service.id}/catalog', json=catalog, headers=admin_headers
+    )
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Unknown permissions: read'
+    assert not Role.objects.filter(service=service).exists()
+
+
+def test_put_catalog_requires_admin_and_existing_service(
+    api_client, admin_headers, regular_user: User
+):
+    user_headers = {'Authorization': f'Bearer {CustomAccessToken.for_user(regular_user)}'}
+    path = f'/services/{uuid.uuid4()}/catalog'
+
+    assert api_client.put(path, json=CATALOG, headers=user_headers).status_code == 401
+    assert api_client.put(path, json=CATALOG, headers=admin_headers).status_code == 404
@@ -0,0 +1,184 @@
+import pytest
+from asgiref.sync import async_to_sync
+
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+PATHS = [
+    '/services/',
+    '/services/{service}/roles',
+    '/services/{service}/permissions',
+    '/users/{user}/services',
+]
+
+
+@pytest.fixture(autouse=True)
+def _stateless(settings):
+    # Authentication itself costs no query, so the counts below are the endpoints' own.
+    settings.JWT_STATELESS_AUTH = True
+
+
+@pytest.fixture()
+def async_client():
+    from ninja.testing import TestAsyncClient
+
+    from src.user.api import api
+
+    return TestAsyncClient(api)
+
+
+@pytest.fixture()
+def assigned_user(
+    regular_user: User, service: Service, service_role: Role, service_permission: Permission
+) -> User:
+    RolePermission.objects.create(role=service_role, permission=service_permission)
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+    return regular_user
+
+
+@pytest.fixture()
+def get(api_client, async_client, admin_headers, request):
+    """GET from the sync endpoint, or its ``/async`` twin when parametrized with ``'async'``."""
+    mode = getattr(request, 'param', 'sync')
+
+    def _get(path: str, etag: str | None = None):
+        # Spelled as in ``request.META``: the test clients do not upper-case header names there.
+        headers = {**admin_headers, **({'IF_NONE_MATCH': etag} if etag else {})}
+        if mode == 'async':
+            return async_to_sync(async_client.get)(f'/async{path}', headers=headers)
+        return api_client.get(path, headers=headers)
+
+    return _get
+
+
+@pytest.mark.parametrize('get', ['sync', 'async'], indirect=True)
+@pytest.mark.parametrize('path', PATHS)
+def test_matching_etag_returns_304_after_one_query(
+    get, assigned_user: User, service: Service, django_assert_max_num_queries, path: str
+):
+    path = path.format(service=service.id, user=assigned_user.id)
+    first = get(path)
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+    assert etag.startswith('"')  # strong
+
+    with django_assert_max_num_queries(1):
+        response = get(path, etag)
+
+    assert response.status_code == 304
+    assert response.content == b''
+    assert response.headers['ETag'] == etag
+
+
+@pytest.mark.parametrize('path', PATHS)
+def test_stale_etag_gets_full_response(get, assigned_user: User, service: Service, path: str):
+    path = path.format(service=service.id, user=assigned_user.id)
+    expected = get(path)
+
+    response = get(path, '"stale"')
+
+    assert response.status_code == 200
+    assert response.json() == expected.json()
+    assert response.headers['ETag'] == expected.headers['ETag']
+
+
+def _change_service(service: Service, **kwargs) -> None:
+    service.description = 'changed'
+    service.save()
+
+
+def _add_permission(service: Service, **kwargs) -> None:
+    Permission.objects.create(service=service, type=Permission.TYPE_SERVICE, code='extra')
+
+
+def _delete_permission(service_permission: Permission, **kwargs) -> None:
+    service_permission.delete()
+
+
+def _rename_role(service_role: Role, **kwargs) -> None:
+    service_role.name = 'renamed'
+    service_role.save()
+
+
+def _drop_role_permission(service_role: Role, **kwargs) -> None:
+    RolePermission.objects.filter(role=service_role).delete()
+
+
+@pytest.mark.parametrize(
+    'path, change',
+    [
+        ('/services/', _change_service),
+        ('/services/', lambda **kwargs: Service.objects.filter(name='other').delete()),
+        ('/services/{service}/permissions', _add_permission),
+        ('/services/{service}/permissions', _delete_permission),
+        ('/services/{service}/roles', _rename_role),
+        ('/users/{user}/services', _change_service),
+        ('/users/{user}/services', _rename_role),
+        ('/users/{user}/services', _drop_role_permission),
+    ],
+)
+def test_etag_changes_with_the_data(
+    get,
+    assigned_user: User,
+    service: Service,
+    service_role: Role,
+    service_permission: Permission,
+    path: str,
+    change,
+):
+    Service.objects.create(name='other', client_id='other', client_secret='')
+    path = path.format(service=service.id, user=assigned_user.id)
+    etag = get(path).headers['ETag']
+
+    change(service=service, service_role=service_role, service_permission=service_permission)
+    response = get(path, etag)
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_etag_depends_on_query_parameters(get, assigned_user: User, service: Service):
+    Service.objects.create(name='other', client_id='other', client_secret='')
+    first_page = get('/services/?limit=1')
+    next_page = get(f'/services/?limit=1&cursor={first_page.json()["next_cursor"]}')
+    plain = get(f'/users/{assigned_user.id}/services')
+    effective = get(f'/users/{assigned_user.id}/services?include_effective=true')
+
+    assert first_page.headers['ETag'] != next_page.headers['ETag']
+    assert plain.headers['ETag'] != effective.headers['ETag']
+    assert get('/services/?limit=1', next_page.headers['ETag']).status_code == 200
+
+
+def test_user_without_snapshot_gets_no_etag(get, regular_user: User):
+    response = get(f'/users/{regular_user.id}/services')
+
+    assert response.status_code == 200
+    assert response.json() == {'services': []}
+    assert 'ETag' not in response.headers
+
+
+@pytest.mark.parametrize('get', ['sync', 'async'], indirect=True)
+def test_unknown_user_is_still_404(get):
+    response = get('/users/00000000-0000-0000-0000-000000000000/services', '"anything"')
+
+    assert response.status_code == 404
+
+
+def test_conditional_get_through_the_middleware_stack(client, admin_headers, service: Service):
+    headers = {'HTTP_AUTHORIZATION': admin_headers['Authorization']}
+    etag = client.get('/api/services/', **headers)['ETag']
+
+    response = client.get('/api/services/', HTTP_IF_NONE_MATCH=etag, **headers)
+
+    assert response.status_code == 304
+    assert response['ETag'] == etag
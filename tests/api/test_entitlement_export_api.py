@@ -0,0 +1,54 @@
+import gzip
+import json
+import uuid
+
+import pytest
+
+from src.user.models import Role, Service, User, UserServiceAssignment, UserServiceRole
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+@pytest.fixture()
+def member(service: Service, service_role: Role, regular_user: User) -> User:
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+    return regular_user
+
+
+def test_export_streams_ndjson(api_client, admin_headers, service: Service, member: User):
+    response = api_client.get(f'/services/{service.id}/entitlements/export', headers=admin_headers)
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response['Content-Type'] == 'application/x-ndjson'
+    assert 'Content-Encoding' not in response.headers
+    assert [json.loads(line) for line in response.content.splitlines()] == [
+        {
+            'user_id': str(member.id),
+            'email': member.email,
+            'status': 'ACTIVE',
+            'roles': ['editor'],
+            'permissions': [],
+        }
+    ]
+
+
+def test_export_is_gzipped_when_accepted(api_client, admin_headers, service: Service, member):
+    plain = api_client.get(f'/services/{service.id}/entitlements/export', headers=admin_headers)
+    compressed = api_client.get(
+        f'/services/{service.id}/entitlements/export',
+        headers=admin_headers | {'Accept-Encoding': 'gzip, br'},
+    )
+
+    assert compressed['Content-Encoding'] == 'gzip'
+    assert compressed['Vary'] == 'Accept-Encoding'
+    assert gzip.decompress(compressed.content) == plain.content
+
+
+def test_export_of_unknown_service_is_404(api_client, admin_headers):
+    response = api_client.get(
+        f'/services/{uuid.uuid4()}/entitlements/export', headers=admin_headers
+    )
+
+    assert response.status_code == 404
@@ -0,0 +1,54 @@
+import jwt
+import pytest
+
+from src.user.models import User
+from src.user.signing_keys import create_signing_key, retire_signing_key
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+JWKS_URL = '/.well-known/jwks.json'
+
+
+def test_jwks_lets_clients_verify_tokens_locally(client, regular_user: User):
+    create_signing_key('RS256', activate=True)
+    token = str(CustomAccessToken.for_user(regular_user))
+
+    response = client.get(JWKS_URL)
+
+    assert response.status_code == 200
+    assert response['Cache-Control'] == 'public, max-age=300'
+    jwks = jwt.PyJWKSet.from_dict(response.json())
+    kid = jwt.get_unverified_header(token)['kid']
+    payload = jwt.decode(token, jwks[kid].key, algorithms=['RS256'])
+    assert payload['sub'] == str(regular_user.id)
+
+
+def test_jwks_lists_verify_only_keys_but_not_retired_ones(client):
+    active = create_signing_key('ES256', activate=True)
+    pending = create_signing_key('EdDSA')
+    retired = create_signing_key('ES256')
+    retire_signing_key(retired.kid)
+
+    keys = client.get(JWKS_URL).json()['keys']
+
+    assert [k['kid'] for k in keys] == [active.kid, pending.kid]
+    assert {k['alg'] for k in keys} == {'ES256', 'EdDSA'}
+    assert all('d' not in k for k in keys)
+
+
+def test_jwks_returns_304_for_matching_etag(client, django_assert_num_queries):
+    create_signing_key('ES256', activate=True)
+    etag = client.get(JWKS_URL)['ETag']
+    assert etag.startswith('"')
+
+    with django_assert_num_queries(0):
+        response = client.get(JWKS_URL, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response['ETag'] == etag
+
+    create_signing_key('EdDSA')
+    response = client.get(JWKS_URL, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response['ETag'] != etag
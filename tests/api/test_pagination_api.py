@@ -0,0 +1,118 @@
+import tracemalloc
+
+import pytest
+from asgiref.sync import async_to_sync
+
+from src.user.models import Permission, Role, Service
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+LARGE_LIST = 100_000
+PAGE_SIZE = 1000
+
+
+def _walk(get, path: str, key: str, limit: int | None = None) -> list[dict]:
+    items, cursor = [], None
+    while True:
+        params = {k: v for k, v in (('cursor', cursor), ('limit', limit)) if v is not None}
+        data = get(path, params)
+        items.extend(data[key])
+        cursor = data['next_cursor']
+        if cursor is None:
+            return items
+
+
+@pytest.mark.parametrize('prefix', ['', '/async'])
+def test_roles_are_paged_by_cursor(api_client, admin_headers, service: Service, prefix: str):
+    from ninja.testing import TestAsyncClient
+
+    from src.user.api import api
+
+    Role.objects.bulk_create(Role(service=service, name=f'role-{i}') for i in range(25))
+    async_client = TestAsyncClient(api)
+
+    def get(path: str, params: dict) -> dict:
+        if prefix:
+            response = async_to_sync(async_client.get)(
+                path, query_params=params, headers=admin_headers
+            )
+        else:
+            response = api_client.get(path, query_params=params, headers=admin_headers)
+        assert response.status_code == 200
+        return response.json()
+
+    roles = _walk(get, f'{prefix}/services/{service.id}/roles', 'roles', limit=10)
+
+    assert len({r['name'] for r in roles}) == len(roles) == 25
+
+
+def test_callers_without_cursor_get_the_first_page(api_client, admin_headers, service, settings):
+    settings.PAGINATION_DEFAULT_LIMIT = 10
+    Permission.objects.bulk_create(
+        Permission(service=service, type=Permission.TYPE_SERVICE, code=f'p-{i}', bit=i)
+        for i in range(15)
+    )
+
+    first = api_client.get(f'/services/{service.id}/permissions', headers=admin_headers).json()
+    rest = api_client.get(
+        f'/services/{service.id}/permissions',
+        query_params={'cursor': first['next_cursor']},
+        headers=admin_headers,
+    ).json()
+
+    assert len(first['permissions']) == 10
+    assert len(rest['permissions']) == 5
+    assert rest['next_cursor'] is None
+
+
+def test_limit_is_capped(api_client, admin_headers, settings):
+    settings.PAGINATION_MAX_LIMIT = 2
+    Service.objects.bulk_create(
+        Service(name=f'service-{i}', client_id=f'client-{i}', client_secret='') for i in range(3)
+    )
+
+    response = api_client.get('/services/', query_params={'limit': 100}, headers=admin_headers)
+
+    assert len(response.json()['services']) == 2
+    assert response.json()['next_cursor'] is not None
+
+
+@pytest.mark.parametrize('params', [{'cursor': 'bogus'}, {'limit': 0}])
+def test_invalid_page_params_are_rejected(api_client, admin_headers, params: dict):
+    response = api_client.get('/services/', query_params=params, headers=admin_headers)
+
+    assert response.status_code in (400, 422)
+
+
+@pytest.mark.slow
+def test_paging_through_a_large_list_uses_constant_memory(api_client, admin_headers, service):
+    Permission.objects.bulk_create(
+        (
+            Permission(service=service, type=Permission.TYPE_SERVICE, code=f'p-{i}', bit=i)
+            for i in range(LARGE_LIST)
+        ),
+        batch_size=5000,
+    )
+    peaks: list[int] = []
+
+    def get(path: str, params: dict) -> dict:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        response = api_client.get(path, query_params=params, headers=admin_headers)
+        data = response.json()
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        return data
+
+    tracemalloc.start()
+    try:
+        codes = {
+            p['code']
+            for p in _walk(get, f'/services/{service.id}/permissions', 'permissions', PAGE_SIZE)
+        }
+    finally:
+        tracemalloc.stop()
+
+    assert len(codes) == LARGE_LIST
+    assert len(peaks) == LARGE_LIST // PAGE_SIZE + (LARGE_LIST % PAGE_SIZE > 0)
+    # Every page costs about as much as the first, however far into the list it is.
+    assert max(peaks) < 2 * peaks[0]
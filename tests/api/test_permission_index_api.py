@@ -0,0 +1,38 @@
+import pytest
+
+from src.user.models import Permission, User
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def test_permission_index_is_available_to_authenticated_clients(
+    api_client, regular_user: User, service, service_permission: Permission
+):
+    token = CustomAccessToken.for_user(regular_user)
+
+    response = api_client.get(
+        f'/services/{service.id}/permissions/index',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['service_id'] == str(service.id)
+    assert data['permissions'] == {'read': service_permission.bit}
+    assert data['version'] >= 1
+
+
+def test_login_can_request_compact_claims(api_client, regular_user: User):
+    response = api_client.post(
+        '/auth/login',
+        json={'email': regular_user.email, 'password': 'password123', 'claims_format': 'compact'},
+    )
+
+    assert response.status_code == 200
+    assert CustomAccessToken(response.json()['access_token'])['claims_format'] == 'compact'
+
+    refreshed = api_client.post(
+        '/auth/refresh', json={'refresh_token': response.json()['refresh_token']}
+    )
+    assert CustomAccessToken(refreshed.json()['access_token'])['claims_format'] == 'compact'
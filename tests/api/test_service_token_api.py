@@ -0,0 +1,147 @@
+import base64
+
+import pytest
+
+from src.user.models import Permission, Service
+from src.user.tokens import CustomAccessToken, ServiceAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def _request_token(api_client, data: dict, headers: dict | None = None):
+    return api_client.post('/auth/token', data=data, headers=headers or {})
+
+
+def test_client_credentials_grant_returns_service_token(
+    api_client, service: Service, service_client_secret: str, service_permission: Permission
+):
+    response = _request_token(
+        api_client,
+        {
+            'grant_type': 'client_credentials',
+            'client_id': service.client_id,
+            'client_secret': service_client_secret,
+            'scope': 'read',
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data['token_type'] == 'Bearer'
+    assert 295 <= data['expires_in'] <= 300
+    assert data['scope'] == 'read'
+
+    token = ServiceAccessToken(data['access_token'])
+    assert token['sub'] == str(service.id)
+    assert token['client_id'] == service.client_id
+    assert token['scope'] == 'read'
+
+
+def test_client_credentials_accepts_basic_authentication(
+    api_client, service: Service, service_client_secret: str
+):
+    credentials = base64.b64encode(f'{service.client_id}:{service_client_secret}'.encode())
+
+    response = _request_token(
+        api_client,
+        {'grant_type': 'client_credentials'},
+        {'Authorization': f'Basic {credentials.decode()}'},
+    )
+
+    assert response.status_code == 200
+    assert response.json()['scope'] == ''
+
+
+@pytest.mark.parametrize(
+    ('data', 'status', 'detail'),
+    [
+        ({'grant_type': 'password'}, 400, 'Unsupported grant type'),
+        (
+            {'grant_type': 'client_credentials', 'client_secret': ''},
+            401,
+            'Invalid client credentials',
+        ),
+        (
+            {'grant_type': 'client_credentials', 'client_secret': 'wrong'},
+            401,
+            'Invalid client credentials',
+        ),
+        ({'grant_type': 'client_credentials', 'scope': 'missing'}, 400, 'Invalid scope'),
+    ],
+)
+def test_client_credentials_errors(
+    api_client, service: Service, service_client_secret: str, data, status, detail
+):
+    data = {'client_id': service.client_id, 'client_secret': service_client_secret} | data
+
+    response = _request_token(api_client, data)
+
+    assert response.status_code == status
+    assert response.json()['detail'] == detail
+
+
+def test_service_token_cannot_authenticate_as_user(
+    api_client, service: Service, service_client_secret: str
+):
+    token = ServiceAccessToken.for_service(service, [])
+
+    response = api_client.get(
+        f'/services/{service.id}/permissions/index',
+        headers={'Authorization': f'Bearer {token}'},
+    )
+
+    assert response.status_code == 401
+    with pytest.raises(Exception):
+        CustomAccessToken(str(token))
+
+
+def test_created_service_returns_secret_once(api_client, admin_headers):
+    response = api_client.post('/services/', json={'name': 'billing'}, headers=admin_headers)
+
+    assert response.status_code == 200
+    created = response.json()
+    token = _request_token(
+        api_client,
+        {
+            'grant_type': 'client_credentials',
+            'client_id': created['client_id'],
+            'client_secret': created['client_secret'],
+        },
+    )
+    assert token.status_code == 200
+    fetched = api_client.get(f'/services/{created["id"]}', headers=admin_headers)
+    assert 'client_secret' not in fetched.json()
+
+
+def test_token_is_reused_for_same_client_and_scope(
+    api_client, service: Service, service_client_secret: str, service_permission: Permission
+):
+    data = {
+        'grant_type': 'client_credentials',
+        'client_id': service.client_id,
+        'client_secret': service_client_secret,
+        'scope': 'read',
+    }
+
+    first = _request_token(api_client, data).json()
+    second = _request_token(api_client, data).json()
+    unscoped = _request_token(api_client, data | {'scope': ''}).json()
+
+    assert second['access_token'] == first['access_token']
+    assert unscoped['access_token'] != first['access_token']
+
+
+def test_deleted_permission_is_not_served_from_reused_token(
+    api_client, service: Service, service_client_secret: str, service_permission: Permission
+):
+    data = {
+        'grant_type': 'client_credentials',
+        'client_id': service.client_id,
+        'client_secret': service_client_secret,
+        'scope': 'read',
+    }
+    assert _request_token(api_client, data).status_code == 200
+
+    service_permission.delete()
+
+    assert _request_token(api_client, data).status_code == 400
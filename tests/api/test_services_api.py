@@ -1,6 +1,7 @@
 import pytest
 
 from src.user.models import Service
+from src.user.service_auth import check_client_secret
 
 pytestmark = [pytest.mark.django_db, pytest.mark.integration]
 
@@ -38,5 +39,6 @@ def test_admin_can_create_service_and_client_credentials_are_generated(
 
     service = Service.objects.get(id=response.data['id'])
     assert service.client_id == 'token-32'
-    assert service.client_secret == 'token-64'
+    assert service.client_secret != 'token-64'
+    assert check_client_secret(service, 'token-64')
     assert calls == [32, 64]
@@ -0,0 +1,41 @@
+import pytest
+
+from src.user.models import Role, Service, User, UserServiceAssignment, UserServiceRole
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def _patch(api_client, headers, user: User, service: Service, payload: dict):
+    return api_client.patch(
+        f'/users/{user.id}/services/{service.id}', json=payload, headers=headers
+    )
+
+
+def test_update_reports_whether_anything_changed(
+    api_client, admin_headers, regular_user: User, service: Service, service_role: Role
+):
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+
+    first = _patch(api_client, admin_headers, regular_user, service, {'roles': ['editor']})
+    second = _patch(api_client, admin_headers, regular_user, service, {'roles': ['editor']})
+
+    assert first.status_code == second.status_code == 200
+    assert first.json() == {'detail': 'Updated successfully', 'changed': True}
+    assert second.json()['changed'] is False
+    assert UserServiceRole.objects.filter(user=regular_user, role=service_role).count() == 1
+
+
+def test_update_rejects_unknown_codes(
+    api_client, admin_headers, regular_user: User, service: Service, service_role: Role
+):
+    response = _patch(
+        api_client,
+        admin_headers,
+        regular_user,
+        service,
+        {'roles': ['editor', 'ghost'], 'permissions': ['nope']},
+    )
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'Unknown roles: ghost; Unknown permissions: nope'
+    assert not UserServiceRole.objects.filter(user=regular_user).exists()
@@ -0,0 +1,62 @@
+import pytest
+
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def _assign(user: User, count: int) -> None:
+    for i in range(count):
+        service = Service.objects.create(name=f'svc-{i:02}', client_id=f'svc-{i}', client_secret='')
+        role = Role.objects.create(service=service, name='editor')
+        read = Permission.objects.create(service=service, type=Permission.TYPE_SERVICE, code='read')
+        write = Permission.objects.create(
+            service=service, type=Permission.TYPE_SERVICE, code='write'
+        )
+        RolePermission.objects.create(role=role, permission=write)
+        UserServiceAssignment.objects.create(user=user, service=service)
+        UserServiceRole.objects.create(user=user, service=service, role=role)
+        UserServicePermission.objects.create(user=user, service=service, permission=read)
+
+
+@pytest.mark.parametrize('services', [1, 50])
+def test_query_count_does_not_depend_on_number_of_services(
+    api_client, admin_headers, regular_user: User, django_assert_num_queries, services: int
+):
+    _assign(regular_user, services)
+    path = f'/users/{regular_user.id}/services?include_effective=true'
+    api_client.get(path, headers=admin_headers)  # loads the revoked-token filter
+
+    # Admin lookup, user existence, then assignments, roles and permissions.
+    with django_assert_num_queries(5):
+        response = api_client.get(path, headers=admin_headers)
+
+    assert response.status_code == 200
+    assert len(response.json()['services']) == services
+
+
+def test_include_effective_adds_role_permissions(api_client, admin_headers, regular_user: User):
+    _assign(regular_user, 2)
+
+    plain = api_client.get(f'/users/{regular_user.id}/services', headers=admin_headers).json()
+    full = api_client.get(
+        f'/users/{regular_user.id}/services?include_effective=true', headers=admin_headers
+    ).json()
+
+    assert [s['service_name'] for s in full['services']] == ['svc-00', 'svc-01']
+    for service in plain['services']:
+        assert service['permissions'] == ['read']
+        assert service['effective_permissions'] is None
+    for service in full['services']:
+        assert service['roles'] == ['editor']
+        assert service['permissions'] == ['read']
+        assert service['effective_permissions'] == ['read', 'write']
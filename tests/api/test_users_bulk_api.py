@@ -0,0 +1,63 @@
+import pytest
+
+from src.user.models import Role, Service, User, UserServiceRole
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def test_bulk_create_returns_per_user_results(
+    api_client, admin_headers, service: Service, service_role: Role, regular_user: User
+):
+    users = [
+        {'email': 'new@example.com', 'roles': ['editor']},
+        {'email': regular_user.email, 'roles': ['editor']},
+        {'email': 'bad@example.com', 'roles': ['ghost']},
+    ]
+
+    response = api_client.post(
+        f'/services/{service.id}/users/bulk', json={'users': users}, headers=admin_headers
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert (data['created'], data['failed']) == (1, 1)
+    assert [(r['email'], r['created'], r['error']) for r in data['results']] == [
+        ('new@example.com', True, None),
+        (regular_user.email, False, None),
+        ('bad@example.com', False, 'Unknown roles: ghost'),
+    ]
+    assert data['results'][1]['user_id'] == str(regular_user.id)
+    assert UserServiceRole.objects.filter(service=service, role=service_role).count() == 2
+
+
+def test_bulk_create_rejects_oversized_batches(api_client, admin_headers, service, settings):
+    settings.BULK_PROVISION_MAX_USERS = 2
+    users = [{'email': f'u{i}@example.com'} for i in range(3)]
+
+    response = api_client.post(
+        f'/services/{service.id}/users/bulk', json={'users': users}, headers=admin_headers
+    )
+
+    assert response.status_code == 400
+    assert not User.objects.filter(email='u0@example.com').exists()
+
+
+def test_bulk_create_for_unknown_service(api_client, admin_headers):
+    response = api_client.post(
+        '/services/00000000-0000-0000-0000-000000000000/users/bulk',
+        json={'users': [{'email': 'x@example.com'}]},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 404
+
+
+def test_bulk_create_requires_admin(api_client, regular_user: User, service: Service):
+    response = api_client.post(
+        f'/services/{service.id}/users/bulk',
+        json={'users': []},
+        headers={'Authorization': f'Bearer {CustomAccessToken.for_user(regular_user)}'},
+    )
+
+    assert response.status_code == 401
@@ -0,0 +1,33 @@
+import pytest
+
+from src.user.models import User, UserServiceAssignment
+
+pytestmark = [pytest.mark.django_db, pytest.mark.integration]
+
+
+def test_create_service_user_reuses_user_with_differently_cased_email(
+    api_client, admin_headers, regular_user: User, service
+):
+    response = api_client.post(
+        f'/services/{service.id}/users',
+        json={'email': regular_user.email.upper(), 'name': 'Other'},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json()['id'] == str(regular_user.id)
+    assert User.objects.count() == 2
+    assert UserServiceAssignment.objects.filter(user=regular_user, service=service).exists()
+
+
+def test_update_user_rejects_email_taken_in_another_case(
+    api_client, admin_headers, admin_user: User, regular_user: User
+):
+    response = api_client.patch(
+        f'/users/{regular_user.id}',
+        json={'email': admin_user.email.upper()},
+        headers=admin_headers,
+    )
+
+    assert response.status_code == 409
+    assert response.json()['detail'] == 'Email already in use'
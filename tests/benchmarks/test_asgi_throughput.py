@@ -0,0 +1,113 @@
+"""
+Sync vs async read endpoints served by uvicorn.
+
+Starts uvicorn on the project's ASGI application in a background thread and drives it with
+``CONNECTIONS`` concurrent keep-alive connections, each making ``REQUESTS_PER_CONNECTION``
+authenticated GETs, against a sync endpoint and its ``/async/`` counterpart. Reports requests per
+second, then the peak memory traced while all connections are active, per connection (this
+includes the client's buffers, which are the same for both stacks).
+
+Requires uvicorn (``pip install uvicorn``); skipped otherwise.
+"""
+
+import asyncio
+import re
+import socket
+import threading
+import time
+import tracemalloc
+
+import pytest
+
+from src.user.models import Permission, Role, Service, User
+from src.user.tokens import CustomAccessToken
+
+uvicorn = pytest.importorskip('uvicorn')
+
+pytestmark = [pytest.mark.django_db(transaction=True), pytest.mark.benchmark]
+
+CONNECTIONS = 50
+REQUESTS_PER_CONNECTION = 4
+
+_CONTENT_LENGTH = re.compile(rb'content-length:\s*(\d+)', re.IGNORECASE)
+
+
+@pytest.fixture()
+def asgi_server():
+    from django.core.asgi import get_asgi_application
+
+    sock = socket.socket()
+    sock.bind(('127.0.0.1', 0))
+    config = uvicorn.Config(get_asgi_application(), lifespan='off', log_level='warning')
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+
+    yield sock.getsockname()[1]
+
+    server.should_exit = True
+    thread.join(10)
+
+
+async def _connection(port: int, request: bytes, requests: int) -> list[int]:
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    statuses = []
+    for _ in range(requests):
+        writer.write(request)
+        head = await reader.readuntil(b'\r\n\r\n')
+        statuses.append(int(head.split(b' ', 2)[1]))
+        await reader.readexactly(int(_CONTENT_LENGTH.search(head)[1]))
+    writer.close()
+    await writer.wait_closed()
+    return statuses
+
+
+def _load(port: int, path: str, token: str, connections: int = CONNECTIONS) -> list[int]:
+    request = (
+        f'GET /api{path} HTTP/1.1\r\nHost: testserver\r\nAuthorization: Bearer {token}\r\n\r\n'
+    ).encode()
+
+    async def run() -> list[int]:
+        results = await asyncio.gather(
+            *(_connection(port, request, REQUESTS_PER_CONNECTION) for _ in range(connections))
+        )
+        return [status for statuses in results for status in statuses]
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    'route', ['/services/{service}/roles', '/services/{service}/permissions', '/users/{user}']
+)
+@pytest.mark.parametrize('stack', ['sync', 'async'])
+def test_asgi_read_throughput(asgi_server, admin_user: User, stack: str, route: str, capsys):
+    service = Service.objects.create(name='bench', client_id='bench', client_secret='')
+    for i in range(20):
+        Role.objects.create(service=service, name=f'role-{i}')
+        Permission.objects.create(service=service, type=Permission.TYPE_SERVICE, code=f'p-{i}')
+    path = route.format(service=service.id, user=admin_user.id)
+    if stack == 'async':
+        path = f'/async{path}'
+    token = str(CustomAccessToken.for_user(admin_user))
+    assert _load(asgi_server, path, token, connections=1) == [200] * REQUESTS_PER_CONNECTION
+
+    start = time.perf_counter()
+    statuses = _load(asgi_server, path, token)
+    rate = len(statuses) / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        _load(asgi_server, path, token)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    with capsys.disabled():
+        print(
+            f'\n[asgi] {stack:<5} {route}: {rate:,.0f} req/s, '
+            f'{(peak - baseline) / CONNECTIONS / 1024:,.1f} KiB/connection'
+        )
+    assert set(statuses) == {200}
@@ -0,0 +1,39 @@
+"""
+Authenticated GET throughput with and without the verified token cache.
+
+Repeats the same authenticated request, as a client holding one access token does.
+"""
+
+import time
+
+import pytest
+
+from src.user.models import User
+from src.user.token_cache import token_cache
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+REQUESTS = 300
+
+
+@pytest.mark.parametrize('cache_entries', [0, 10_000])
+def test_authenticated_get_throughput(
+    api_client, regular_user: User, service, settings, cache_entries: int, capsys
+):
+    settings.AUTH_TOKEN_CACHE_MAX_ENTRIES = cache_entries
+    headers = {'Authorization': f'Bearer {CustomAccessToken.for_user(regular_user)}'}
+    url = f'/services/{service.id}/permissions/index'
+    assert api_client.get(url, headers=headers).status_code == 200
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        api_client.get(url, headers=headers)
+    rate = REQUESTS / (time.perf_counter() - start)
+
+    with capsys.disabled():
+        print(
+            f'\n[auth] token cache {"on " if cache_entries else "off"}: {rate:,.0f} req/s '
+            f'{token_cache.stats()}'
+        )
+    assert rate > 0
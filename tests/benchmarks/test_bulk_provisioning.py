@@ -0,0 +1,47 @@
+"""
+Provisioning users into a service: one bulk request vs one request per user.
+
+Users are created without passwords (as for SSO-only accounts); with passwords, hashing dominates
+and scales with ``PASSWORD_HASH_BULK_WORKERS``.
+"""
+
+import time
+
+import pytest
+
+from src.user.models import Role, Service, UserServiceRole
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+BULK_USERS = 10_000
+SINGLE_USERS = 200
+
+
+def _users(prefix: str, count: int) -> list[dict]:
+    return [{'email': f'{prefix}{i}@example.com', 'roles': ['editor']} for i in range(count)]
+
+
+def test_bulk_provisioning_throughput(
+    api_client, admin_headers, service: Service, service_role: Role, capsys
+):
+    start = time.perf_counter()
+    for user in _users('single', SINGLE_USERS):
+        api_client.post(f'/services/{service.id}/users', json=user, headers=admin_headers)
+    single_rate = SINGLE_USERS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    response = api_client.post(
+        f'/services/{service.id}/users/bulk',
+        json={'users': _users('bulk', BULK_USERS)},
+        headers=admin_headers,
+    )
+    bulk_seconds = time.perf_counter() - start
+
+    with capsys.disabled():
+        print(
+            f'\n[provisioning] one request per user: {single_rate:,.0f} users/s; '
+            f'bulk: {BULK_USERS:,} users in {bulk_seconds:.1f} s '
+            f'({BULK_USERS / bulk_seconds:,.0f} users/s)'
+        )
+    assert response.json()['created'] == BULK_USERS
+    assert UserServiceRole.objects.filter(service=service).count() == SINGLE_USERS + BULK_USERS
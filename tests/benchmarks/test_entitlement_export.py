@@ -0,0 +1,94 @@
+"""
+Streaming a service's entitlement export with 1M assignments.
+
+Fills a service with ``ASSIGNMENTS`` users (each holding one role with two permissions), then
+consumes ``GET /api/services/{id}/entitlements/export`` chunk by chunk, plain and gzipped,
+sampling the process RSS as it goes. Reports lines per second and how far RSS grew after the
+first chunk, which stays flat however many users there are.
+
+RSS is read from ``/proc/self/statm``; skipped where that is not available.
+"""
+
+import os
+import time
+import zlib
+
+import pytest
+
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark, pytest.mark.slow]
+
+ASSIGNMENTS = 1_000_000
+INSERT_BATCH = 50_000
+# RSS growth allowed between the first and the last chunk.
+MAX_RSS_GROWTH = 64 * 1024 * 1024
+
+if not os.path.exists('/proc/self/statm'):
+    pytest.skip('RSS sampling needs /proc/self/statm', allow_module_level=True)
+
+
+def _rss() -> int:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _populate(service: Service) -> None:
+    role = Role.objects.create(service=service, name='editor')
+    for code in ('read', 'write'):
+        permission = Permission.objects.create(
+            service=service, type=Permission.TYPE_SERVICE, code=code
+        )
+        RolePermission.objects.create(role=role, permission=permission)
+
+    for start in range(0, ASSIGNMENTS, INSERT_BATCH):
+        users = [
+            User(email=f'export{i}@example.com', email_normalized=f'export{i}@example.com')
+            for i in range(start, min(start + INSERT_BATCH, ASSIGNMENTS))
+        ]
+        User.objects.bulk_create(users)
+        UserServiceAssignment.objects.bulk_create(
+            UserServiceAssignment(user=user, service=service) for user in users
+        )
+        UserServiceRole.objects.bulk_create(
+            UserServiceRole(user=user, service=service, role=role) for user in users
+        )
+
+
+@pytest.mark.parametrize('encoding', ['identity', 'gzip'])
+def test_export_memory_stays_flat(client, admin_user: User, service: Service, encoding, capsys):
+    _populate(service)
+    headers = {
+        'HTTP_AUTHORIZATION': f'Bearer {CustomAccessToken.for_user(admin_user)}',
+        'HTTP_ACCEPT_ENCODING': encoding,
+    }
+
+    start = time.perf_counter()
+    response = client.get(f'/api/services/{service.id}/entitlements/export', **headers)
+    decompress = zlib.decompressobj(wbits=31) if encoding == 'gzip' else None
+    lines, sent, baseline, peak = 0, 0, None, 0
+    for chunk in response.streaming_content:
+        sent += len(chunk)
+        lines += (decompress.decompress(chunk) if decompress else chunk).count(b'\n')
+        if baseline is None:
+            baseline = _rss()
+        peak = max(peak, _rss())
+    seconds = time.perf_counter() - start
+
+    with capsys.disabled():
+        print(
+            f'\n[export] {encoding:<8} {lines:,} lines in {seconds:.1f} s '
+            f'({lines / seconds:,.0f} lines/s), {sent / 1024 / 1024:,.0f} MiB sent, '
+            f'RSS +{(peak - baseline) / 1024 / 1024:,.1f} MiB after the first chunk'
+        )
+    assert lines == ASSIGNMENTS
+    assert peak - baseline < MAX_RSS_GROWTH
@@ -0,0 +1,82 @@
+"""
+Latency under a burst of concurrent logins: sync vs async login endpoint.
+
+Under ASGI, Django runs sync views one at a time on a single thread, so concurrent sync logins
+queue behind each other's password hash, and so does every other sync request. The async endpoint
+hashes on the bounded pool instead. Both modes are driven from one event loop the way an ASGI
+server would, with sync token refreshes ("probes") sent during the burst.
+
+Login latency itself is bounded by CPU cores; the probes show whether the rest of the API starves.
+"""
+
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from ninja.testing import TestAsyncClient, TestClient
+
+from src.user.api import api
+from src.user.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+CONCURRENT_LOGINS = 8
+PROBES = 8
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+async def _timed(request, delay: float = 0.0) -> float:
+    await asyncio.sleep(delay)
+    start = time.perf_counter()
+    response = await request()
+    assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+def _run_burst(mode: str, credentials: dict, refresh_token: str) -> tuple[list, list]:
+    sync_post = sync_to_async(TestClient(api).post, thread_sensitive=True)
+    async_client = TestAsyncClient(api)
+
+    def login():
+        if mode == 'sync':
+            return sync_post('/auth/login', json=credentials)
+        return async_client.post('/auth/async/login', json=credentials)
+
+    def probe():
+        return sync_post('/auth/refresh', json={'refresh_token': refresh_token})
+
+    async def run():
+        logins = [_timed(login) for _ in range(CONCURRENT_LOGINS)]
+        probes = [_timed(probe, delay=0.05 * (i + 1)) for i in range(PROBES)]
+        results = await asyncio.gather(*logins, *probes)
+        return results[:CONCURRENT_LOGINS], results[CONCURRENT_LOGINS:]
+
+    return async_to_sync(run)()
+
+
+def _summary(values: list[float]) -> str:
+    return (
+        f'p50={_percentile(values, 50) * 1000:.0f} ms p99={_percentile(values, 99) * 1000:.0f} ms'
+    )
+
+
+def test_login_burst_latency(api_client, regular_user: User, settings, capsys):
+    settings.PASSWORD_HASH_MAX_QUEUE = CONCURRENT_LOGINS
+    settings.LOGIN_THROTTLE_ENABLED = False
+    credentials = {'email': regular_user.email, 'password': 'password123'}
+    refresh_token = api_client.post('/auth/login', json=credentials).json()['refresh_token']
+
+    results = {mode: _run_burst(mode, credentials, refresh_token) for mode in ('sync', 'async')}
+
+    with capsys.disabled():
+        for mode, (logins, probes) in results.items():
+            print(
+                f'\n[login burst] {mode:<5} x{CONCURRENT_LOGINS}: logins {_summary(logins)}; '
+                f'other requests {_summary(probes)}'
+            )
+    assert _percentile(results['async'][1], 99) < _percentile(results['sync'][1], 99)
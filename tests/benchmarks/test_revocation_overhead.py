@@ -0,0 +1,59 @@
+"""
+Overhead of the revoked-token check for tokens that were not revoked.
+
+Fills the revocation list, then compares the Bloom-filtered check with verifying the token itself.
+"""
+
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from src.user.models import RevokedToken, User
+from src.user.revoked_tokens import revoked_tokens
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+REVOKED = 10_000
+CHECKS = 2_000
+
+
+def test_non_revoked_check_is_negligible(regular_user: User, capsys):
+    expires_at = timezone.now() + timedelta(hours=1)
+    RevokedToken.objects.bulk_create(
+        RevokedToken(
+            jti=uuid.uuid4().hex,
+            user_id=regular_user.id,
+            token_type='access',
+            expires_at=expires_at,
+        )
+        for _ in range(REVOKED)
+    )
+    raw = str(CustomAccessToken.for_user(regular_user))
+    jtis = [uuid.uuid4().hex for _ in range(CHECKS)]
+    revoked_tokens.is_revoked(jtis[0])
+
+    start = time.perf_counter()
+    with CaptureQueriesContext(connection) as queries:
+        for jti in jtis:
+            revoked_tokens.is_revoked(jti)
+    check = (time.perf_counter() - start) / CHECKS
+
+    start = time.perf_counter()
+    for _ in range(CHECKS):
+        CustomAccessToken(raw)
+    verify = (time.perf_counter() - start) / CHECKS
+
+    with capsys.disabled():
+        print(
+            f'\n[revocation] {REVOKED} revoked: check={check * 1e6:.1f} us, '
+            f'verify={verify * 1e6:.1f} us ({check / verify:.1%} of verify), '
+            f'db lookups={len(queries)}/{CHECKS}'
+        )
+    assert len(queries) <= CHECKS // 100
+    assert check < verify
@@ -0,0 +1,53 @@
+"""
+Client-credentials token throughput of one worker: with and without the verified-secret cache,
+and with token reuse.
+
+Each request authenticates the same client, as a service fetching a token per job does.
+"""
+
+import time
+
+import pytest
+
+from src.user.models import Service
+from src.user.service_auth import verified_secrets
+from src.user.service_tokens import service_token_cache
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+REQUESTS = 200
+
+
+@pytest.mark.parametrize(('cache_ttl', 'reuse_min_remaining'), [(0, 1), (60, 1), (60, 0.5)])
+def test_service_token_throughput(
+    api_client,
+    service: Service,
+    service_client_secret: str,
+    settings,
+    cache_ttl: int,
+    reuse_min_remaining: float,
+    capsys,
+):
+    settings.SERVICE_SECRET_CACHE_TTL_SECONDS = cache_ttl
+    settings.SERVICE_TOKEN_REUSE_MIN_REMAINING = reuse_min_remaining
+    data = {
+        'grant_type': 'client_credentials',
+        'client_id': service.client_id,
+        'client_secret': service_client_secret,
+    }
+    assert api_client.post('/auth/token', data=data).status_code == 200
+
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        api_client.post('/auth/token', data=data)
+    rate = REQUESTS / (time.perf_counter() - start)
+
+    with capsys.disabled():
+        print(
+            f'\n[service token] secret cache {"on " if cache_ttl else "off"}, '
+            f'reuse {"on " if reuse_min_remaining < 1 else "off"}: '
+            f'{rate:,.0f} tokens/s per worker '
+            f'(hash iterations {settings.SERVICE_SECRET_HASH_ITERATIONS}) '
+            f'secrets {verified_secrets.stats()} tokens {service_token_cache.stats()}'
+        )
+    assert rate > 0
@@ -0,0 +1,42 @@
+"""
+Sign/verify throughput per algorithm.
+
+Signs and verifies a typical access token with the shared HS256 secret and with each supported
+asymmetric key type, to help pick an algorithm for the expected login volume.
+"""
+
+import time
+
+import pytest
+
+from src.user.models import User
+from src.user.signing_keys import create_signing_key, key_ring
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+ROUNDS = 200
+
+
+def _ops_per_second(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        fn()
+    return ROUNDS / (time.perf_counter() - start)
+
+
+@pytest.mark.parametrize('algorithm', ['HS256', 'RS256', 'ES256', 'EdDSA'])
+def test_sign_verify_throughput(regular_user: User, algorithm: str, capsys):
+    if algorithm != 'HS256':
+        create_signing_key(algorithm, activate=True)
+    key_ring.get()
+
+    token = CustomAccessToken.for_user(regular_user)
+    encoded = str(token)
+
+    sign = _ops_per_second(lambda: str(token))
+    verify = _ops_per_second(lambda: CustomAccessToken(encoded))
+
+    with capsys.disabled():
+        print(f'\n[signing] {algorithm:<6} sign={sign:,.0f}/s verify={verify:,.0f}/s')
+    assert sign > 0 and verify > 0
@@ -0,0 +1,65 @@
+"""
+Token size: full vs compact claims.
+
+Generates a service with a large permission catalog and a user holding most of it through roles,
+then compares the encoded size of both claim formats.
+"""
+
+import pytest
+
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+from src.user.snapshots import refresh_snapshots
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.benchmark]
+
+SERVICES = 3
+PERMISSIONS_PER_SERVICE = 300
+ROLES_PER_SERVICE = 4
+
+
+def _generate(user: User) -> None:
+    for s in range(SERVICES):
+        service = Service.objects.create(
+            name=f'bench-{s}', client_id=f'bench-{s}', client_secret='x'
+        )
+        permissions = [
+            Permission.objects.create(
+                type=Permission.TYPE_SERVICE,
+                service=service,
+                code=f'resource_{i // 5}:action_{i % 5}',
+            )
+            for i in range(PERMISSIONS_PER_SERVICE)
+        ]
+        UserServiceAssignment.objects.create(user=user, service=service)
+        for r in range(ROLES_PER_SERVICE):
+            role = Role.objects.create(service=service, name=f'role-{r}')
+            RolePermission.objects.bulk_create(
+                RolePermission(role=role, permission=p)
+                for p in permissions[r :: ROLES_PER_SERVICE + 1]
+            )
+            UserServiceRole.objects.create(user=user, service=service, role=role)
+
+
+def test_compact_claims_are_an_order_of_magnitude_smaller(regular_user: User, capsys):
+    _generate(regular_user)
+    # bulk_create skips the snapshot hooks.
+    refresh_snapshots([regular_user.id])
+
+    full = str(CustomAccessToken.for_user(regular_user))
+    compact = str(CustomAccessToken.for_user(regular_user, claims_format='compact'))
+
+    with capsys.disabled():
+        print(
+            f'\n[token size] {SERVICES} services x {PERMISSIONS_PER_SERVICE} permissions: '
+            f'full={len(full)} B, compact={len(compact)} B, ratio={len(full) / len(compact):.1f}x'
+        )
+    assert len(full) >= 10 * len(compact)
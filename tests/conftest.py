@@ -39,6 +39,31 @@ def _jwt_settings(settings):
     }
 
 
+@pytest.fixture(autouse=True)
+def _clear_caches():
+    """Keep in-process and Django caches from leaking state between tests."""
+    from django.core.cache import cache
+
+    from src.user.claims_cache import claims_cache
+    from src.user.revocation import not_before_table
+    from src.user.revoked_tokens import revoked_tokens
+    from src.user.service_auth import verified_secrets
+    from src.user.service_tokens import service_token_cache
+    from src.user.signing_keys import key_ring
+    from src.user.throttling import login_throttle
+    from src.user.token_cache import token_cache
+
+    cache.clear()
+    claims_cache.clear()
+    key_ring.invalidate()
+    not_before_table.clear()
+    token_cache.clear()
+    revoked_tokens.clear()
+    login_throttle.clear()
+    verified_secrets.clear()
+    service_token_cache.clear()
+
+
 @pytest.fixture()
 def api_client():
     from ninja.testing import TestClient
@@ -53,20 +78,33 @@ def admin_user():
     return UserFactory(is_staff=True, is_superuser=True)
 
 
+@pytest.fixture()
+def admin_headers(admin_user) -> dict[str, str]:
+    from src.user.tokens import CustomAccessToken
+
+    return {'Authorization': f'Bearer {CustomAccessToken.for_user(admin_user)}'}
+
+
 @pytest.fixture()
 def regular_user():
     return UserFactory()
 
 
 @pytest.fixture()
-def service():
+def service_client_secret() -> str:
+    return f'secret-{uuid.uuid4().hex}'
+
+
+@pytest.fixture()
+def service(service_client_secret):
     from src.user.models import Service
+    from src.user.service_auth import hash_client_secret
 
     return Service.objects.create(
         name=f'service-{uuid.uuid4().hex}',
         description='Test service',
         client_id=f'client-{uuid.uuid4().hex}',
-        client_secret=f'secret-{uuid.uuid4().hex}',
+        client_secret=hash_client_secret(service_client_secret),
         status='ACTIVE',
     )
 
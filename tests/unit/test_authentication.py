@@ -1,9 +1,11 @@
 from unittest.mock import Mock
 
 import pytest
+from asgiref.sync import async_to_sync
 
-from src.user.auth import AdminAuth, JWTAuth
+from src.user.auth import AdminAuth, AsyncAdminAuth, AsyncJWTAuth, JWTAuth
 from src.user.models import User
+from src.user.revoked_tokens import revoke_token
 from src.user.tokens import CustomAccessToken
 
 pytestmark = [pytest.mark.django_db, pytest.mark.unit]
@@ -86,3 +88,49 @@ def test_admin_auth_rejects_non_staff_user(regular_user: User):
     result = AdminAuth().authenticate(request, str(token))
 
     assert result is None
+
+
+def _authenticate_async(auth: AsyncJWTAuth, token: str):
+    return async_to_sync(auth.authenticate)(Mock(), token)
+
+
+def test_async_jwt_auth_accepts_valid_token(regular_user: User):
+    token = CustomAccessToken.for_user(regular_user)
+
+    result = _authenticate_async(AsyncJWTAuth(), str(token))
+
+    assert result is not None
+    assert result.id == regular_user.id
+
+
+@pytest.mark.parametrize('token', ['', 'not-a-jwt'])
+def test_async_jwt_auth_returns_none_for_invalid_token(token: str):
+    assert _authenticate_async(AsyncJWTAuth(), token) is None
+
+
+def test_async_jwt_auth_returns_none_for_unknown_or_inactive_user(admin_user: User, regular_user):
+    deleted = str(CustomAccessToken.for_user(regular_user))
+    regular_user.delete()
+    admin_user.deactivate()
+    inactive = str(CustomAccessToken.for_user(admin_user))
+
+    assert _authenticate_async(AsyncJWTAuth(), deleted) is None
+    assert _authenticate_async(AsyncJWTAuth(), inactive) is None
+
+
+def test_async_jwt_auth_rejects_revoked_token(regular_user: User, settings):
+    settings.AUTH_TOKEN_CACHE_MAX_ENTRIES = 100
+    token = CustomAccessToken.for_user(regular_user)
+    assert _authenticate_async(AsyncJWTAuth(), str(token)) is not None
+
+    revoke_token(token)
+
+    assert _authenticate_async(AsyncJWTAuth(), str(token)) is None
+
+
+def test_async_admin_auth_requires_staff(admin_user: User, regular_user: User):
+    admin_token = str(CustomAccessToken.for_user(admin_user))
+    regular_token = str(CustomAccessToken.for_user(regular_user))
+
+    assert _authenticate_async(AsyncAdminAuth(), admin_token).id == admin_user.id
+    assert _authenticate_async(AsyncAdminAuth(), regular_token) is None
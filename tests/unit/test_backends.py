@@ -43,3 +43,14 @@ def test_email_backend_get_user_unknown_returns_none():
     backend = EmailBackend()
 
     assert backend.get_user('00000000-0000-0000-0000-000000000000') is None
+
+
+def test_email_backend_matches_email_case_insensitively(regular_user: User):
+    backend = EmailBackend()
+
+    user = backend.authenticate(
+        None, email=f'  {regular_user.email.upper()} ', password='password123'
+    )
+
+    assert user is not None
+    assert user.id == regular_user.id
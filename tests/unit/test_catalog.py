@@ -0,0 +1,121 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.user.catalog import InvalidCatalog, sync_catalog
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+from src.user.permission_index import get_index
+from src.user.schemas import ServiceCatalog
+from src.user.snapshots import get_claims
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _catalog(roles: dict[str, list[str]], codes=('read', 'write', 'admin'), **descriptions):
+    return ServiceCatalog(
+        permissions=[{'code': c, 'description': descriptions.get(c, '')} for c in codes],
+        roles=[{'name': name, 'permissions': perms} for name, perms in roles.items()],
+    )
+
+
+def _stored(service: Service) -> tuple[set, dict]:
+    mappings: dict[str, set] = {}
+    for name, code in RolePermission.objects.filter(role__service=service).values_list(
+        'role__name', 'permission__code'
+    ):
+        mappings.setdefault(name, set()).add(code)
+    return set(Permission.objects.filter(service=service).values_list('code', flat=True)), mappings
+
+
+def test_first_sync_creates_everything(service: Service):
+    summary = sync_catalog(service, _catalog({'viewer': ['read'], 'editor': ['read', 'write']}))
+
+    assert summary.changed
+    assert (summary.permissions.created, summary.roles.created) == (3, 2)
+    assert summary.role_permissions.created == 3
+    assert _stored(service) == (
+        {'read', 'write', 'admin'},
+        {'viewer': {'read'}, 'editor': {'read', 'write'}},
+    )
+    assert sorted(get_index(service.id).bits.values()) == [0, 1, 2]
+
+
+def test_unchanged_catalog_only_reads(service: Service):
+    catalog = _catalog({'viewer': ['read'], 'editor': ['read', 'write']})
+    sync_catalog(service, catalog)
+    version = get_index(service.id).version
+
+    with CaptureQueriesContext(connection) as queries:
+        summary = sync_catalog(service, catalog)
+
+    assert not summary.changed
+    statements = [q['sql'].split()[0] for q in queries.captured_queries]
+    assert [s for s in statements if s in ('INSERT', 'UPDATE', 'DELETE')] == []
+    assert statements.count('SELECT') == 4
+    assert get_index(service.id).version == version
+
+
+def test_sync_applies_only_the_difference(service: Service):
+    sync_catalog(service, _catalog({'viewer': ['read'], 'editor': ['read', 'write']}))
+    read = Permission.objects.get(service=service, code='read')
+
+    summary = sync_catalog(
+        service,
+        _catalog(
+            {'viewer': ['read', 'audit'], 'owner': ['admin']},
+            codes=('read', 'admin', 'audit'),
+            read='Read things',
+        ),
+    )
+
+    assert (summary.permissions.created, summary.permissions.updated) == (1, 1)
+    assert summary.permissions.deleted == 1
+    assert (summary.roles.created, summary.roles.deleted) == (1, 1)
+    assert (summary.role_permissions.created, summary.role_permissions.deleted) == (2, 0)
+    assert _stored(service) == (
+        {'read', 'admin', 'audit'},
+        {'viewer': {'read', 'audit'}, 'owner': {'admin'}},
+    )
+    read.refresh_from_db()
+    assert read.description == 'Read things'
+    # Bits are never reused, so the new permission gets a fresh one.
+    assert get_index(service.id).bits == {'read': 0, 'admin': 2, 'audit': 3}
+
+
+def test_mapping_changes_reach_role_holders(service: Service, regular_user: User):
+    sync_catalog(service, _catalog({'editor': ['read']}))
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(
+        user=regular_user, service=service, role=Role.objects.get(service=service)
+    )
+
+    sync_catalog(service, _catalog({'editor': ['read', 'admin']}))
+
+    # The stored snapshot, which bulk writes only update through the notification.
+    claims = get_claims(regular_user.id)
+    assert claims['services'][str(service.id)]['permissions'] == ['admin', 'read']
+
+
+@pytest.mark.parametrize(
+    'catalog, message',
+    [
+        (_catalog({}, codes=('read', 'read')), 'Duplicate permissions: read'),
+        (
+            ServiceCatalog(roles=[{'name': 'a'}, {'name': 'a', 'permissions': ['nope']}]),
+            'Duplicate roles: a; Unknown permissions: nope',
+        ),
+    ],
+)
+def test_invalid_catalog_changes_nothing(service: Service, catalog, message):
+    with pytest.raises(InvalidCatalog, match=message):
+        sync_catalog(service, catalog)
+
+    assert not Permission.objects.filter(service=service).exists()
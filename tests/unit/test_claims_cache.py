@@ -0,0 +1,106 @@
+import pytest
+
+from src.user.claims_cache import (
+    ClaimsCache,
+    bump_entitlement_version,
+    claims_cache,
+    current_versions,
+)
+from src.user.models import User, UserGlobalRole
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeated_mints_hit_the_cache(regular_user: User, django_assert_num_queries):
+    CustomAccessToken.for_user(regular_user)
+
+    with django_assert_num_queries(0):
+        CustomAccessToken.for_user(regular_user)
+
+    assert claims_cache.stats()['hits'] >= 1
+
+
+def test_grant_change_is_never_served_stale(
+    regular_user: User, global_role, django_capture_on_commit_callbacks
+):
+    assert CustomAccessToken.for_user(regular_user)['global_roles'] == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        UserGlobalRole.objects.create(user=regular_user, role=global_role)
+
+    assert CustomAccessToken.for_user(regular_user)['global_roles'] == ['super_admin']
+
+
+def test_version_is_bumped_only_after_commit(
+    regular_user: User, global_role, django_capture_on_commit_callbacks
+):
+    CustomAccessToken.for_user(regular_user)
+    before = current_versions(regular_user.id)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        UserGlobalRole.objects.create(user=regular_user, role=global_role)
+        # Until the commit, readers keep the old version and the claims cached under it.
+        assert current_versions(regular_user.id) == before
+        assert len(claims_cache) == 1
+
+    for callback in callbacks:
+        callback()
+    assert current_versions(regular_user.id) != before
+    assert len(claims_cache) == 0
+
+
+def test_global_version_bump_invalidates_all_entries():
+    cache = ClaimsCache()
+    loads: list[str] = []
+
+    def loader() -> dict:
+        loads.append('x')
+        return {}
+
+    cache.get_or_load('u1', loader)
+    cache.get_or_load('u1', loader)
+    bump_entitlement_version()
+    cache.get_or_load('u1', loader)
+
+    assert len(loads) == 2
+
+
+def test_cache_is_bounded_and_counts_evictions(settings):
+    settings.CLAIMS_CACHE_MAX_ENTRIES = 2
+    cache = ClaimsCache()
+
+    for user_id in ('u1', 'u2', 'u3'):
+        cache.get_or_load(user_id, dict)
+    cache.get_or_load('u3', dict)
+
+    assert cache.stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2}
+
+
+def test_entries_expire_after_ttl(settings):
+    settings.CLAIMS_CACHE_TTL_SECONDS = 10
+    clock = FakeClock()
+    cache = ClaimsCache(clock=clock)
+
+    cache.get_or_load('u1', dict)
+    clock.now = 11
+    cache.get_or_load('u1', dict)
+
+    assert cache.stats()['misses'] == 2
+
+
+def test_zero_max_entries_disables_caching(settings):
+    settings.CLAIMS_CACHE_MAX_ENTRIES = 0
+    cache = ClaimsCache()
+
+    cache.get_or_load('u1', dict)
+
+    assert len(cache) == 0
@@ -0,0 +1,29 @@
+"""Case-insensitive email lookups must be answered from an index, not a table scan."""
+
+import pytest
+from django.db import connection
+
+from src.user.models import User
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _plan(queryset) -> str:
+    if connection.vendor == 'postgresql':
+        # A handful of rows would otherwise make a sequential scan the cheaper plan.
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    return queryset.explain()
+
+
+def test_email_lookup_uses_index(regular_user: User):
+    plan = _plan(User.objects.by_email(regular_user.email.upper()))
+
+    if connection.vendor == 'sqlite':
+        assert 'USING INDEX' in plan or 'USING COVERING INDEX' in plan
+        assert 'email_normalized=?' in plan
+    elif connection.vendor == 'postgresql':
+        assert 'Index' in plan and 'Seq Scan' not in plan
+        assert 'email_normalized' in plan
+    else:
+        pytest.skip(f'No plan expectations for {connection.vendor}')
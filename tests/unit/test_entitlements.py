@@ -0,0 +1,120 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.user.entitlements import (
+    resolve_entitlements,
+    resolve_entitlements_bulk,
+    resolve_services,
+)
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserGlobalPermission,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _grant_services(user: User, n_services: int, n_roles: int) -> None:
+    for i in range(n_services):
+        service = Service.objects.create(
+            name=f'svc-{user.id}-{i}', client_id=f'cid-{user.id}-{i}', client_secret='x'
+        )
+        UserServiceAssignment.objects.create(user=user, service=service)
+        direct = Permission.objects.create(
+            type=Permission.TYPE_SERVICE, service=service, code='direct'
+        )
+        UserServicePermission.objects.create(user=user, service=service, permission=direct)
+        for j in range(n_roles):
+            role = Role.objects.create(service=service, name=f'role-{j}')
+            perm = Permission.objects.create(
+                type=Permission.TYPE_SERVICE, service=service, code=f'perm-{j}'
+            )
+            RolePermission.objects.create(role=role, permission=perm)
+            UserServiceRole.objects.create(user=user, service=service, role=role)
+
+
+def test_resolve_entitlements_merges_direct_and_role_permissions(
+    regular_user: User,
+    service,
+    global_permission: Permission,
+    global_role,
+    service_permission: Permission,
+    service_role,
+):
+    UserGlobalRole.objects.create(user=regular_user, role=global_role)
+    global_only_via_role = Permission.objects.create(type=Permission.TYPE_GLOBAL, code='audit')
+    RolePermission.objects.create(role=global_role, permission=global_only_via_role)
+    UserGlobalPermission.objects.create(user=regular_user, permission=global_permission)
+
+    write = Permission.objects.create(type=Permission.TYPE_SERVICE, service=service, code='write')
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServicePermission.objects.create(
+        user=regular_user, service=service, permission=service_permission
+    )
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+    RolePermission.objects.create(role=service_role, permission=write)
+
+    entitlements = resolve_entitlements(regular_user.id)
+
+    assert entitlements.global_roles == ('super_admin',)
+    assert entitlements.global_permissions == ('admin', 'audit')
+    assert len(entitlements.services) == 1
+    svc = entitlements.services[0]
+    assert svc.service_id == str(service.id)
+    assert svc.service_name == service.name
+    assert svc.roles == ('editor',)
+    assert svc.direct_permissions == ('read',)
+    assert svc.permissions == ('read', 'write')
+
+
+def test_resolve_services_ignores_unassigned_services(regular_user: User, service, service_role):
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+
+    assert resolve_services(regular_user.id) == ()
+
+
+def test_resolve_services_can_be_scoped_to_one_service(regular_user: User):
+    _grant_services(regular_user, n_services=3, n_roles=1)
+    target = Service.objects.filter(user_assignments__user=regular_user).first()
+
+    services = resolve_services(regular_user.id, service_id=target.id)
+
+    assert [s.service_id for s in services] == [str(target.id)]
+
+
+def test_resolve_entitlements_query_count_is_constant(regular_user: User, admin_user: User):
+    _grant_services(regular_user, n_services=1, n_roles=1)
+    _grant_services(admin_user, n_services=40, n_roles=3)
+
+    with CaptureQueriesContext(connection) as small:
+        resolve_entitlements(regular_user.id)
+    with CaptureQueriesContext(connection) as large:
+        entitlements = resolve_entitlements(admin_user.id)
+
+    assert len(entitlements.services) == 40
+    assert all(len(s.permissions) == 4 for s in entitlements.services)
+    assert len(large.captured_queries) == len(small.captured_queries) <= 5
+
+
+def test_resolve_entitlements_bulk_keeps_users_apart(
+    regular_user: User, admin_user: User, global_role, global_permission: Permission
+):
+    RolePermission.objects.create(role=global_role, permission=global_permission)
+    UserGlobalRole.objects.create(user=admin_user, role=global_role)
+    _grant_services(regular_user, n_services=2, n_roles=1)
+
+    result = resolve_entitlements_bulk([regular_user.id, admin_user.id])
+
+    assert result[str(admin_user.id)].global_permissions == ('admin',)
+    assert result[str(admin_user.id)].services == ()
+    assert result[str(regular_user.id)].global_permissions == ()
+    assert len(result[str(regular_user.id)].services) == 2
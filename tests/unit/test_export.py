@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from src.user.export import export_lines
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+@pytest.fixture()
+def members(service: Service, service_role: Role, service_permission: Permission) -> list[User]:
+    write = Permission.objects.create(service=service, type=Permission.TYPE_SERVICE, code='write')
+    RolePermission.objects.create(role=service_role, permission=write)
+    users = [User.objects.create(email=f'member{i}@example.com', password='!') for i in range(5)]
+    for i, user in enumerate(users):
+        UserServiceAssignment.objects.create(user=user, service=service)
+        if i % 2:
+            UserServiceRole.objects.create(user=user, service=service, role=service_role)
+        if i % 3 == 0:
+            UserServicePermission.objects.create(
+                user=user, service=service, permission=service_permission
+            )
+    return users
+
+
+def _export(service: Service, **kwargs) -> list[dict]:
+    return [
+        json.loads(line)
+        for chunk in export_lines(service.id, **kwargs)
+        for line in chunk.decode().splitlines()
+    ]
+
+
+def test_export_lists_each_member_with_effective_permissions(service: Service, members):
+    other = Service.objects.create(name='other', client_id='other', client_secret='')
+    UserServiceAssignment.objects.create(user=members[0], service=other)
+
+    lines = _export(service)
+
+    assert [line['user_id'] for line in lines] == sorted(str(u.id) for u in members)
+    by_email = {line['email']: line for line in lines}
+    assert by_email['member0@example.com'] == {
+        'user_id': str(members[0].id),
+        'email': 'member0@example.com',
+        'status': 'ACTIVE',
+        'roles': [],
+        'permissions': ['read'],
+    }
+    assert by_email['member1@example.com']['roles'] == ['editor']
+    assert by_email['member1@example.com']['permissions'] == ['write']
+    assert by_email['member3@example.com']['permissions'] == ['read', 'write']
+    assert by_email['member2@example.com']['permissions'] == []
+
+
+def test_export_batches_queries(service: Service, members, django_assert_max_num_queries):
+    with django_assert_max_num_queries(4 * 3):
+        chunks = list(export_lines(service.id, batch_size=2))
+
+    assert len(chunks) == 3
+    assert _export(service, batch_size=2) == _export(service)
+
+
+def test_export_of_service_without_members_is_empty(service: Service):
+    assert list(export_lines(service.id)) == []
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.hashers import check_password, is_password_usable
+
+from src.user.hashing import PasswordHashPool, PoolSaturated, hash_passwords
+from src.user.models import User
+
+pytestmark = [pytest.mark.unit]
+
+
+def test_pool_rejects_checks_beyond_workers_and_queue():
+    pool = PasswordHashPool(workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(lambda: 'queued'))
+        await asyncio.sleep(0)
+        assert pool.in_flight == 2
+
+        with pytest.raises(PoolSaturated):
+            await pool.run(lambda: 'rejected')
+
+        release.set()
+        return await running, await queued
+
+    try:
+        assert async_to_sync(scenario)() == (True, 'queued')
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert pool.stats() | {'submitted': 2, 'rejected': 1, 'in_flight': 0} == pool.stats()
+
+
+@pytest.mark.django_db
+def test_check_password_runs_on_pool(regular_user: User):
+    pool = PasswordHashPool(workers=2, max_queue=0)
+
+    try:
+        assert async_to_sync(pool.check_password)(regular_user, 'password123') is True
+        assert async_to_sync(pool.check_password)(regular_user, 'wrong') is False
+    finally:
+        pool.shutdown()
+
+
+@pytest.mark.parametrize('workers', [1, 3])
+def test_hash_passwords_keeps_order(settings, workers: int):
+    settings.PASSWORD_HASH_BULK_WORKERS = workers
+
+    hashed = hash_passwords(['first', None, 'third'])
+
+    assert check_password('first', hashed[0])
+    assert not is_password_usable(hashed[1])
+    assert check_password('third', hashed[2])
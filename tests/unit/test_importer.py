@@ -0,0 +1,168 @@
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+from django.contrib.auth.hashers import PBKDF2PasswordHasher
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from src.user.importer import Checkpoint, Importer
+from src.user.models import (
+    Permission,
+    Role,
+    RolePermission,
+    Service,
+    User,
+    UserEntitlementSnapshot,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+from src.user.permission_index import get_index
+from src.user.snapshots import get_claims
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+# Cheap to verify, unlike hashes with the default iteration count.
+PASSWORD_HASH = PBKDF2PasswordHasher().encode('imported-secret', 'somesalt', iterations=1)
+
+
+def _write(path: Path, text: str) -> str:
+    path.write_text(text.lstrip())
+    return str(path)
+
+
+def _ndjson(path: Path, records: list[dict]) -> str:
+    return _write(path, ''.join(json.dumps(r) + '\n' for r in records))
+
+
+@pytest.fixture()
+def files(tmp_path: Path) -> dict[str, str]:
+    return {
+        'services': _write(tmp_path / 'services.csv', 'name,description\nbilling,Invoices\n'),
+        'permissions': _write(
+            tmp_path / 'permissions.csv',
+            'service,code\nbilling,read\nbilling,write\nbilling,refund\n,audit\n',
+        ),
+        'roles': _ndjson(
+            tmp_path / 'roles.ndjson',
+            [
+                {'service': 'billing', 'name': 'clerk', 'permissions': ['read', 'write']},
+                {'name': 'auditor', 'permissions': ['audit']},
+            ],
+        ),
+        'role_permissions': _write(
+            tmp_path / 'role_permissions.csv', 'service,role,permission\nbilling,clerk,refund\n'
+        ),
+        'users': _ndjson(
+            tmp_path / 'users.ndjson',
+            [
+                {'email': 'Ann@Example.com', 'name': 'Ann', 'password_hash': PASSWORD_HASH},
+                {'email': 'bob@example.com', 'roles': ['auditor'], 'status': 'INACTIVE'},
+            ],
+        ),
+        'assignments': _write(
+            tmp_path / 'assignments.csv', 'email,service,roles\nann@example.com,billing,clerk\n'
+        ),
+    }
+
+
+def _import(files: dict[str, str], *args: str) -> None:
+    options = [arg for kind, path in files.items() for arg in (f'--{kind.replace("_", "-")}', path)]
+    call_command('import_identities', *options, *args)
+
+
+def test_import_creates_everything(files):
+    _import(files)
+
+    billing = Service.objects.get(name='billing')
+    assert billing.description == 'Invoices'
+    assert sorted(get_index(billing.id).bits.values()) == [0, 1, 2]
+    assert Permission.objects.get(code='audit').type == Permission.TYPE_GLOBAL
+    assert set(
+        RolePermission.objects.filter(role__name='clerk').values_list('permission__code', flat=True)
+    ) == {'read', 'write', 'refund'}
+
+    ann = User.objects.get(email_normalized='ann@example.com')
+    assert ann.password == PASSWORD_HASH
+    assert ann.check_password('imported-secret')
+    bob = User.objects.get(email='bob@example.com')
+    assert bob.status == 'INACTIVE'
+    assert not bob.has_usable_password()
+    assert UserGlobalRole.objects.get(user=bob).role.name == 'auditor'
+    assert UserServiceRole.objects.get(user=ann).role.name == 'clerk'
+
+    # Snapshots were refreshed per batch, without per-row signals.
+    assert UserEntitlementSnapshot.objects.count() == 2
+    assert get_claims(ann.id)['services'][str(billing.id)]['permissions'] == [
+        'read',
+        'refund',
+        'write',
+    ]
+    assert get_claims(bob.id)['global_permissions'] == ['audit']
+
+
+def test_import_can_be_repeated(files):
+    _import(files)
+    _import(files)
+
+    assert Service.objects.count() == 1
+    assert Permission.objects.count() == 4
+    assert Role.objects.count() == 2
+    assert User.objects.count() == 2
+    assert UserServiceAssignment.objects.count() == 1
+    assert RolePermission.objects.count() == 4
+
+
+def test_snapshots_can_be_left_for_afterwards(files):
+    _import(files, '--skip-snapshots', '--batch-size', '1')
+
+    assert User.objects.count() == 2
+    assert not UserEntitlementSnapshot.objects.exists()
+
+
+def test_rejected_rows_are_reported_and_skipped(files, tmp_path: Path, capsys):
+    files['assignments'] = _write(
+        tmp_path / 'assignments.csv',
+        'email,service,roles\n'
+        'ann@example.com,billing,clerk\n'
+        'ghost@example.com,billing,clerk\n'
+        'bob@example.com,billing,boss\n'
+        'not-an-email,billing,\n',
+    )
+
+    with pytest.raises(CommandError, match='3 row'):
+        _import(files)
+
+    errors = capsys.readouterr().err.splitlines()
+    assert errors[0].startswith(f'{files["assignments"]}:5: email: value is not a valid email')
+    assert errors[1:] == [
+        f'{files["assignments"]}:3: Unknown user: ghost@example.com',
+        f'{files["assignments"]}:4: Unknown roles: boss',
+    ]
+    assert UserServiceAssignment.objects.count() == 1
+
+
+def test_interrupted_import_resumes_from_checkpoint(tmp_path: Path):
+    path = str(tmp_path / 'users.ndjson.gz')
+    with gzip.open(path, 'wt') as stream:
+        for i in range(5):
+            stream.write(json.dumps({'email': f'u{i}@example.com', 'password_hash': PASSWORD_HASH}))
+            stream.write('\n')
+    checkpoint = tmp_path / 'import.checkpoint'
+
+    def interrupt(message: str) -> None:
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        Importer(batch_size=2, checkpoint=Checkpoint(checkpoint), progress=interrupt).import_file(
+            'users', path
+        )
+    assert User.objects.count() == 2
+
+    result = Importer(batch_size=2, checkpoint=Checkpoint(checkpoint)).import_file('users', path)
+
+    assert result.rows == 3
+    assert User.objects.count() == 5
+    assert Checkpoint(checkpoint).done('users', path) == 5
@@ -0,0 +1,119 @@
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.db import connection
+from django.utils import timezone
+
+from src.user.models import Role, Service
+from src.user.pagination import (
+    InvalidCursor,
+    _page_query,
+    apaginate,
+    decode_cursor,
+    encode_cursor,
+    page_limit,
+    paginate,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+@pytest.fixture()
+def roles(service: Service) -> list[Role]:
+    """Seven roles, the first four sharing one ``created_at``, in pagination order."""
+    Role.objects.bulk_create(Role(service=service, name=f'role-{i}') for i in range(7))
+    start = timezone.now() - timedelta(hours=1)
+    rows = list(Role.objects.filter(service=service).order_by('id'))
+    for i, role in enumerate(rows):
+        role.created_at = start + timedelta(seconds=max(0, i - 3))
+    Role.objects.bulk_update(rows, ['created_at'])
+    return rows
+
+
+def _walk(queryset, limit: int, cursor: str | None = None) -> list:
+    items = []
+    while True:
+        page = paginate(queryset, cursor, limit)
+        items.extend(page.items)
+        if page.next_cursor is None:
+            return items
+        cursor = page.next_cursor
+
+
+def test_cursor_round_trips():
+    created_at = timezone.now()
+    role = Role(created_at=created_at)
+
+    assert decode_cursor(encode_cursor(created_at, role.id)) == (created_at, role.id)
+
+
+@pytest.mark.parametrize('cursor', ['', 'not-a-cursor', encode_cursor(timezone.now(), 'x')[:-4]])
+def test_malformed_cursor_is_rejected(cursor: str):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor or '=')
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 4, 7, 10])
+def test_pages_cover_every_row_once_in_order(roles: list[Role], service: Service, limit: int):
+    items = _walk(Role.objects.filter(service=service), limit)
+
+    assert [r.id for r in items] == [r.id for r in roles]
+
+
+def test_last_page_has_no_cursor(roles: list[Role], service: Service):
+    page = paginate(Role.objects.filter(service=service), None, len(roles))
+
+    assert len(page.items) == len(roles)
+    assert page.next_cursor is None
+
+
+def test_rows_created_while_paging_are_not_repeated(roles: list[Role], service: Service):
+    queryset = Role.objects.filter(service=service)
+    first = paginate(queryset, None, 3)
+    Role.objects.create(service=service, name='late')
+
+    rest = _walk(queryset, 3, first.next_cursor)
+
+    assert [r.name for r in first.items + rest] == [r.name for r in roles] + ['late']
+
+
+def test_async_pages_match_sync_pages(roles: list[Role], service: Service):
+    async def awalk() -> list:
+        items, cursor = [], None
+        while True:
+            page = await apaginate(Role.objects.filter(service=service), cursor, 2)
+            items.extend(page.items)
+            if page.next_cursor is None:
+                return items
+            cursor = page.next_cursor
+
+    assert [r.id for r in async_to_sync(awalk)()] == [r.id for r in roles]
+
+
+def test_limit_defaults_and_is_capped(settings):
+    settings.PAGINATION_DEFAULT_LIMIT = 50
+    settings.PAGINATION_MAX_LIMIT = 200
+
+    assert page_limit(None) == 50
+    assert page_limit(10) == 10
+    assert page_limit(10_000) == 200
+
+
+def test_page_query_uses_index(roles: list[Role], service: Service):
+    queryset = Role.objects.filter(service=service)
+    cursor = paginate(queryset, None, 3).next_cursor
+    queryset = _page_query(queryset, cursor, 3)
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    plan = queryset.explain()
+
+    if connection.vendor == 'sqlite':
+        assert 'role_page_idx' in plan
+        assert 'TEMP B-TREE' not in plan
+    elif connection.vendor == 'postgresql':
+        assert 'role_page_idx' in plan and 'Sort' not in plan
+    else:
+        pytest.skip(f'No plan expectations for {connection.vendor}')
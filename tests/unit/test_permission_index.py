@@ -0,0 +1,97 @@
+import pytest
+
+from src.user.models import (
+    Permission,
+    RolePermission,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServiceRole,
+)
+from src.user.permission_index import (
+    bulk_create_permissions,
+    decode_bitmap,
+    encode_bitmap,
+    get_index,
+)
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _permission(service: Service, code: str) -> Permission:
+    return Permission.objects.create(type=Permission.TYPE_SERVICE, service=service, code=code)
+
+
+def test_bitmap_round_trip():
+    bits = {0, 3, 8, 200}
+
+    assert decode_bitmap(encode_bitmap(bits)) == bits
+    assert encode_bitmap([]) == ''
+
+
+def test_bits_are_stable_and_never_reused(service):
+    read = _permission(service, 'read')
+    write = _permission(service, 'write')
+    write.delete()
+    admin = _permission(service, 'admin')
+
+    assert (read.bit, admin.bit) == (0, 2)
+    assert get_index(service.id).bits == {'read': 0, 'admin': 2}
+
+
+def test_bulk_created_permissions_get_bits_like_saved_ones(service, global_permission):
+    _permission(service, 'read')
+    other = Service.objects.create(name='other', client_id='other', client_secret='')
+    initial = get_index(service.id).version
+
+    bulk_create_permissions(
+        [
+            Permission(type=Permission.TYPE_SERVICE, service=service, code='write'),
+            Permission(type=Permission.TYPE_SERVICE, service=other, code='write'),
+            Permission(type=Permission.TYPE_GLOBAL, code='audit'),
+        ]
+    )
+
+    index = get_index(service.id)
+    assert index.bits == {'read': 0, 'write': 1}
+    assert index.version > initial
+    assert get_index(other.id).bits == {'write': 0}
+    assert Permission.objects.get(code='audit').bit is None
+
+
+def test_index_version_moves_with_mapping(service):
+    initial = get_index(service.id).version
+
+    permission = _permission(service, 'read')
+    after_create = get_index(service.id).version
+    permission.delete()
+
+    assert initial < after_create < get_index(service.id).version
+
+
+def test_service_update_does_not_rewind_bit_allocation(service):
+    stale = Service.objects.get(pk=service.pk)
+    _permission(service, 'read')
+
+    stale.description = 'changed'
+    stale.save()
+
+    assert _permission(service, 'write').bit == 1
+
+
+def test_compact_token_encodes_service_permissions(regular_user: User, service, service_role):
+    permissions = [_permission(service, f'perm-{i}') for i in range(20)]
+    for permission in permissions[::2]:
+        RolePermission.objects.create(role=service_role, permission=permission)
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+
+    token = CustomAccessToken.for_user(regular_user, claims_format='compact')
+
+    claim = token['services'][str(service.id)]
+    index = get_index(service.id)
+    assert token['claims_format'] == 'compact'
+    assert 'permissions' not in claim
+    assert claim['index_version'] == index.version
+    assert index.decode(claim['permission_bits']) == sorted(p.code for p in permissions[::2])
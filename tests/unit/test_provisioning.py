@@ -0,0 +1,185 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.user.models import (
+    Permission,
+    Role,
+    Service,
+    User,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+from src.user.provisioning import UnknownGrants, provision_users, set_service_grants
+from src.user.schemas import UserCreateRequest
+from src.user.signals import entitlements_changed
+from src.user.snapshots import get_claims
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _items(count: int, **fields) -> list[UserCreateRequest]:
+    return [UserCreateRequest(email=f'bulk{i}@example.com', **fields) for i in range(count)]
+
+
+def test_creates_users_with_assignment_roles_and_permissions(
+    service: Service, service_role: Role, service_permission: Permission, admin_user: User
+):
+    items = _items(3, name='Bulk', roles=['editor'], permissions=['read'])
+
+    results = provision_users(service, items, created_by_id=admin_user.id)
+
+    assert [r.error for r in results] == [None] * 3
+    assert all(r.created for r in results)
+    users = User.objects.filter(id__in=[r.user_id for r in results])
+    assert sorted(u.email_normalized for u in users) == sorted(i.email for i in items)
+    assert all(not u.has_usable_password() and u.name == 'Bulk' for u in users)
+    assert (
+        UserServiceAssignment.objects.filter(
+            service=service, created_by=admin_user, user__in=users
+        ).count()
+        == 3
+    )
+    assert UserServiceRole.objects.filter(service=service, role=service_role).count() == 3
+    assert UserServicePermission.objects.filter(permission=service_permission).count() == 3
+    assert get_claims(results[0].user_id)['services'][str(service.id)] == {
+        'permissions': ['read'],
+        'roles': ['editor'],
+    }
+
+
+def test_existing_users_are_assigned_unchanged(service: Service, regular_user: User):
+    item = UserCreateRequest(email=regular_user.email.upper(), name='Other', password='changed')
+
+    (result,) = provision_users(service, [item])
+
+    assert result.user_id == regular_user.id
+    assert result.created is False
+    regular_user.refresh_from_db()
+    assert regular_user.name != 'Other'
+    assert regular_user.check_password('password123')
+    assert UserServiceAssignment.objects.filter(user=regular_user, service=service).exists()
+
+
+def test_new_users_get_their_passwords(service: Service):
+    (result,) = provision_users(service, [UserCreateRequest(email='pw@example.com', password='s3')])
+
+    assert User.objects.get(id=result.user_id).check_password('s3')
+
+
+def test_provisioning_again_changes_nothing(service: Service, service_role: Role):
+    items = _items(5, roles=['editor'])
+    first = provision_users(service, items)
+
+    second = provision_users(service, items)
+
+    assert [r.user_id for r in second] == [r.user_id for r in first]
+    assert not any(r.created for r in second)
+    assert UserServiceRole.objects.filter(service=service).count() == 5
+
+
+def test_invalid_items_are_reported_and_skipped(service: Service, service_role: Role):
+    items = [
+        UserCreateRequest(email='ok@example.com', roles=['editor']),
+        UserCreateRequest(email='OK@example.com'),
+        UserCreateRequest(email='role@example.com', roles=['editor', 'ghost']),
+        UserCreateRequest(email='perm@example.com', permissions=['nope', 'missing']),
+    ]
+
+    results = provision_users(service, items)
+
+    assert [r.error for r in results] == [
+        None,
+        'Duplicate email in request',
+        'Unknown roles: ghost',
+        'Unknown permissions: missing, nope',
+    ]
+    assert [r.user_id is not None for r in results] == [True, False, False, False]
+    assert not User.objects.filter(email__in=[i.email for i in items[2:]]).exists()
+
+
+def test_lookups_do_not_grow_with_users(
+    service: Service, service_role: Role, service_permission: Permission
+):
+    def lookups(prefix: str, count: int) -> int:
+        items = [
+            UserCreateRequest(
+                email=f'{prefix}{i}@example.com', roles=['editor'], permissions=['read']
+            )
+            for i in range(count)
+        ]
+        with CaptureQueriesContext(connection) as captured:
+            provision_users(service, items)
+        # Inserts are batched (the database may cap rows per statement); nothing else repeats.
+        return sum(not q['sql'].startswith('INSERT') for q in captured.captured_queries)
+
+    assert lookups('few', 5) == lookups('many', 200)
+
+
+@pytest.fixture()
+def grants(service: Service, regular_user: User) -> dict:
+    roles = {n: Role.objects.create(service=service, name=n) for n in ('a', 'b', 'c')}
+    permissions = {
+        c: Permission.objects.create(service=service, type=Permission.TYPE_SERVICE, code=c)
+        for c in ('x', 'y')
+    }
+    UserServiceRole.objects.create(user=regular_user, service=service, role=roles['a'])
+    UserServiceRole.objects.create(user=regular_user, service=service, role=roles['b'])
+    UserServicePermission.objects.create(
+        user=regular_user, service=service, permission=permissions['x']
+    )
+    return {'roles': roles, 'permissions': permissions}
+
+
+@pytest.fixture()
+def notifications():
+    sent: list[set] = []
+
+    def receiver(sender, user_ids, **kwargs):
+        sent.append(set(user_ids))
+
+    entitlements_changed.connect(receiver, weak=False)
+    yield sent
+    entitlements_changed.disconnect(receiver)
+
+
+def _grants(user: User, service: Service) -> tuple[set, set]:
+    roles = UserServiceRole.objects.filter(user=user, service=service)
+    permissions = UserServicePermission.objects.filter(user=user, service=service)
+    return (
+        set(roles.values_list('role__name', flat=True)),
+        set(permissions.values_list('permission__code', flat=True)),
+    )
+
+
+def test_set_grants_applies_only_the_difference(
+    service: Service, regular_user: User, grants: dict, notifications: list
+):
+    kept = UserServiceRole.objects.get(user=regular_user, role=grants['roles']['b'])
+
+    changed = set_service_grants(regular_user.id, service, ['b', 'c'], ['y'])
+
+    assert changed is True
+    assert _grants(regular_user, service) == ({'b', 'c'}, {'y'})
+    assert UserServiceRole.objects.filter(pk=kept.pk).exists()
+    assert notifications == [{regular_user.id}]
+
+
+def test_set_grants_without_changes_writes_nothing(
+    service: Service, regular_user: User, grants: dict, notifications: list
+):
+    with CaptureQueriesContext(connection) as queries:
+        changed = set_service_grants(regular_user.id, service, ['b', 'a', 'a'], ['x'])
+
+    assert changed is False
+    assert not [q for q in queries.captured_queries if q['sql'].startswith(('INSERT', 'DELETE'))]
+    assert notifications == []
+
+
+def test_set_grants_rejects_unknown_codes(service: Service, regular_user: User, grants: dict):
+    with pytest.raises(UnknownGrants) as exc_info:
+        set_service_grants(regular_user.id, service, ['c', 'ghost'], ['nope', 'y'])
+
+    assert str(exc_info.value) == 'Unknown roles: ghost; Unknown permissions: nope'
+    assert _grants(regular_user, service) == ({'a', 'b'}, {'x'})
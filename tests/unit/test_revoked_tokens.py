@@ -0,0 +1,103 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import Mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from src.user.auth import JWTAuth
+from src.user.models import RevokedToken, User
+from src.user.revoked_tokens import (
+    BloomFilter,
+    RevokedTokenFilter,
+    prune_expired,
+    revoke_token,
+    revoked_tokens,
+)
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _revoked_row(jti: str, expires_in: timedelta = timedelta(hours=1)) -> RevokedToken:
+    return RevokedToken.objects.create(
+        jti=jti,
+        user_id=uuid.uuid4(),
+        token_type='access',
+        expires_at=timezone.now() + expires_in,
+    )
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    members = [uuid.uuid4().hex for _ in range(1000)]
+    for jti in members:
+        bloom.add(jti)
+
+    assert all(jti in bloom for jti in members)
+    false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10_000))
+    assert false_positives < 300
+    # Members that were false positives when added are not counted.
+    assert 980 <= bloom.count <= 1000
+
+
+def test_non_revoked_tokens_do_not_query_database(regular_user: User, django_assert_num_queries):
+    _revoked_row('other')
+    token = str(CustomAccessToken.for_user(regular_user))
+    auth = JWTAuth()
+    assert auth.authenticate(Mock(), token) is not None
+    positives = revoked_tokens.stats()['positive']
+
+    with django_assert_num_queries(1):  # the user lookup only
+        assert auth.authenticate(Mock(), token) is not None
+
+    assert revoked_tokens.stats()['positive'] == positives
+
+
+def test_revoked_access_token_is_rejected(regular_user: User):
+    token = CustomAccessToken.for_user(regular_user)
+    raw = str(token)
+    assert JWTAuth().authenticate(Mock(), raw) is not None
+
+    assert revoke_token(token) is True
+    assert revoke_token(token) is False
+
+    assert JWTAuth().authenticate(Mock(), raw) is None
+
+
+def test_filter_catches_up_with_revocations_from_other_processes(settings):
+    settings.REVOKED_TOKENS_REFRESH_SECONDS = 5
+    now = [0.0]
+    filter_ = RevokedTokenFilter(clock=lambda: now[0])
+    assert filter_.is_revoked('jti-1') is False
+
+    _revoked_row('jti-1')
+    assert filter_.is_revoked('jti-1') is False
+
+    now[0] = 5.0
+    assert filter_.is_revoked('jti-1') is True
+    assert filter_.stats()['rebuilds'] == 1
+
+
+def test_rebuild_sheds_expired_entries(settings):
+    settings.REVOKED_TOKENS_REFRESH_SECONDS = 5
+    settings.REVOKED_TOKENS_REBUILD_SECONDS = 60
+    now = [0.0]
+    filter_ = RevokedTokenFilter(clock=lambda: now[0])
+    _revoked_row('live')
+    _revoked_row('expired', expires_in=timedelta(seconds=-1))
+
+    assert filter_.stats()['size'] == 0
+    filter_.is_revoked('live')
+    assert filter_.stats()['size'] == 1
+
+
+def test_prune_deletes_only_expired_revocations():
+    _revoked_row('live')
+    _revoked_row('expired', expires_in=timedelta(seconds=-1))
+
+    assert prune_expired() == 1
+    assert list(RevokedToken.objects.values_list('jti', flat=True)) == ['live']
+
+    call_command('prune_revoked_tokens')
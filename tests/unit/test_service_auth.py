@@ -0,0 +1,95 @@
+import pytest
+
+from src.user.models import Service
+from src.user.service_auth import (
+    VerifiedSecretCache,
+    authenticate_client,
+    check_client_secret,
+    hash_client_secret,
+    verified_secrets,
+)
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_client_secret_is_stored_hashed_with_configured_cost(settings):
+    settings.SERVICE_SECRET_HASH_ITERATIONS = 1234
+
+    encoded = hash_client_secret('s3cret')
+
+    assert 's3cret' not in encoded
+    assert encoded.startswith('pbkdf2_sha256$1234$')
+
+
+def test_authenticate_client(service: Service, service_client_secret: str):
+    assert authenticate_client(service.client_id, service_client_secret) == service
+    assert authenticate_client(service.client_id, 'wrong') is None
+    assert authenticate_client('unknown', service_client_secret) is None
+
+    service.status = 'INACTIVE'
+    service.save()
+    assert authenticate_client(service.client_id, service_client_secret) is None
+
+
+def test_plaintext_secret_is_never_accepted(service: Service):
+    Service.objects.filter(pk=service.pk).update(client_secret='plain')
+    service.refresh_from_db()
+
+    assert not check_client_secret(service, 'plain')
+
+
+def test_verified_secret_is_cached_without_keeping_the_secret(
+    service: Service, service_client_secret: str
+):
+    hits = verified_secrets.stats()['hits']
+
+    assert check_client_secret(service, service_client_secret)
+    assert check_client_secret(service, service_client_secret)
+
+    assert verified_secrets.stats()['hits'] == hits + 1
+    assert len(verified_secrets) == 1
+    assert all(service_client_secret.encode() not in key for key in verified_secrets._entries)
+
+
+def test_rotated_secret_is_not_accepted_from_cache(service: Service, service_client_secret: str):
+    assert check_client_secret(service, service_client_secret)
+
+    service.client_secret = hash_client_secret('rotated')
+    service.save()
+
+    assert not check_client_secret(service, service_client_secret)
+    assert check_client_secret(service, 'rotated')
+
+
+def test_cache_entries_expire(settings):
+    settings.SERVICE_SECRET_CACHE_TTL_SECONDS = 60
+    clock = FakeClock()
+    cache = VerifiedSecretCache(clock=clock)
+
+    cache.add('hash', 'secret')
+    assert cache.contains('hash', 'secret')
+    assert not cache.contains('hash', 'other')
+
+    clock.now += 60
+    assert not cache.contains('hash', 'secret')
+    assert len(cache) == 0
+
+
+def test_secret_is_rehashed_when_cost_changes(
+    service: Service, service_client_secret: str, settings
+):
+    settings.SERVICE_SECRET_HASH_ITERATIONS = 1000
+
+    assert check_client_secret(service, service_client_secret)
+
+    service.refresh_from_db()
+    assert service.client_secret.startswith('pbkdf2_sha256$1000$')
+    assert check_client_secret(service, service_client_secret)
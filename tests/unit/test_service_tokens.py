@@ -0,0 +1,105 @@
+import threading
+import time
+
+import pytest
+
+from src.user.service_tokens import IssuedToken, ServiceTokenCache
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def _reuse(settings):
+    settings.SERVICE_TOKEN_REUSE_MIN_REMAINING = 0.5
+    settings.SERVICE_TOKEN_CACHE_MAX_ENTRIES = 100
+
+
+class Minter:
+    def __init__(self, clock: FakeClock, lifetime: int = 300) -> None:
+        self.clock = clock
+        self.lifetime = lifetime
+        self.count = 0
+
+    def __call__(self) -> IssuedToken:
+        self.count += 1
+        now = int(self.clock())
+        return IssuedToken(f'token-{self.count}', 'read', now, now + self.lifetime)
+
+
+def test_token_is_reused_while_enough_lifetime_is_left():
+    clock = FakeClock()
+    cache = ServiceTokenCache(clock=clock)
+    mint = Minter(clock)
+
+    first = cache.get_or_mint('svc', 'read', mint)
+    clock.now += 149
+    assert cache.get_or_mint('svc', 'read', mint) is first
+
+    clock.now += 1
+    assert cache.get_or_mint('svc', 'read', mint).token == 'token-2'
+    assert mint.count == 2
+
+
+def test_tokens_are_cached_per_service_and_scope():
+    clock = FakeClock()
+    cache = ServiceTokenCache(clock=clock)
+    mint = Minter(clock)
+
+    cache.get_or_mint('svc', 'read', mint)
+    cache.get_or_mint('svc', 'read write', mint)
+    cache.get_or_mint('other', 'read', mint)
+
+    assert mint.count == 3
+    cache.discard_service('svc')
+    assert len(cache) == 1
+
+
+def test_reuse_can_be_disabled(settings):
+    settings.SERVICE_TOKEN_REUSE_MIN_REMAINING = 1
+    clock = FakeClock()
+    cache = ServiceTokenCache(clock=clock)
+    mint = Minter(clock)
+
+    cache.get_or_mint('svc', 'read', mint)
+    cache.get_or_mint('svc', 'read', mint)
+
+    assert mint.count == 2
+    assert len(cache) == 0
+
+
+def test_concurrent_requests_are_coalesced_into_one_mint():
+    clock = FakeClock()
+    cache = ServiceTokenCache(clock=clock)
+    mint = Minter(clock)
+    release = threading.Event()
+    before = cache.stats()
+
+    def slow_mint() -> IssuedToken:
+        release.wait(5)
+        return mint()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_mint('svc', 'r', slow_mint)))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)  # let every request find the mint in flight
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert mint.count == 1
+    assert {issued.token for issued in results} == {'token-1'}
+    after = cache.stats()
+    assert after['minted'] - before['minted'] == 1
+    assert after['coalesced'] - before['coalesced'] == 7
@@ -0,0 +1,101 @@
+import jwt
+import pytest
+from ninja_jwt.exceptions import TokenError
+
+from src.user.models import SigningKey, User
+from src.user.signing_keys import (
+    KeyRing,
+    activate_signing_key,
+    create_signing_key,
+    key_ring,
+    retire_signing_key,
+)
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def test_tokens_use_shared_secret_without_active_key(regular_user: User):
+    token = str(CustomAccessToken.for_user(regular_user))
+
+    assert 'kid' not in jwt.get_unverified_header(token)
+    assert jwt.get_unverified_header(token)['alg'] == 'HS256'
+    assert CustomAccessToken(token)['sub'] == str(regular_user.id)
+
+
+@pytest.mark.parametrize('algorithm', ['RS256', 'ES256', 'EdDSA'])
+def test_active_key_signs_tokens_with_kid(regular_user: User, algorithm: str):
+    key = create_signing_key(algorithm, activate=True)
+
+    token = str(CustomAccessToken.for_user(regular_user))
+
+    header = jwt.get_unverified_header(token)
+    assert header == {'alg': algorithm, 'kid': key.kid, 'typ': 'JWT'}
+    assert CustomAccessToken(token)['sub'] == str(regular_user.id)
+
+
+def test_new_key_is_published_before_it_signs(regular_user: User):
+    key = create_signing_key('ES256')
+
+    assert key.state == SigningKey.STATE_VERIFY_ONLY
+    assert key_ring.get().active is None
+    assert key.kid in key_ring.get().keys
+    assert 'kid' not in jwt.get_unverified_header(str(CustomAccessToken.for_user(regular_user)))
+
+
+def test_rotation_keeps_verifying_until_retired(regular_user: User):
+    old = create_signing_key('ES256', activate=True)
+    old_token = str(CustomAccessToken.for_user(regular_user))
+
+    new = create_signing_key('EdDSA')
+    activate_signing_key(new.kid)
+
+    assert SigningKey.objects.get(kid=old.kid).state == SigningKey.STATE_VERIFY_ONLY
+    assert jwt.get_unverified_header(str(CustomAccessToken.for_user(regular_user)))['kid'] == (
+        new.kid
+    )
+    assert CustomAccessToken(old_token)['sub'] == str(regular_user.id)
+
+    retire_signing_key(old.kid)
+
+    with pytest.raises(TokenError):
+        CustomAccessToken(old_token)
+
+
+def test_active_key_cannot_be_retired():
+    key = create_signing_key('ES256', activate=True)
+
+    with pytest.raises(ValueError):
+        retire_signing_key(key.kid)
+
+
+def test_shared_secret_tokens_can_be_refused(regular_user: User, settings):
+    token = str(CustomAccessToken.for_user(regular_user))
+    settings.JWT_VERIFY_SHARED_SECRET = False
+
+    with pytest.raises(TokenError):
+        CustomAccessToken(token)
+
+
+def test_token_with_forged_kid_is_rejected(regular_user: User):
+    create_signing_key('ES256', activate=True)
+    token = str(CustomAccessToken.for_user(regular_user))
+    payload = jwt.decode(token, options={'verify_signature': False})
+
+    forged = jwt.encode(payload, 'test-secret', algorithm='HS256', headers={'kid': 'unknown'})
+
+    with pytest.raises(TokenError):
+        CustomAccessToken(forged)
+
+
+def test_key_ring_reloads_after_refresh_interval(settings):
+    settings.JWT_KEY_RING_REFRESH_SECONDS = 60
+    now = [0.0]
+    ring = KeyRing(clock=lambda: now[0])
+    assert ring.get().keys == {}
+
+    key = create_signing_key('ES256')
+    assert ring.get().keys == {}
+
+    now[0] = 61.0
+    assert list(ring.get().keys) == [key.kid]
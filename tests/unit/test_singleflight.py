@@ -0,0 +1,76 @@
+import threading
+import time
+
+import pytest
+
+from src.user.singleflight import SingleFlight
+
+pytestmark = pytest.mark.unit
+
+
+def test_concurrent_calls_share_one_execution():
+    flights: SingleFlight[int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work() -> int:
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 42
+
+    results = []
+
+    def call() -> None:
+        results.append(flights.do('key', work))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=call) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    time.sleep(0.1)  # let the followers block on the shared result
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [(42, False)] + [(42, True)] * 5
+    assert len(flights) == 0
+
+
+def test_exception_is_shared_and_key_is_released():
+    flights: SingleFlight[int] = SingleFlight()
+
+    def fail() -> int:
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flights.do('key', fail)
+
+    assert flights.do('key', lambda: 1) == (1, False)
+
+
+def test_coroutines_share_one_execution():
+    import asyncio
+
+    from asgiref.sync import async_to_sync
+
+    flights: SingleFlight[int] = SingleFlight()
+    calls = []
+
+    async def work() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 7
+
+    async def gather():
+        return await asyncio.gather(*[flights.ado('key', work) for _ in range(5)])
+
+    results = async_to_sync(gather)()
+
+    assert len(calls) == 1
+    assert sorted(results) == [(7, False)] + [(7, True)] * 4
+    assert len(flights) == 0
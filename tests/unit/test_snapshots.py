@@ -0,0 +1,106 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from src.user.models import (
+    RolePermission,
+    User,
+    UserEntitlementSnapshot,
+    UserGlobalRole,
+    UserServiceAssignment,
+    UserServicePermission,
+    UserServiceRole,
+)
+from src.user.snapshots import get_claims, refresh_snapshots, verify_all
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+def _snapshot(user: User) -> dict:
+    return UserEntitlementSnapshot.objects.get(user=user).claims
+
+
+def test_snapshot_follows_service_grants(regular_user: User, service, service_permission):
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    grant = UserServicePermission.objects.create(
+        user=regular_user, service=service, permission=service_permission
+    )
+
+    assert _snapshot(regular_user)['services'][str(service.id)]['permissions'] == ['read']
+
+    grant.delete()
+
+    assert _snapshot(regular_user)['services'][str(service.id)]['permissions'] == []
+
+
+def test_role_permission_change_fans_out_to_role_holders(
+    regular_user: User, admin_user: User, service, service_role, service_permission
+):
+    for user in (regular_user, admin_user):
+        UserServiceAssignment.objects.create(user=user, service=service)
+        UserServiceRole.objects.create(user=user, service=service, role=service_role)
+
+    RolePermission.objects.create(role=service_role, permission=service_permission)
+
+    for user in (regular_user, admin_user):
+        assert _snapshot(user)['services'][str(service.id)] == {
+            'permissions': ['read'],
+            'roles': ['editor'],
+        }
+
+
+def test_permission_code_change_fans_out(regular_user: User, global_role, global_permission):
+    UserGlobalRole.objects.create(user=regular_user, role=global_role)
+    RolePermission.objects.create(role=global_role, permission=global_permission)
+
+    global_permission.code = 'root'
+    global_permission.save()
+
+    assert _snapshot(regular_user)['global_permissions'] == ['root']
+
+
+def test_hard_deleting_user_drops_snapshot(regular_user: User, service, service_role):
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+    user_id = regular_user.id
+
+    regular_user.delete()
+
+    assert not UserEntitlementSnapshot.objects.filter(user_id=user_id).exists()
+
+
+def test_access_token_claims_are_a_single_read(regular_user: User, service, service_role):
+    UserServiceAssignment.objects.create(user=regular_user, service=service)
+    UserServiceRole.objects.create(user=regular_user, service=service, role=service_role)
+
+    with CaptureQueriesContext(connection) as ctx:
+        token = CustomAccessToken.for_user(regular_user)
+
+    assert len(ctx.captured_queries) == 1
+    assert token['services'][str(service.id)]['roles'] == ['editor']
+
+
+def test_get_claims_builds_missing_snapshot(regular_user: User, global_role):
+    UserGlobalRole.objects.create(user=regular_user, role=global_role)
+    UserEntitlementSnapshot.objects.all().delete()
+
+    assert get_claims(regular_user.id)['global_roles'] == ['super_admin']
+    assert UserEntitlementSnapshot.objects.filter(user=regular_user).exists()
+
+
+def test_verify_detects_stale_and_command_rebuilds(regular_user: User, admin_user: User):
+    refresh_snapshots([regular_user.id, admin_user.id])
+    UserEntitlementSnapshot.objects.filter(user=regular_user).update(fingerprint='stale')
+    UserEntitlementSnapshot.objects.filter(user=admin_user).delete()
+
+    result = verify_all(batch_size=1)
+    assert (result.checked, result.missing, result.stale) == (2, 1, 1)
+    with pytest.raises(CommandError):
+        call_command('entitlement_snapshots', '--verify')
+
+    call_command('entitlement_snapshots', '--batch-size', '1')
+
+    assert verify_all().ok
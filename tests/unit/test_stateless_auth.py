@@ -0,0 +1,122 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.user.auth import AdminAuth, ClaimsUser, JWTAuth
+from src.user.models import TokenNotBefore, User
+from src.user.revocation import NotBeforeTable, is_revoked, not_before_table
+from src.user.revoked_tokens import revoked_tokens
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+@pytest.fixture(autouse=True)
+def _stateless(settings):
+    settings.JWT_STATELESS_AUTH = True
+
+
+def _authenticate(auth, token) -> User | ClaimsUser | None:
+    return auth.authenticate(Mock(), str(token))
+
+
+def test_stateless_auth_does_not_query_users(regular_user: User, django_assert_num_queries):
+    token = str(CustomAccessToken.for_user(regular_user))
+    not_before_table.get(regular_user.id)
+    revoked_tokens.is_revoked('warm-up')
+
+    with django_assert_num_queries(0):
+        user = _authenticate(JWTAuth(), token)
+
+    assert isinstance(user, ClaimsUser)
+    assert user.id == str(regular_user.id)
+    assert user.status == User.STATUS_ACTIVE
+    assert user.email == regular_user.email
+
+
+def test_stateless_admin_auth_uses_staff_claim(
+    admin_user: User, regular_user: User, django_assert_num_queries
+):
+    admin_token = str(CustomAccessToken.for_user(admin_user))
+    user_token = str(CustomAccessToken.for_user(regular_user))
+    not_before_table.get(admin_user.id)
+    revoked_tokens.is_revoked('warm-up')
+
+    with django_assert_num_queries(0):
+        assert _authenticate(AdminAuth(), admin_token).is_staff
+        assert _authenticate(AdminAuth(), user_token) is None
+
+
+@pytest.mark.parametrize('transition', ['deactivate', 'mark_deleted', 'delete'])
+def test_status_transitions_revoke_issued_tokens(regular_user: User, transition: str):
+    token = CustomAccessToken.for_user(regular_user)
+    assert _authenticate(JWTAuth(), token) is not None
+
+    getattr(regular_user, transition)()
+
+    assert _authenticate(JWTAuth(), token) is None
+
+
+def test_reactivation_revokes_tokens_issued_before_it(regular_user: User):
+    token = CustomAccessToken.for_user(regular_user)
+    regular_user.deactivate()
+    regular_user.reactivate()
+
+    assert _authenticate(JWTAuth(), token) is None
+
+    not_before = TokenNotBefore.objects.get(user_id=regular_user.id).not_before
+    assert is_revoked(regular_user.id, not_before - 1)
+    assert not is_revoked(regular_user.id, not_before)
+
+
+def test_tokens_issued_after_revocation_in_the_same_second_are_accepted(regular_user: User):
+    regular_user.deactivate()
+    regular_user.reactivate()
+    not_before = TokenNotBefore.objects.get(user_id=regular_user.id).not_before
+
+    token = CustomAccessToken.for_user(regular_user)
+
+    assert token['iat'] >= not_before
+    assert _authenticate(JWTAuth(), token) is not None
+    # Earlier in the same second is still revoked; later in it is not.
+    assert is_revoked(regular_user.id, not_before - 0.000001)
+    assert not is_revoked(regular_user.id, not_before + 0.000001)
+
+
+def test_tokens_without_status_claim_fall_back_to_database(regular_user: User):
+    token = CustomAccessToken.for_user(regular_user)
+    del token['status']
+
+    user = _authenticate(JWTAuth(), token)
+
+    assert isinstance(user, User)
+
+
+def test_not_before_table_refreshes_periodically(regular_user: User, settings):
+    settings.JWT_REVOCATION_REFRESH_SECONDS = 30
+    now = [0.0]
+    table = NotBeforeTable(clock=lambda: now[0])
+    assert table.get(regular_user.id) == 0
+
+    # Written by another process.
+    epoch = int(time.time())
+    TokenNotBefore.objects.create(user_id=regular_user.id, not_before=epoch)
+    assert table.get(regular_user.id) == 0
+
+    now[0] = 30.0
+    assert table.get(regular_user.id) == epoch
+
+
+def test_not_before_table_only_holds_unexpired_window(regular_user: User, admin_user: User):
+    lifetime = 3600
+    TokenNotBefore.objects.create(
+        user_id=regular_user.id, not_before=int(time.time()) - 2 * lifetime
+    )
+    TokenNotBefore.objects.create(user_id=admin_user.id, not_before=int(time.time()))
+
+    table = NotBeforeTable()
+
+    assert table.get(regular_user.id) == 0
+    assert table.get(admin_user.id) > 0
+    assert len(table) == 1
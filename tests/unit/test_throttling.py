@@ -0,0 +1,133 @@
+import pytest
+
+from src.user.throttling import (
+    BucketLimit,
+    CacheBucketStore,
+    InMemoryBucketStore,
+    LoginThrottle,
+    client_ip,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(params=['memory', 'cache'])
+def store(request, clock):
+    if request.param == 'memory':
+        return InMemoryBucketStore(clock=clock)
+    return CacheBucketStore(clock=clock)
+
+
+@pytest.fixture(autouse=True)
+def _limits(settings):
+    settings.LOGIN_THROTTLE_ENABLED = True
+    settings.LOGIN_THROTTLE_IP_BURST = 10
+    settings.LOGIN_THROTTLE_IP_PER_MINUTE = 60
+    settings.LOGIN_THROTTLE_EMAIL_BURST = 3
+    settings.LOGIN_THROTTLE_EMAIL_PER_MINUTE = 6
+
+
+def test_bucket_allows_burst_then_reports_wait(store, clock):
+    limit = BucketLimit(capacity=2, refill_per_second=0.5)
+
+    assert store.take('k', limit) == 0
+    assert store.take('k', limit) == 0
+    assert store.take('k', limit) == pytest.approx(2.0)
+
+    clock.now += 1
+    assert store.take('k', limit) == pytest.approx(1.0)
+
+    clock.now += 1
+    assert store.take('k', limit) == 0
+
+
+def test_bucket_refill_is_capped_at_capacity(store, clock):
+    limit = BucketLimit(capacity=2, refill_per_second=1)
+    store.take('k', limit)
+    clock.now += 3600
+
+    assert [store.take('k', limit) for _ in range(3)] == [0, 0, pytest.approx(1.0)]
+
+
+def test_in_memory_store_bounds_keys(clock):
+    store = InMemoryBucketStore(clock=clock, max_keys=2)
+    limit = BucketLimit(capacity=1, refill_per_second=1)
+    for key in ('a', 'b', 'c'):
+        store.take(key, limit)
+
+    assert list(store._buckets) == ['b', 'c']
+
+
+def test_email_limit_rejects_repeated_failures(store, clock):
+    throttle = LoginThrottle(store=store)
+
+    assert [throttle.check('10.0.0.1', 'a@example.com') for _ in range(3)] == [None] * 3
+    assert throttle.check('10.0.0.2', 'A@Example.com ') == pytest.approx(10.0)
+    assert throttle.check('10.0.0.1', 'b@example.com') is None
+
+    clock.now += 10
+    assert throttle.check('10.0.0.1', 'a@example.com') is None
+
+
+def test_ip_limit_rejects_spraying_many_emails(store):
+    throttle = LoginThrottle(store=store)
+    rejected = throttle.stats()['rejected_ip']
+
+    results = [throttle.check('10.0.0.1', f'user{i}@example.com') for i in range(11)]
+
+    assert results[:10] == [None] * 10
+    assert results[10] == pytest.approx(1.0)
+    assert throttle.check('10.0.0.2', 'user0@example.com') is None
+    assert throttle.stats()['rejected_ip'] == rejected + 1
+
+
+def test_success_forgives_failures(store):
+    throttle = LoginThrottle(store=store)
+    for _ in range(3):
+        throttle.check('10.0.0.1', 'a@example.com')
+
+    throttle.succeeded('10.0.0.1', 'a@example.com')
+
+    assert throttle.check('10.0.0.1', 'a@example.com') is None
+    # Successful logins do not use up the IP's allowance.
+    for _ in range(20):
+        assert throttle.check('10.0.0.1', 'a@example.com') is None
+        throttle.succeeded('10.0.0.1', 'a@example.com')
+
+
+def test_disabled_throttle_allows_everything(store, settings):
+    settings.LOGIN_THROTTLE_ENABLED = False
+    throttle = LoginThrottle(store=store)
+
+    assert all(throttle.check('10.0.0.1', 'a@example.com') is None for _ in range(50))
+
+
+def test_backend_setting_selects_store(settings):
+    throttle = LoginThrottle()
+    assert isinstance(throttle.store, InMemoryBucketStore)
+
+    settings.LOGIN_THROTTLE_BACKEND = 'cache'
+    assert isinstance(throttle.store, CacheBucketStore)
+
+
+def test_client_ip_trusts_only_configured_proxies(rf, settings):
+    request = rf.post('/', HTTP_X_FORWARDED_FOR='1.1.1.1, 2.2.2.2, 3.3.3.3', REMOTE_ADDR='4.4.4.4')
+
+    settings.LOGIN_THROTTLE_NUM_PROXIES = 0
+    assert client_ip(request) == '4.4.4.4'
+
+    settings.LOGIN_THROTTLE_NUM_PROXIES = 2
+    assert client_ip(request) == '2.2.2.2'
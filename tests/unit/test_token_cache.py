@@ -0,0 +1,114 @@
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.user.auth import JWTAuth
+from src.user.models import TokenNotBefore, User
+from src.user.revocation import not_before_table
+from src.user.token_cache import VerifiedTokenCache, token_cache
+from src.user.tokens import CustomAccessToken
+
+pytestmark = [pytest.mark.django_db, pytest.mark.unit]
+
+
+@pytest.fixture(autouse=True)
+def _enabled(settings):
+    settings.AUTH_TOKEN_CACHE_MAX_ENTRIES = 100
+    settings.AUTH_TOKEN_CACHE_MAX_AGE_SECONDS = 60
+
+
+def _authenticate(token: str) -> User | None:
+    return JWTAuth().authenticate(Mock(), token)
+
+
+def test_cached_token_skips_verification_and_user_lookup(
+    regular_user: User, django_assert_num_queries
+):
+    token = str(CustomAccessToken.for_user(regular_user))
+    assert _authenticate(token).id == regular_user.id
+    not_before_table.get(regular_user.id)
+    hits = token_cache.stats()['hits']
+
+    with django_assert_num_queries(0):
+        assert _authenticate(token).id == regular_user.id
+
+    assert token_cache.stats()['hits'] == hits + 1
+    assert token_cache.stats()['size'] == 1
+
+
+def test_cache_is_disabled_by_default(regular_user: User, settings):
+    settings.AUTH_TOKEN_CACHE_MAX_ENTRIES = 0
+    token = str(CustomAccessToken.for_user(regular_user))
+
+    _authenticate(token)
+
+    assert len(token_cache) == 0
+
+
+@pytest.mark.parametrize('transition', ['deactivate', 'mark_deleted'])
+def test_status_transitions_invalidate_cached_tokens(regular_user: User, transition: str):
+    token = str(CustomAccessToken.for_user(regular_user))
+    _authenticate(token)
+
+    getattr(regular_user, transition)()
+
+    assert len(token_cache) == 0
+    assert _authenticate(token) is None
+
+
+def test_reactivation_invalidates_cached_tokens(regular_user: User):
+    regular_user.deactivate()
+    token = str(CustomAccessToken.for_user(regular_user))
+    assert _authenticate(token) is None
+    assert len(token_cache) == 1
+
+    regular_user.reactivate()
+
+    assert len(token_cache) == 0
+
+
+def test_revocation_by_another_process_rejects_cached_token(regular_user: User):
+    token = str(CustomAccessToken.for_user(regular_user))
+    _authenticate(token)
+
+    TokenNotBefore.objects.create(user_id=regular_user.id, not_before=int(time.time()) + 1)
+    not_before_table.clear()
+
+    assert _authenticate(token) is None
+
+
+def test_entries_expire_at_max_age_or_token_exp():
+    now = [1000.0]
+    cache = VerifiedTokenCache(clock=lambda: now[0])
+    user = Mock(id='u1')
+
+    cache.put('short', {'exp': 1010}, user)
+    cache.put('long', {'exp': 5000}, user)
+
+    now[0] = 1011.0
+    assert cache.get('short') is None
+    assert cache.get('long') is not None
+
+    now[0] = 1061.0
+    assert cache.get('long') is None
+    assert cache.stats()['expired'] == 2
+
+
+def test_least_recently_used_entries_are_evicted(settings):
+    settings.AUTH_TOKEN_CACHE_MAX_ENTRIES = 2
+    cache = VerifiedTokenCache(clock=lambda: 0.0)
+    exp = {'exp': 100}
+
+    cache.put('a', exp, Mock(id='u1'))
+    cache.put('b', exp, Mock(id='u2'))
+    cache.get('a')
+    cache.put('c', exp, Mock(id='u3'))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats()['evictions'] == 1
+
+    cache.discard_user('u1')
+    assert cache.get('a') is None
+    assert len(cache) == 1
@@ -36,3 +36,20 @@ def test_user_reactivate_clears_inactive_fields(regular_user: User):
     assert regular_user.status == User.STATUS_ACTIVE
     assert regular_user.inactive_at is None
     assert regular_user.inactive_reason == ''
+
+
+def test_user_save_keeps_normalized_email_in_sync(regular_user: User):
+    regular_user.email = 'Mixed.Case@Example.COM'
+    regular_user.save(update_fields=['email'])
+    regular_user.refresh_from_db()
+
+    assert regular_user.email == 'Mixed.Case@Example.COM'
+    assert regular_user.email_normalized == 'mixed.case@example.com'
+    assert User.objects.by_email('mixed.case@EXAMPLE.com').get() == regular_user
+
+
+def test_create_user_rejects_email_differing_only_in_case(regular_user: User):
+    from django.db import IntegrityError
+
+    with pytest.raises(IntegrityError):
+        User.objects.create_user(regular_user.email.upper(), 'password123')